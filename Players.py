@@ -0,0 +1,91 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt
+
+from background_task import run_in_background
+
+COLUMNS = ["Player", "Games", "Best", "Mean", "Median", "Trend"]
+
+class PlayersWidget(QWidget):
+    def __init__(self, leaderboard_widget):
+        """
+        Initialize the per-player statistics view of the leaderboard storage
+        Case is always O(1), the table is filled when the view is shown.
+        """
+        super().__init__()
+        self.leaderboard_widget = leaderboard_widget  # O(1) its storage is opened in the background
+        self.loading = False  # O(1) True while the statistics are read on the pool
+
+        layout = QVBoxLayout()  # O(1)
+
+        # Header label
+        header_label = QLabel("Best Per Player")  # O(1)
+        header_label.setFont(QFont("Arial", 24, QFont.Bold))  # O(1)
+        header_label.setAlignment(Qt.AlignCenter)  # O(1)
+        layout.addWidget(header_label)  # O(1)
+
+        # Shown while the statistics are read
+        self.loading_label = QLabel()  # O(1)
+        self.loading_label.setAlignment(Qt.AlignCenter)  # O(1)
+        self.loading_label.hide()  # O(1)
+        layout.addWidget(self.loading_label)  # O(1)
+
+        # One row per player, best time first
+        self.table = QTableWidget(0, len(COLUMNS))  # O(1)
+        self.table.setHorizontalHeaderLabels(COLUMNS)  # O(1)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)  # O(1)
+        self.table.verticalHeader().setVisible(False)  # O(1)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)  # O(1)
+        self.table.setToolTip("Trend: mean of the last games minus the overall mean, negative is getting faster")  # O(1)
+        layout.addWidget(self.table)  # O(1)
+
+        self.setLayout(layout)  # O(1)
+
+    def showEvent(self, event):
+        """
+        Refresh the statistics every time the view is shown
+        Case is always O(1) on the GUI thread, the statistics are read on the pool.
+        """
+        super().showEvent(event)
+        self.load_and_display_stats()
+
+    def load_and_display_stats(self):
+        """
+        Ask the pool for the per-player statistics of the storage, the table is filled when they arrive
+        Case is always O(1) on the GUI thread. On the pool, the SQLite storage reads its players
+        table in O(P) for P players, the CSV one first parses the lines appended since the last read.
+        """
+        storage = self.leaderboard_widget.storage  # O(1)
+        if storage is None or self.loading:  # O(1) still opening, or already reading
+            return
+        self.loading = True  # O(1)
+        self.loading_label.setText("Loading players...")  # O(1)
+        self.loading_label.show()  # O(1)
+        run_in_background(storage.player_stats, on_finished=self.display_stats, on_failed=self.stats_failed)
+
+    def stats_failed(self, message):
+        """Case is always O(1)."""
+        self.loading = False
+        self.loading_label.setText(f"Could not load the players: {message}")
+
+    def display_stats(self, players):
+        """
+        Fill the table with the PlayerStats read by the pool
+        Case is always O(P) for P players.
+        """
+        self.loading = False  # O(1)
+        self.loading_label.hide()  # O(1)
+        self.table.setRowCount(len(players))  # O(P)
+        for row, player in enumerate(players):  # O(P)
+            values = [
+                player.nickname,
+                str(player.games),
+                f"{player.best:.3f}s",
+                f"{player.mean:.3f}s",
+                f"{player.median:.3f}s",
+                f"{player.trend:+.3f}s",
+            ]
+            for col, value in enumerate(values):  # O(6) = O(1)
+                item = QTableWidgetItem(value)  # O(1)
+                item.setTextAlignment(Qt.AlignCenter)  # O(1)
+                self.table.setItem(row, col, item)  # O(1)
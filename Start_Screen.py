@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QCheckBox
 from PySide6.QtGui import QFont
 from PySide6.QtCore import Qt
 
@@ -45,6 +45,11 @@ class StartScreenWidget(QWidget):
         self.nickname_input.textChanged.connect(self.enable_start_button)  # O(1)
         layout.addWidget(self.nickname_input, alignment=Qt.AlignCenter)  # O(1)
 
+        # No-guess mode, boards that can be finished by logic alone
+        self.no_guess_checkbox = QCheckBox("No-guess boards")  # O(1)
+        self.no_guess_checkbox.setFont(QFont("Arial", 12))  # O(1)
+        layout.addWidget(self.no_guess_checkbox, alignment=Qt.AlignCenter)  # O(1)
+
         # Start game button
         self.start_button = QPushButton("Start Game")  # O(1)
         self.start_button.setFixedWidth(200)  # O(1)
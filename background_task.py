@@ -0,0 +1,39 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+class TaskSignals(QObject):
+    """QRunnable is not a QObject, so the results travel through this one."""
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class BackgroundTask(QRunnable):
+    def __init__(self, function, *args):
+        """Case is always O(1)."""
+        super().__init__()
+        self.function = function  # O(1)
+        self.args = args  # O(1)
+        self.signals = TaskSignals()  # O(1) created on the GUI thread, so its receivers run there
+
+    def run(self):
+        """Runs on a pool thread, the result is delivered to the GUI thread by a queued signal."""
+        try:
+            result = self.function(*self.args)
+        except Exception as error:
+            self.signals.failed.emit(str(error))
+        else:
+            self.signals.finished.emit(result)
+
+
+def run_in_background(function, *args, on_finished=None, on_failed=None):
+    """
+    Call function(*args) on the global QThreadPool. on_finished(result) or on_failed(message)
+    is then called on the GUI thread.
+    Case is always O(1) on the calling thread.
+    """
+    task = BackgroundTask(function, *args)
+    if on_finished:
+        task.signals.finished.connect(on_finished)
+    if on_failed:
+        task.signals.failed.connect(on_failed)
+    QThreadPool.globalInstance().start(task)
+    return task
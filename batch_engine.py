@@ -0,0 +1,193 @@
+"""
+    Vectorized batch engine: K boards of the same size stored as stacked NumPy arrays, for
+    simulations that step thousands of boards at once.
+
+    mines, revealed and flagged are K x H x W boolean arrays and counts is a K x H x W uint8 array.
+    Every operation works on the whole stack with array operations, there is no Python loop over
+    boards or cells:
+    - place_mines generates the mines of every board in one call, by giving each cell a random key
+      and keeping the num_mines smallest keys of each board outside its 3x3 first-click block.
+    - reveal applies one reveal per board as a batched flood fill, one dilation of the zero cells per
+      BFS level. It follows the rules of Board.reveal (and so GameWidget.reveal_cell): flagged and
+      revealed cells are never opened, a cascade spreads only from newly revealed zero cells, and
+      revealing a mine explodes the board.
+
+    The layouts are not the ones Board would generate from the same seed (Board uses the irregular
+    safe area and the standard random module), use from_boards to step existing boards.
+"""
+
+import numpy as np
+
+from start_game import mines_for_density, DEFAULT_DENSITY
+
+
+def neighbour_sum(planes):
+    """
+    Number of true neighbours of every cell, for a K x H x W boolean stack.
+    Case is always O(K * H * W).
+    """
+    _, height, width = planes.shape
+    padded = np.pad(planes.astype(np.uint8), ((0, 0), (1, 1), (1, 1)))
+    total = np.zeros(planes.shape, dtype=np.uint8)
+    for dx in (0, 1, 2):
+        for dy in (0, 1, 2):
+            if dx != 1 or dy != 1:
+                total += padded[:, dx:dx + height, dy:dy + width]
+    return total
+
+
+def unpack_plane(plane, height, width):
+    """
+    H x W boolean array of a BitPlane, whose bits are stored least significant first.
+    Case is always O(height * width), done in C.
+    """
+    bits = np.unpackbits(np.frombuffer(plane.bits, dtype=np.uint8), bitorder="little")
+    return bits[:height * width].reshape(height, width).astype(bool)
+
+
+def dilate(planes):
+    """
+    Cells that are next to a true cell (the cell itself excluded), for a K x H x W boolean stack.
+    Case is always O(K * H * W).
+    """
+    _, height, width = planes.shape
+    padded = np.pad(planes, ((0, 0), (1, 1), (1, 1)))
+    result = np.zeros(planes.shape, dtype=bool)
+    for dx in (0, 1, 2):
+        for dy in (0, 1, 2):
+            if dx != 1 or dy != 1:
+                result |= padded[:, dx:dx + height, dy:dy + width]
+    return result
+
+
+class BoardBatch:
+    def __init__(self, count, height, width, num_mines=None, density=None, seed=None):
+        """
+        Initialize count empty boards. Either num_mines or a mine density (0 to 1) can be given,
+        the default density is 20%. The seed makes the whole batch reproducible.
+        Case is always O(count * height * width).
+        """
+        self.count = count
+        self.height = height
+        self.width = width
+        if num_mines is None:
+            num_mines = mines_for_density(height, width, DEFAULT_DENSITY if density is None else density)
+        self.num_mines = num_mines
+        self.rng = np.random.default_rng(seed)
+
+        shape = (count, height, width)
+        self.mines = np.zeros(shape, dtype=bool)
+        self.revealed = np.zeros(shape, dtype=bool)
+        self.flagged = np.zeros(shape, dtype=bool)
+        self.counts = np.zeros(shape, dtype=np.uint8)
+
+        self.exploded = np.zeros(count, dtype=bool)
+        self.safe_cells = np.full(count, height * width - num_mines, dtype=np.int64)
+        self.safe_revealed = np.zeros(count, dtype=np.int64)
+
+    @classmethod
+    def from_boards(cls, boards):
+        """
+        Stack existing Board objects of the same size with their mines already placed, copying
+        their whole state (mines, revealed and flagged cells, explosion and counters), so games
+        in progress continue where they are.
+        Case is always O(count * height * width).
+        """
+        first = boards[0]
+        height, width = first.height, first.width
+        batch = cls(len(boards), height, width, first.num_mines)
+        for k, board in enumerate(boards):
+            flat = batch.mines[k].reshape(-1)
+            flat[np.frombuffer(board.mine_indices, dtype=np.uint32)] = True
+            batch.revealed[k] = unpack_plane(board.revealed, height, width)
+            batch.flagged[k] = unpack_plane(board.flagged, height, width)
+            batch.exploded[k] = board.exploded
+            batch.safe_cells[k] = board.safe_cells
+            batch.safe_revealed[k] = board.safe_revealed
+        batch.counts = neighbour_sum(batch.mines)
+        return batch
+
+    def place_mines(self, first_rows, first_cols):
+        """
+        Place the mines of every board at once, keeping the 3x3 block around each first click safe.
+        first_rows and first_cols hold one first click per board.
+        Case is always O(count * height * width).
+        """
+        rows = np.arange(self.height).reshape(1, -1, 1)
+        cols = np.arange(self.width).reshape(1, 1, -1)
+        first_rows = np.asarray(first_rows).reshape(-1, 1, 1)
+        first_cols = np.asarray(first_cols).reshape(-1, 1, 1)
+        excluded = (np.abs(rows - first_rows) <= 1) & (np.abs(cols - first_cols) <= 1)
+
+        # Random key per cell, excluded cells can never be among the smallest
+        keys = self.rng.random((self.count, self.height, self.width))
+        keys[excluded] = 2.0
+        keys = keys.reshape(self.count, -1)
+        allowed = self.height * self.width - excluded.reshape(self.count, -1).sum(axis=1)
+        num_mines = min(self.num_mines, int(allowed.min()))
+        mines = np.zeros((self.count, self.height * self.width), dtype=bool)
+        if num_mines:
+            chosen = np.argpartition(keys, num_mines - 1, axis=1)[:, :num_mines]
+            np.put_along_axis(mines, chosen, True, axis=1)
+        self.mines = mines.reshape(self.count, self.height, self.width)
+        self.counts = neighbour_sum(self.mines)
+        self.safe_cells[:] = self.height * self.width - num_mines
+
+    def reveal(self, rows, cols):
+        """
+        Reveal one cell per board, a negative row skips that board.
+        Returns a K x H x W boolean stack of the cells revealed by this call.
+
+        Every BFS level is one dilation of the newly revealed zero cells over the boards still
+        cascading, so the number of array passes is the depth of the deepest cascade.
+        Best Case: O(count) - No board cascades.
+        Worst Case: O(d * count * height * width) - d is the depth of the deepest cascade.
+        """
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        boards = np.flatnonzero(rows >= 0)
+        rows, cols = rows[boards], cols[boards]
+
+        # Flagged and revealed cells are not opened, stepping on a mine explodes the board
+        playable = ~self.flagged[boards, rows, cols] & ~self.revealed[boards, rows, cols]
+        boards, rows, cols = boards[playable], rows[playable], cols[playable]
+        changed = np.zeros(self.mines.shape, dtype=bool)
+        changed[boards, rows, cols] = True
+
+        on_mine = self.mines[boards, rows, cols]
+        self.exploded[boards[on_mine]] = True
+        boards, rows, cols = boards[~on_mine], rows[~on_mine], cols[~on_mine]
+
+        # Batched flood fill, only the boards whose front is not empty are processed
+        front = np.zeros((len(boards), self.height, self.width), dtype=bool)
+        front[np.arange(len(boards)), rows, cols] = True
+        while len(boards):
+            zeros = front & (self.counts[boards] == 0)
+            cascading = zeros.any(axis=(1, 2))
+            boards, zeros = boards[cascading], zeros[cascading]
+            if not len(boards):
+                break
+            blocked = self.revealed[boards] | self.flagged[boards] | changed[boards]
+            front = dilate(zeros) & ~blocked
+            changed[boards] |= front
+
+        self.revealed |= changed
+        self.safe_revealed += (changed & ~self.mines).sum(axis=(1, 2))
+        return changed
+
+    def flag(self, rows, cols):
+        """
+        Toggle the flag of one hidden cell per board, a negative row skips that board.
+        Case is always O(count).
+        """
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        boards = np.flatnonzero(rows >= 0)
+        rows, cols = rows[boards], cols[boards]
+        hidden = ~self.revealed[boards, rows, cols]
+        boards, rows, cols = boards[hidden], rows[hidden], cols[hidden]
+        self.flagged[boards, rows, cols] ^= True
+
+    def is_won(self):
+        """Boolean array, one per board. Case is always O(count)."""
+        return ~self.exploded & (self.safe_revealed == self.safe_cells)
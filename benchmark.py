@@ -0,0 +1,230 @@
+"""
+    Benchmarks for the hot paths of the game, written to JSON so runs can be compared.
+
+    Usage: python3 benchmark.py [--sizes 10 100 1000] [--densities 0.1 0.2] [--leaderboard-sizes 100 10000]
+                                [--repeat 5] [--output benchmark.json]
+
+    The headless engine (generate_mines, irregular_safe_area, Board, GameStateManager) and the
+    leaderboard storages are always measured. The widget benchmarks (GameWidget.reveal_cell and
+    check_win) run with Qt in offscreen mode and are reported as
+    skipped when PySide6 is not installed.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from board import Board
+from game_state_storage import GameMove, GameStateManager
+from leaderboard_archive import LeaderboardArchive, compact_csv
+from leaderboard_storage import CsvLeaderboardStorage, SqliteLeaderboardStorage
+from start_game import generate_mines, irregular_safe_area, mines_for_density
+
+SEED = 1234  # Every run measures the same boards
+
+
+def time_call(function, setup=None, repeat=5):
+    """
+    Run setup() then time function(setup result) `repeat` times.
+    Returns the list of durations in seconds, the setup is not timed.
+    """
+    durations = []
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        start = time.perf_counter_ns()
+        function(argument)
+        durations.append((time.perf_counter_ns() - start) / 1e9)
+    return durations
+
+
+def result(name, params, durations):
+    """Summarize the durations of one benchmark."""
+    return {
+        "name": name,
+        "params": params,
+        "repeat": len(durations),
+        "min_s": min(durations),
+        "median_s": statistics.median(durations),
+        "mean_s": statistics.fmean(durations),
+    }
+
+
+def skipped(name, params, reason):
+    return {"name": name, "params": params, "skipped": reason}
+
+
+def placed_board(size, density, seed=SEED):
+    """A size x size board with its mines placed from the center."""
+    board = Board(size, size, density=density, seed=seed)
+    board.place_mines(size // 2, size // 2)
+    return board
+
+
+def bench_generation(sizes, densities, repeat):
+    results = []
+    for size in sizes:
+        for density in densities:
+            params = {"height": size, "width": size, "density": density}
+            num_mines = mines_for_density(size, size, density)
+            results.append(result("generate_mines", params, time_call(
+                lambda grid: generate_mines(grid, size // 2, size // 2, num_mines, rng=SEED),
+                lambda: [[None] * size for _ in range(size)], repeat)))
+            results.append(result("Board.place_mines", params, time_call(
+                lambda board: board.place_mines(size // 2, size // 2),
+                lambda: Board(size, size, num_mines, seed=SEED), repeat)))
+        grid = [[None] * size for _ in range(size)]
+        results.append(result("irregular_safe_area", {"height": size, "width": size}, time_call(
+            lambda _: irregular_safe_area(grid, size // 2, size // 2, rng=SEED), repeat=repeat)))
+    return results
+
+
+def bench_engine(sizes, densities, repeat):
+    results = []
+    for size in sizes:
+        for density in densities:
+            params = {"height": size, "width": size, "density": density}
+
+            # First click cascade, the biggest one of a game
+            results.append(result("Board.reveal", params, time_call(
+                lambda board: board.reveal(size // 2, size // 2),
+                lambda: placed_board(size, density), repeat)))
+            results.append(result("Board.is_won", params, time_call(
+                lambda board: board.is_won(), lambda: placed_board(size, density), repeat)))
+
+            # Journal: record the opening cascade, then undo it
+            def journal_setup():
+                board = placed_board(size, density)
+                move = GameMove(board.reveal(size // 2, size // 2))
+                return board, move, GameStateManager()
+
+            results.append(result("GameStateManager.record", params, time_call(
+                lambda state: state[2].record(state[1]), journal_setup, repeat)))
+
+            def undo_setup():
+                board, move, manager = journal_setup()
+                manager.record(move)
+                return board, manager
+
+            results.append(result("GameStateManager.undo", params, time_call(
+                lambda state: state[1].undo(state[0]), undo_setup, repeat)))
+    return results
+
+
+def qt_application():
+    """Start Qt in offscreen mode, or return None if PySide6 is not installed."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6.QtWidgets import QApplication
+    except ImportError:
+        return None
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def bench_game_widget(sizes, densities, repeat):
+    if qt_application() is None:
+        return [skipped("GameWidget.reveal_cell", {}, "PySide6 is not installed"),
+                skipped("GameWidget.check_win", {}, "PySide6 is not installed")]
+    from game import GameWidget
+
+    results = []
+    # A won reveal discards the autosave, so never touch the player's own save file
+    with tempfile.TemporaryDirectory() as directory:
+        widget = GameWidget(autosave_path=os.path.join(directory, "autosave.mssave"))
+        try:
+            for size in sizes:
+                for density in densities:
+                    params = {"height": size, "width": size, "density": density}
+                    widget.set_board_size(size, size, mines_for_density(size, size, density))
+
+                    def setup():
+                        widget.start_game()
+                        widget.board.reset(seed=SEED)
+                        widget.board.place_mines(size // 2, size // 2)
+                        widget.first_click = False
+                        return widget
+
+                    results.append(result("GameWidget.reveal_cell", params, time_call(
+                        lambda game: game.reveal_cell(size // 2, size // 2), setup, repeat)))
+                    results.append(result("GameWidget.check_win", params, time_call(
+                        lambda game: game.check_win(), setup, repeat)))
+        finally:
+            widget.autosaver.close()
+    return results
+
+
+def write_leaderboard(path, rows):
+    rng = random.Random(SEED)
+    with open(path, "w", newline="") as file:
+        for i in range(rows):
+            file.write(f"player{rng.randrange(1000)},{rng.randrange(10, 1000)}\n")
+
+
+def bench_leaderboard(leaderboard_sizes, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in leaderboard_sizes:
+            params = {"rows": rows}
+            csv_path = os.path.join(directory, f"leaderboard_{rows}.csv")
+            write_leaderboard(csv_path, rows)
+            csv_storage = CsvLeaderboardStorage(csv_path)
+            results.append(result("CsvLeaderboardStorage.top_k", params, time_call(
+                lambda _: csv_storage.top_k(10), repeat=repeat)))
+
+            sqlite_storage = SqliteLeaderboardStorage(os.path.join(directory, f"leaderboard_{rows}.db"),
+                                                      migrate_from=csv_path)
+            results.append(result("SqliteLeaderboardStorage.top_k", params, time_call(
+                lambda _: sqlite_storage.top_k(10), repeat=repeat)))
+            sqlite_storage.close()
+
+            archive_path = os.path.join(directory, f"leaderboard_{rows}.lba")
+            results.append(result("compact_csv", params, time_call(
+                lambda _: compact_csv(csv_path, archive_path), repeat=repeat)))
+            archive = LeaderboardArchive(archive_path)
+            results.append(result("LeaderboardArchive.top_k", params, time_call(
+                lambda _: archive.top_k(10), repeat=repeat)))
+            archive.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Minesweeper hot paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="board sides to sweep")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.1, 0.2], help="mine densities to sweep")
+    parser.add_argument("--leaderboard-sizes", type=int, nargs="+", default=[100, 10000, 100000],
+                        help="leaderboard rows to sweep")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark")
+    parser.add_argument("--output", default="benchmark.json", help="JSON file to write, - for stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    results += bench_generation(args.sizes, args.densities, args.repeat)
+    results += bench_engine(args.sizes, args.densities, args.repeat)
+    results += bench_game_widget(args.sizes, args.densities, args.repeat)
+    results += bench_leaderboard(args.leaderboard_sizes, args.repeat)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "repeat": args.repeat,
+            "seed": SEED,
+        },
+        "results": results,
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+    Compact planes for the board engine. A BitPlane stores one bit per cell (mines, revealed, flagged)
+    and a NibblePlane stores four bits per cell (adjacency counts, which are at most 8).
+    Single cells are read and written in O(1). Bulk operations load the whole plane into one
+    Python integer, so counting and masking run in C instead of looping over the cells.
+"""
+
+# Maps every byte to 1 if it has any bit set, used by BitPlane.indices
+NON_ZERO_BYTES = bytes([0] + [1] * 255)
+
+class BitPlane:
+    def __init__(self, size, bits=None):
+        """
+        Initialize a plane of `size` cells, all 0, or wrap existing packed bits.
+        Case is always O(size / 8).
+        """
+        self.size = size  # O(1)
+        self.bits = bytearray((size + 7) // 8) if bits is None else bytearray(bits)  # O(size / 8)
+
+    @classmethod
+    def from_indices(cls, size, indices):
+        """
+        Build a plane with the bits at the given flat indices set.
+        Case is always O(size / 8 + k) where k is the number of indices.
+        """
+        plane = cls(size)  # O(size / 8)
+        bits = plane.bits  # O(1)
+        for i in indices:  # O(k)
+            bits[i >> 3] |= 1 << (i & 7)  # O(1)
+        return plane
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        """Case is always O(1)."""
+        return (self.bits[i >> 3] >> (i & 7)) & 1
+
+    def __setitem__(self, i, value):
+        """Case is always O(1)."""
+        if value:
+            self.bits[i >> 3] |= 1 << (i & 7)
+        else:
+            self.bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def __eq__(self, other):
+        return isinstance(other, BitPlane) and self.size == other.size and self.bits == other.bits
+
+    def clear(self):
+        """
+        Set every bit to 0 without reallocating.
+        Case is always O(size / 8).
+        """
+        self.bits[:] = bytes(len(self.bits))  # O(size / 8)
+
+    def copy(self):
+        """Case is always O(size / 8), a single memory copy."""
+        return BitPlane(self.size, self.bits)
+
+    def to_int(self):
+        """
+        The whole plane as one integer, bit i = cell i.
+        Case is always O(size / 8), done in C.
+        """
+        return int.from_bytes(self.bits, "little")  # O(size / 8)
+
+    @classmethod
+    def from_int(cls, size, value):
+        """Case is always O(size / 8), done in C."""
+        return cls(size, value.to_bytes((size + 7) // 8, "little"))  # O(size / 8)
+
+    def count(self):
+        """
+        Number of bits set.
+        Case is always O(size / 8), done in C.
+        """
+        return self.to_int().bit_count()  # O(size / 8)
+
+    def __and__(self, other):
+        """Cells set in both planes, e.g. revealed & mines. Case is always O(size / 8)."""
+        return BitPlane.from_int(self.size, self.to_int() & other.to_int())
+
+    def __or__(self, other):
+        """Cells set in either plane. Case is always O(size / 8)."""
+        return BitPlane.from_int(self.size, self.to_int() | other.to_int())
+
+    def __xor__(self, other):
+        """Cells that differ between the two planes. Case is always O(size / 8)."""
+        return BitPlane.from_int(self.size, self.to_int() ^ other.to_int())
+
+    def without(self, other):
+        """Cells set in this plane but not in other, e.g. mines without flagged. Case is always O(size / 8)."""
+        return BitPlane.from_int(self.size, self.to_int() & ~other.to_int())
+
+    def indices(self):
+        """
+        Flat indices of the bits set, in order.
+        Case is O(size / 8) to skip the empty bytes in C, plus O(k) for the k bits set.
+        """
+        bits = self.bits  # O(1)
+        result = []  # O(1)
+        # Every byte becomes 0 or 1, so find() can jump straight to the next non-zero byte
+        non_zero = bits.translate(NON_ZERO_BYTES)  # O(size / 8) in C
+        byte = non_zero.find(1)  # O(size / 8) in C
+        while byte != -1:  # O(k)
+            value = bits[byte]  # O(1)
+            base = byte << 3  # O(1)
+            for bit in range(8):  # O(8)
+                if value >> bit & 1:
+                    result.append(base + bit)  # O(1) amortized
+            byte = non_zero.find(1, byte + 1)  # O(size / 8) in C over the whole loop
+        return result
+
+    def nbytes(self):
+        """Case is always O(1)."""
+        return len(self.bits)
+
+class NibblePlane:
+    def __init__(self, size, nibbles=None):
+        """
+        Initialize a plane of `size` cells holding values 0-15, two cells per byte
+        (cell 2k in the low nibble, cell 2k + 1 in the high nibble).
+        Case is always O(size / 2).
+        """
+        self.size = size  # O(1)
+        self.nibbles = bytearray((size + 1) // 2) if nibbles is None else bytearray(nibbles)  # O(size / 2)
+
+    @classmethod
+    def from_bytes_per_cell(cls, values):
+        """
+        Pack a bytearray with one value (0-15) per cell.
+        The even and odd cells are sliced apart in C, then the odd cells are shifted into the
+        high nibble of every byte at once through a big integer (no value is above 15, so
+        nothing carries into the next byte).
+        Case is always O(size), done in C.
+        """
+        size = len(values)  # O(1)
+        packed_len = (size + 1) // 2  # O(1)
+        low = int.from_bytes(values[0::2], "little")  # O(size)
+        high = int.from_bytes(values[1::2], "little")  # O(size)
+        return cls(size, (low | (high << 4)).to_bytes(packed_len, "little"))  # O(size)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        """Case is always O(1)."""
+        return (self.nibbles[i >> 1] >> ((i & 1) << 2)) & 0xF
+
+    def __setitem__(self, i, value):
+        """Case is always O(1)."""
+        shift = (i & 1) << 2
+        self.nibbles[i >> 1] = (self.nibbles[i >> 1] & ~(0xF << shift) & 0xFF) | ((value & 0xF) << shift)
+
+    def __eq__(self, other):
+        return isinstance(other, NibblePlane) and self.size == other.size and self.nibbles == other.nibbles
+
+    def clear(self):
+        """Case is always O(size / 2)."""
+        self.nibbles[:] = bytes(len(self.nibbles))  # O(size / 2)
+
+    def nbytes(self):
+        """Case is always O(1)."""
+        return len(self.nibbles)
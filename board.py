@@ -0,0 +1,313 @@
+"""
+    Headless board engine. The whole state of a Minesweeper board lives here in flat arrays
+    (index = row * width + col), so the game logic can run without any Qt widget and on boards
+    of any size. GameWidget only draws what this engine says.
+    The mine, revealed and flagged planes use one bit per cell and the adjacency counts four bits,
+    14 MB for a 4000x4000 board. The flat index of every mine adds 4 bytes per mine, so at the
+    default 20% density such a board takes about 27 MB in all (see nbytes).
+"""
+
+from array import array
+from collections import deque, namedtuple
+import random
+
+from bit_planes import BitPlane, NibblePlane
+
+from start_game import generate_mine_planes, mines_for_density, DEFAULT_DENSITY
+
+DIRECTIONS = [
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1)
+]
+
+FINGERPRINT_VERSION = 1  # Bump when generate_mine_planes changes, old fingerprints no longer match
+SEED_LIMIT = 1 << 64  # Seeds are unsigned 64-bit integers, as stored by the save and replay files
+
+
+def board_seed(seed=None):
+    """
+    Return the seed of a board: a random 32-bit one for None, otherwise the given integer.
+    Raises ValueError for anything that is not an integer in [0, 2**64), since fingerprints,
+    saves and replays all store the seed as an unsigned integer.
+    Case is always O(1).
+    """
+    if seed is None:
+        return random.getrandbits(32)
+    if isinstance(seed, bool) or not isinstance(seed, int) or not 0 <= seed < SEED_LIMIT:
+        raise ValueError(f"Board seeds must be integers in [0, 2**64), got {seed!r}")
+    return seed
+
+
+class BoardFingerprint(namedtuple("BoardFingerprint", "seed height width num_mines first_row first_col")):
+    """
+    Everything needed to regenerate a board exactly: the seed, the dimensions, the number of
+    mines and the first click. Encoded as a short string like "1-9f3a2c-10x10-20-4.7".
+    """
+
+    def encode(self):
+        """Case is always O(1)."""
+        return (f"{FINGERPRINT_VERSION}-{self.seed:x}-{self.height}x{self.width}"
+                f"-{self.num_mines}-{self.first_row}.{self.first_col}")
+
+    @classmethod
+    def decode(cls, text):
+        """
+        Parse a string made by encode(). Raises ValueError if it is malformed or from another version.
+        Case is always O(1).
+        """
+        try:
+            version, seed, dimensions, num_mines, first_click = text.strip().split("-")
+            height, width = dimensions.split("x")
+            first_row, first_col = first_click.split(".")
+            fingerprint = cls(int(seed, 16), int(height), int(width), int(num_mines), int(first_row), int(first_col))
+        except ValueError:
+            raise ValueError(f"Invalid board fingerprint: {text!r}") from None
+        if int(version) != FINGERPRINT_VERSION:
+            raise ValueError(f"Board fingerprint version {version} is not supported")
+        return fingerprint
+
+
+class Board:
+    def __init__(self, height, width, num_mines=None, density=None, seed=None):
+        """
+        Initialize an empty board. Mines are placed later, on the first click.
+        Either num_mines or a mine density (0 to 1) can be given, the default density is 20%.
+        Every board has a seed (a random one if none is given), so it can always be regenerated.
+        Raises ValueError for a seed that is not an integer in [0, 2**64).
+        Case is always O(height * width) since every plane is allocated once.
+        """
+        self.height = height  # O(1)
+        self.width = width  # O(1)
+        self.size = height * width  # O(1)
+        if num_mines is None:  # O(1)
+            num_mines = mines_for_density(height, width, DEFAULT_DENSITY if density is None else density)  # O(1)
+        self.num_mines = num_mines  # O(1)
+        self.seed = board_seed(seed)  # O(1)
+        self.first_click = None  # O(1)
+
+        # One bit per cell for the boolean planes, four bits per cell for the counts
+        self.mines = BitPlane(self.size)  # O(height * width / 8)
+        self.revealed = BitPlane(self.size)  # O(height * width / 8)
+        self.flagged = BitPlane(self.size)  # O(height * width / 8)
+        self.counts = NibblePlane(self.size)  # O(height * width / 2)
+
+        self.mines_placed = False  # O(1)
+        self.exploded = False  # O(1)
+
+        # Live counters, updated as cells change state
+        self.mine_indices = array("I")  # O(1) flat index of every mine, filled when the mines are placed
+        self.safe_cells = self.size - num_mines  # O(1)
+        self.safe_revealed = 0  # O(1)
+        self.flags_placed = 0  # O(1)
+
+    def reset(self, num_mines=None, seed=None):
+        """
+        Clear the board for a new game of the same size, reusing the allocated planes.
+        A new seed is drawn unless one is given, an invalid one raises ValueError before anything changes.
+        Case is always O(height * width / 8), the planes are zeroed in place.
+        """
+        self.seed = board_seed(seed)  # O(1)
+        if num_mines is not None:  # O(1)
+            self.num_mines = num_mines  # O(1)
+        self.first_click = None  # O(1)
+
+        self.mines.clear()  # O(height * width / 8)
+        self.revealed.clear()  # O(height * width / 8)
+        self.flagged.clear()  # O(height * width / 8)
+        self.counts.clear()  # O(height * width / 2)
+
+        self.mines_placed = False  # O(1)
+        self.exploded = False  # O(1)
+        self.mine_indices = array("I")  # O(1)
+        self.safe_cells = self.size - self.num_mines  # O(1)
+        self.safe_revealed = 0  # O(1)
+        self.flags_placed = 0  # O(1)
+
+    def index(self, row, col):
+        """
+        Convert a (row, col) pair to a flat index.
+        Case is always O(1).
+        """
+        return row * self.width + col  # O(1)
+
+    def place_mines(self, first_row, first_col):
+        """
+        Place the mines around the first click and store every adjacency count.
+        Case is always O(height * width) since generate_mine_planes is O(height * width).
+        """
+        mines, counts = generate_mine_planes(
+            self.height, self.width, first_row, first_col, self.num_mines, rng=random.Random(self.seed)
+        )  # O(height * width) one byte per cell while generating
+
+        # Remember where the mines are, find() scans the plane in C
+        self.mine_indices = array("I")  # O(1)
+        i = mines.find(1)  # O(height * width)
+        while i != -1:  # O(mines)
+            self.mine_indices.append(i)  # O(1) amortized
+            i = mines.find(1, i + 1)
+
+        # Pack the generated planes
+        self.mines = BitPlane.from_indices(self.size, self.mine_indices)  # O(height * width / 8 + mines)
+        self.counts = NibblePlane.from_bytes_per_cell(counts)  # O(height * width) in C
+        # A crowded row can hold fewer mines than asked for, so count the ones actually placed
+        self.safe_cells = self.size - len(self.mine_indices)  # O(1)
+
+        self.first_click = (first_row, first_col)  # O(1)
+        self.mines_placed = True  # O(1)
+
+    def fingerprint(self):
+        """
+        Return the BoardFingerprint of this board, or None before the mines are placed.
+        Case is always O(1).
+        """
+        if not self.mines_placed:
+            return None
+        return BoardFingerprint(self.seed, self.height, self.width, self.num_mines, *self.first_click)
+
+    @classmethod
+    def from_fingerprint(cls, fingerprint):
+        """
+        Regenerate the exact board described by a BoardFingerprint (or its encoded string),
+        with the mines already placed.
+        Case is always O(height * width) since the mines are placed again.
+        """
+        if isinstance(fingerprint, str):
+            fingerprint = BoardFingerprint.decode(fingerprint)
+        board = cls(fingerprint.height, fingerprint.width, fingerprint.num_mines, seed=fingerprint.seed)
+        board.place_mines(fingerprint.first_row, fingerprint.first_col)
+        return board
+
+    def is_mine(self, row, col):
+        """Case is always O(1)."""
+        return self.mines[self.index(row, col)] == 1
+
+    def is_revealed(self, row, col):
+        """Case is always O(1)."""
+        return self.revealed[self.index(row, col)] == 1
+
+    def is_flagged(self, row, col):
+        """Case is always O(1)."""
+        return self.flagged[self.index(row, col)] == 1
+
+    def adjacent_mines(self, row, col):
+        """Case is always O(1) since generate_mine_planes computes the counts when the mines are placed."""
+        return self.counts[self.index(row, col)]
+
+    def reveal(self, start_row, start_col):
+        """
+        BFS reveal starting at (start_row, start_col). Returns the list of flat indices that
+        were revealed by this call, so the caller only has to redraw those cells.
+        Revealing a mine marks the board as exploded.
+
+        Best Case: O(1) - The cell has adjacent mines, nothing is enqueued.
+        Average Case: O(K) - K is the number of connected safe cells.
+        Worst Case: O(height * width) - No mines around, the whole board is revealed.
+        """
+        width = self.width
+        height = self.height
+        start = start_row * width + start_col
+
+        if self.flagged[start] or self.revealed[start]:  # O(1)
+            return []
+
+        if self.mines[start]:  # O(1)
+            self.revealed[start] = 1
+            self.exploded = True
+            return [start]
+
+        # Work on the packed bytes directly, this is the hottest loop of the game
+        revealed = self.revealed.bits  # O(1)
+        flagged = self.flagged.bits  # O(1)
+        counts = self.counts.nibbles  # O(1)
+
+        changed = []
+        revealed[start >> 3] |= 1 << (start & 7)
+        queue = deque([start])  # O(1)
+
+        while queue:
+            i = queue.popleft()  # O(1)
+            changed.append(i)  # O(1) amortized
+
+            # If the cell has adjacent mines, stop expanding
+            if (counts[i >> 1] >> ((i & 1) << 2)) & 0xF:
+                continue
+
+            row, col = divmod(i, width)
+            for dx, dy in DIRECTIONS:  # O(8)
+                new_row, new_col = row + dx, col + dy
+                if 0 <= new_row < height and 0 <= new_col < width:
+                    j = new_row * width + new_col
+                    byte, bit = j >> 3, 1 << (j & 7)
+                    # Revealed cells are never revisited and flagged cells are skipped
+                    if not (revealed[byte] | flagged[byte]) & bit:
+                        revealed[byte] |= bit
+                        queue.append(j)  # O(1) amortized
+
+        self.safe_revealed += len(changed)  # O(1)
+        return changed
+
+    def flag(self, row, col):
+        """
+        Toggle the flag on a hidden cell. Returns the new flag state, or None if the
+        cell is already revealed and cannot be flagged.
+        Case is always O(1).
+        """
+        i = self.index(row, col)  # O(1)
+        if self.revealed[i]:
+            return None
+        self.flagged[i] ^= 1  # O(1)
+        flagged = self.flagged[i] == 1
+        self.flags_placed += 1 if flagged else -1  # O(1)
+        return flagged
+
+    def mines_remaining(self):
+        """
+        Number of mines minus the number of flags, as shown to the player.
+        Case is always O(1).
+        """
+        return self.num_mines - self.flags_placed  # O(1)
+
+    def is_won(self):
+        """
+        Check if every non-mine cell has been revealed.
+        Case is always O(1) since the revealed safe cells are counted as they are revealed.
+        """
+        return not self.exploded and self.safe_revealed == self.safe_cells  # O(1)
+
+    def mine_positions(self):
+        """
+        Return the (row, col) of every mine.
+        Case is always O(mines) since the mine positions are stored when they are placed.
+        """
+        return [divmod(i, self.width) for i in self.mine_indices]  # O(mines)
+
+    def revealed_count(self):
+        """
+        Number of revealed cells, counted over the packed plane.
+        Case is always O(height * width / 8), done in C.
+        """
+        return self.revealed.count()  # O(height * width / 8)
+
+    def unflagged_mines(self):
+        """
+        Mask of the mines that are not flagged yet.
+        Case is always O(height * width / 8), done in C.
+        """
+        return self.mines.without(self.flagged)  # O(height * width / 8)
+
+    def diff(self, other):
+        """
+        Flat indices of the cells whose revealed or flagged state differs from another board
+        of the same size.
+        Case is O(height * width / 8) in C, plus O(k) for the k cells that differ.
+        """
+        return ((self.revealed ^ other.revealed) | (self.flagged ^ other.flagged)).indices()
+
+    def nbytes(self):
+        """
+        Memory used by the planes.
+        Case is always O(1).
+        """
+        return (self.mines.nbytes() + self.revealed.nbytes() + self.flagged.nbytes()
+                + self.counts.nbytes() + self.mine_indices.itemsize * len(self.mine_indices))  # O(1)
@@ -0,0 +1,217 @@
+"""
+    Background pre-generation of no-guess boards.
+
+    Finding a board that can be finished by logic alone means generating boards and playing them
+    with the solver until one works, which is far too slow for the first click on the GUI thread.
+    NoGuessBoardPool does that work in worker processes ahead of time and keeps ready boards per
+    difficulty (height, width, mines). The first click only takes a ready board.
+
+    A ready board is stored as its fingerprint (seed and first click) plus the cells the player can
+    start from: every cell of the opening of the first click gives the same opening, so the board
+    is no-guess from any of them. Boards are regenerated from the fingerprint on the GUI thread,
+    which costs one place_mines.
+
+    A difficulty is filled until every cell of the board is a start of some ready board, so any
+    first click finds one. Each job aims at a cell no ready or running board covers yet, and
+    capacity only bounds the number of boards kept.
+
+    At high densities no-guess boards can be too rare to find: after MAX_FAILURES jobs in a row
+    come back empty the difficulty is given up for the session, and its first clicks fall back to
+    normal generation. The workers are spawned, never forked, since the GUI process runs threads
+    (Qt's pool, the autosave and the leaderboard writer) whose locks a fork would copy.
+"""
+
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import random
+import threading
+
+from board import Board
+from solver import solve_by_logic
+
+DEFAULT_CAPACITY = 128  # Most ready boards kept per difficulty, filling stops once every cell is covered
+MAX_ATTEMPTS = 50  # Boards tried by one job before it gives up
+MAX_FAILURES = 3  # Empty jobs in a row before a difficulty is given up
+
+
+class ReadyBoard(namedtuple("ReadyBoard", "fingerprint first_clicks")):
+    """A no-guess board: its BoardFingerprint and the frozenset of flat indices it can start from."""
+
+
+def generate_no_guess_board(height, width, num_mines, first_row, first_col, seed, max_attempts=MAX_ATTEMPTS):
+    """
+    Try boards with the given first click until one is won by logic alone.
+    Runs inside a worker process, so it only takes and returns plain picklable values.
+    Returns a ReadyBoard, or None if none of the max_attempts boards was no-guess.
+    Case is O(max_attempts * solve_by_logic) in the worst case.
+    """
+    rng = random.Random(seed)
+    for _ in range(max_attempts):
+        board = Board(height, width, num_mines, seed=rng.getrandbits(32))
+        board.place_mines(first_row, first_col)
+        opening = board.reveal(first_row, first_col)
+        # Every empty cell of the opening reveals the same opening
+        first_clicks = frozenset(i for i in opening if board.counts[i] == 0) or frozenset(opening)
+        if solve_by_logic(board):
+            return ReadyBoard(board.fingerprint(), first_clicks)
+    return None
+
+
+class NoGuessBoardPool:
+    def __init__(self, capacity=DEFAULT_CAPACITY, max_workers=None):
+        """
+        Create the pool, no work starts until a difficulty is added.
+        Case is always O(1).
+        """
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) - 1)  # Leave one core to the GUI
+        self.capacity = capacity  # O(1)
+        self.max_jobs = max_workers  # O(1) jobs running per difficulty, enough to keep every worker busy
+        self.executor = ProcessPoolExecutor(max_workers=max_workers,
+                                            mp_context=multiprocessing.get_context("spawn"))  # O(1) processes start lazily
+        self.ready = {}  # {(height, width, num_mines): deque of ReadyBoard}
+        self.coverage = {}  # {(height, width, num_mines): {flat index: ready boards that start from it}}
+        self.targets = {}  # {(height, width, num_mines): set of first clicks of the jobs running}
+        self.pending = {}  # {(height, width, num_mines): jobs running}
+        self.failures = {}  # {(height, width, num_mines): empty jobs in a row}
+        self.lock = threading.Lock()  # Job callbacks run on the executor thread
+        self.closed = False  # O(1)
+        self.rng = random.Random()  # O(1) seeds and first clicks of the jobs
+
+    def add_difficulty(self, height, width, num_mines):
+        """
+        Start filling the ready boards of a difficulty. Adding it twice does nothing.
+        Case is always O(max_jobs) jobs submitted.
+        """
+        key = (height, width, num_mines)
+        with self.lock:
+            if key not in self.ready:
+                self.ready[key] = deque()
+                self.coverage[key] = {}
+                self.targets[key] = set()
+                self.pending[key] = 0
+                self.failures[key] = 0
+        self.fill(key)
+
+    def ready_count(self, height, width, num_mines):
+        """Case is always O(1)."""
+        with self.lock:
+            return len(self.ready.get((height, width, num_mines), ()))
+
+    def covered_count(self, height, width, num_mines):
+        """Number of cells some ready board can start from. Case is always O(1)."""
+        with self.lock:
+            return len(self.coverage.get((height, width, num_mines), ()))
+
+    def given_up(self, height, width, num_mines):
+        """True once a difficulty stopped being filled because no no-guess board was found. Case is always O(1)."""
+        with self.lock:
+            return self.failures.get((height, width, num_mines), 0) >= MAX_FAILURES
+
+    def fill(self, key):
+        """
+        Submit jobs aimed at the cells no ready or running board covers, until every cell is
+        covered, max_jobs are running or the capacity is reached.
+        Case is O(max_jobs * height * width).
+        """
+        height, width, num_mines = key
+        while True:
+            with self.lock:
+                if (self.closed or self.failures[key] >= MAX_FAILURES or self.pending[key] >= self.max_jobs
+                        or len(self.ready[key]) + self.pending[key] >= self.capacity):
+                    return
+                target = self.candidate_click(key)
+                if target is None:
+                    return
+                self.pending[key] += 1
+                self.targets[key].add(target)
+                first_row, first_col = divmod(target, width)
+                seed = self.rng.getrandbits(32)
+            future = self.executor.submit(generate_no_guess_board, height, width, num_mines,
+                                          first_row, first_col, seed)
+            future.add_done_callback(lambda future, key=key, target=target: self.job_done(key, target, future))
+
+    def candidate_click(self, key):
+        """
+        First click for a new job: a random cell no ready board can start from and no running job
+        aims at, or None once every cell is covered. Called with the lock held.
+        Case is O(height * width).
+        """
+        height, width, _ = key
+        coverage, targets = self.coverage[key], self.targets[key]
+        if len(coverage) + len(targets) >= height * width:
+            return None
+        return self.rng.choice([i for i in range(height * width) if i not in coverage and i not in targets])
+
+    def add_ready(self, key, ready):
+        """Keep a ready board and count the cells it starts from. Called with the lock held. Case is O(opening)."""
+        self.ready[key].append(ready)
+        coverage = self.coverage[key]
+        for index in ready.first_clicks:
+            coverage[index] = coverage.get(index, 0) + 1
+
+    def remove_ready(self, key, ready):
+        """Case is O(capacity + opening). Called with the lock held."""
+        self.ready[key].remove(ready)
+        coverage = self.coverage[key]
+        for index in ready.first_clicks:
+            coverage[index] -= 1
+            if not coverage[index]:
+                del coverage[index]
+
+    def job_done(self, key, target, future):
+        """
+        Store the board of a finished job and submit the next one, unless too many jobs in a row
+        found nothing.
+        Case is O(opening) plus the jobs submitted by fill.
+        """
+        with self.lock:
+            self.pending[key] -= 1
+            self.targets[key].discard(target)
+            if self.closed or future.cancelled():
+                return
+        try:
+            ready = future.result()
+        except Exception as error:  # A dead worker must not stop the pool
+            print(f"No-guess board job failed: {error}")
+            ready = None
+        with self.lock:
+            if ready is not None:
+                self.add_ready(key, ready)
+                self.failures[key] = 0
+            else:
+                self.failures[key] += 1
+                if self.failures[key] == MAX_FAILURES:  # Only the job reaching the limit reports it
+                    print(f"No no-guess board found for {key[0]}x{key[1]} with {key[2]} mines, "
+                          f"giving up on this difficulty.")
+        self.fill(key)
+
+    def take(self, height, width, num_mines, row, col):
+        """
+        Take a ready board that can start from (row, col) and return its BoardFingerprint,
+        or None if no ready board fits so the caller falls back to normal generation. That only
+        happens while the difficulty is still being covered, or once it is given up.
+        Case is O(capacity) since it never waits for a worker.
+        """
+        key = (height, width, num_mines)
+        index = row * width + col
+        with self.lock:
+            queue = self.ready.get(key)
+            if queue is None or index not in self.coverage[key]:
+                return None
+            ready = next(ready for ready in queue if index in ready.first_clicks)
+            self.remove_ready(key, ready)
+        self.fill(key)
+        return ready.fingerprint
+
+    def shutdown(self):
+        """
+        Stop the workers. Queued jobs are cancelled, the ones already running are waited for
+        (at most one job per worker).
+        Case is O(one job) on the calling thread.
+        """
+        with self.lock:
+            self.closed = True
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,145 @@
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QRect, Signal
+from PySide6.QtGui import QColor, QFont, QPainter, QPen
+
+HIDDEN_COLORS = [QColor("#90EE90"), QColor("#66CC66")]
+REVEALED_COLOR = QColor("#ccc")
+MINE_COLOR = QColor("red")
+BORDER_COLOR = QColor("black")
+
+# How the mines are drawn once the game has ended
+SHOW_MINES_NONE = 0
+SHOW_MINES_EXPLODED = 1  # Game over: every mine in red with a bomb
+SHOW_MINES_FLAGGED = 2  # Game won: every mine flagged
+
+# Past this many dirty cells, one bounding rectangle is cheaper than one update per cell
+DIRTY_CELLS_BOUNDING_RECT = 64
+
+class BoardView(QWidget):
+    """
+    Draws a Board engine with a single widget instead of one QLabel per cell.
+    Only the cells inside the area Qt asks to repaint are painted, so inside a QScrollArea only
+    the visible viewport is drawn, and update_cells only invalidates the cells that changed.
+    Clicks are mapped to cells by dividing the position by the cell size.
+    """
+    cell_clicked = Signal(int, int)
+    cell_right_clicked = Signal(int, int)
+
+    def __init__(self, board, cell_size=60):
+        """
+        Initialize the view of a board
+        Case is always O(1) since no per-cell object is created.
+        """
+        super().__init__()
+        self.cell_size = cell_size  # O(1)
+        self.show_mines = SHOW_MINES_NONE  # O(1)
+        self.cell_font = QFont("Arial")  # O(1)
+        self.cell_font.setPixelSize(cell_size * 2 // 5)  # O(1) 24px on 60px cells
+        self.set_board(board)  # O(1)
+
+    def set_board(self, board):
+        """
+        Show another board, resizing the view to fit it.
+        Case is always O(1) plus one repaint of the visible cells.
+        """
+        self.board = board  # O(1)
+        self.show_mines = SHOW_MINES_NONE  # O(1)
+        self.setFixedSize(board.width * self.cell_size, board.height * self.cell_size)  # O(1)
+        self.update()  # O(1) schedules a repaint
+
+    def set_show_mines(self, mode):
+        """
+        Change how the mines are drawn (SHOW_MINES_NONE, SHOW_MINES_EXPLODED or SHOW_MINES_FLAGGED)
+        and repaint only the mine cells.
+        Case is always O(mines).
+        """
+        self.show_mines = mode  # O(1)
+        self.update_cells(self.board.mine_indices)  # O(mines)
+
+    def cell_rect(self, row, col):
+        """Case is always O(1)."""
+        return QRect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+
+    def update_cells(self, indices):
+        """
+        Mark the given flat cell indices as dirty. Small sets invalidate one rectangle per cell,
+        large cascades invalidate their bounding rectangle once.
+        Case is always O(k) where k is the number of cells.
+        """
+        if len(indices) == 0:  # O(1)
+            return
+        width = self.board.width  # O(1)
+        if len(indices) <= DIRTY_CELLS_BOUNDING_RECT:  # O(1)
+            for i in indices:  # O(k)
+                self.update(self.cell_rect(*divmod(i, width)))  # O(1)
+            return
+        rows = [i // width for i in indices]  # O(k)
+        cols = [i % width for i in indices]  # O(k)
+        top, bottom = min(rows), max(rows)  # O(k)
+        left, right = min(cols), max(cols)  # O(k)
+        self.update(QRect(left * self.cell_size, top * self.cell_size,
+                          (right - left + 1) * self.cell_size, (bottom - top + 1) * self.cell_size))  # O(1)
+
+    def paintEvent(self, event):
+        """
+        Paint only the cells that intersect the area to repaint.
+        Case is O(v) where v is the number of cells in that area, never the whole board.
+        """
+        board = self.board  # O(1)
+        size = self.cell_size  # O(1)
+        area = event.rect()  # O(1)
+        first_row = max(0, area.top() // size)  # O(1)
+        last_row = min(board.height - 1, area.bottom() // size)  # O(1)
+        first_col = max(0, area.left() // size)  # O(1)
+        last_col = min(board.width - 1, area.right() // size)  # O(1)
+
+        painter = QPainter(self)  # O(1)
+        painter.setFont(self.cell_font)  # O(1)
+        painter.setPen(QPen(BORDER_COLOR, 1))  # O(1)
+        for row in range(first_row, last_row + 1):  # O(visible rows)
+            for col in range(first_col, last_col + 1):  # O(visible columns)
+                self.paint_cell(painter, row, col)  # O(1)
+        painter.end()  # O(1)
+
+    def paint_cell(self, painter, row, col):
+        """
+        Paint one cell from the board state.
+        Case is always O(1).
+        """
+        board = self.board  # O(1)
+        i = row * board.width + col  # O(1)
+        text = ""  # O(1)
+        if board.mines[i] and self.show_mines == SHOW_MINES_EXPLODED:
+            color, text = MINE_COLOR, "💣"
+        elif board.revealed[i]:
+            if board.mines[i]:
+                color, text = MINE_COLOR, "💣"
+            else:
+                color = REVEALED_COLOR
+                count = board.counts[i]
+                text = str(count) if count > 0 else ""
+        else:
+            color = HIDDEN_COLORS[(row + col) % 2]
+            if board.flagged[i] or (board.mines[i] and self.show_mines == SHOW_MINES_FLAGGED):
+                text = "🚩"
+
+        rect = self.cell_rect(row, col)  # O(1)
+        painter.fillRect(rect, color)  # O(1)
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))  # O(1) 1px border inside the cell
+        if text:
+            painter.drawText(rect, Qt.AlignCenter, text)  # O(1)
+
+    def mousePressEvent(self, event):
+        """
+        Map the click to a cell with integer division and emit the matching signal.
+        Case is always O(1).
+        """
+        position = event.position().toPoint()  # O(1)
+        row = position.y() // self.cell_size  # O(1)
+        col = position.x() // self.cell_size  # O(1)
+        if not (0 <= row < self.board.height and 0 <= col < self.board.width):
+            return
+        if event.button() == Qt.LeftButton:
+            self.cell_clicked.emit(row, col)
+        elif event.button() == Qt.RightButton:
+            self.cell_right_clicked.emit(row, col)
@@ -0,0 +1,23 @@
+"""
+    Little-endian uint32 arrays for the binary files of the game (saves and leaderboard archives).
+    The files are always little-endian, so the arrays are only byte-swapped on big-endian hosts
+    and reading or writing them is a single memory copy everywhere else.
+"""
+
+from array import array
+import sys
+
+
+def little_endian(values):
+    """Return an array("I") in file byte order. Case is O(n) on big-endian hosts, O(1) otherwise."""
+    if sys.byteorder == "big":
+        values = array("I", values)
+        values.byteswap()
+    return values
+
+
+def read_uint32(data, start, length):
+    """Read length file-order uint32 values from data at start. Case is always O(length), a single memory copy."""
+    values = array("I")
+    values.frombytes(data[start:start + 4 * length])
+    return little_endian(values)
@@ -1,19 +1,28 @@
-from collections import deque
-
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QGridLayout, QPushButton, QMessageBox, QHBoxLayout
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QScrollArea, QPushButton, QMessageBox, QHBoxLayout
+from PySide6.QtCore import Qt, QTimer, QEvent
 from PySide6.QtGui import QFont
 
-from start_game import generate_mines
-from game_state_storage import GameStateManager
-from Leaderboard import LeaderboardWidget  # Import LeaderboardWidget
+from board import Board
+from board_view import BoardView, SHOW_MINES_NONE, SHOW_MINES_EXPLODED, SHOW_MINES_FLAGGED
+from game_clock import GameClock
+from game_save import Autosaver, load_game, snapshot
+from game_state_storage import GameMove, GameStateManager
+from background_task import run_in_background
+from replay import ReplayLog, CLICK, FLAG, UNDO, can_undo, save_replay
 
 CELL_SIZE = 60
 GRID_WIDTH = 10
 GRID_HEIGHT = 10
+MAX_VIEWPORT_CELLS = 10  # Bigger boards scroll inside a viewport of this many cells
+DISPLAY_REFRESH_MS = 250  # How often the time label is refreshed, the game clock itself does not tick
+AUTOSAVE_FILE = "autosave.mssave"  # Default save of the game in progress
+AUTOSAVE_MS = 2000  # How long after a move the game is saved, moves in between share one save
 
 class GameWidget(QWidget):
-    def __init__(self):
+    def __init__(self, autosave_path=AUTOSAVE_FILE):
+        """
+        autosave_path is the file the unfinished game is saved to and resumed from.
+        """
         super().__init__()
         layout = QVBoxLayout()
         
@@ -21,7 +30,8 @@ class GameWidget(QWidget):
         self.live_count = 3
         self.move_count = 0
         self.total_mines = 20  # Add this line to store total mines
-        self.flags_placed = 0  # Add this line to track placed flags
+        self.grid_height = GRID_HEIGHT
+        self.grid_width = GRID_WIDTH
         
         # Create a horizontal layout for the labels
         header_layout = QHBoxLayout()  # Add this line
@@ -46,10 +56,23 @@ class GameWidget(QWidget):
         
         layout.addLayout(header_layout)  # Add the horizontal layout to the main layout
         
-        # Game grid frame
-        self.grid_frame = QFrame()
-        self.grid_frame.setLayout(QGridLayout())  # Initialize an empty layout
-        layout.addWidget(self.grid_frame, alignment=Qt.AlignCenter)
+        # Notice shown when the no-guess mode could not give a no-guess board
+        self.notice_label = QLabel()
+        self.notice_label.setAlignment(Qt.AlignCenter)
+        self.notice_label.setWordWrap(True)
+        self.notice_label.setVisible(False)
+        layout.addWidget(self.notice_label)
+        
+        # Game board, painted by a single widget inside a scroll area
+        self.board = Board(self.grid_height, self.grid_width, self.total_mines)
+        self.board_view = BoardView(self.board, CELL_SIZE)
+        self.board_view.cell_clicked.connect(self.handle_click)
+        self.board_view.cell_right_clicked.connect(self.handle_right_click)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidget(self.board_view)
+        self.scroll_area.setAlignment(Qt.AlignCenter)
+        self.scroll_area.setFrameShape(QFrame.NoFrame)
+        layout.addWidget(self.scroll_area, alignment=Qt.AlignCenter)
         
         # "Start Again" button
         self.restart_button = QPushButton("Start Again")
@@ -62,6 +85,23 @@ class GameWidget(QWidget):
         # Load the game state manager
         self.state_manager = GameStateManager()
         
+        # The game clock measures the time, the timer only refreshes the label while it can be seen.
+        # One timer for the whole life of the widget, restarts only stop it
+        self.clock = GameClock()
+        self.timer = QTimer(self)
+        self.timer.setInterval(DISPLAY_REFRESH_MS)
+        self.timer.timeout.connect(self.update_timer)
+        
+        # Unfinished games are saved in the background a moment after a move,
+        # the single-shot timer only runs while there is something to save
+        self.autosaver = Autosaver(autosave_path)
+        self.unsaved_changes = False
+        self.resume_offered = False
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_MS)
+        self.autosave_timer.timeout.connect(self.autosave)
+        
         # Start the game for the first time
         self.start_game()
         
@@ -69,6 +109,9 @@ class GameWidget(QWidget):
         
         # Add reference to LeaderboardWidget
         self.leaderboard_widget = None  # Will be set from MinesweeperWindow
+        
+        # Pool of prepared no-guess boards, None when the mode is off
+        self.board_pool = None
     
     def set_nickname(self, nickname):
         """
@@ -88,85 +131,223 @@ class GameWidget(QWidget):
         """
         self.leaderboard_widget = leaderboard_widget # O(1)
     
+    def set_board_size(self, height, width, num_mines):
+        """
+        Change the size of the board used from the next start_game on
+        Case is always O(1).
+        """
+        self.grid_height = height # O(1)
+        self.grid_width = width # O(1)
+        self.total_mines = num_mines # O(1)
+        if self.board_pool:
+            self.board_pool.add_difficulty(height, width, num_mines) # O(1) the work runs in the pool
+
+    def set_board_pool(self, board_pool):
+        """
+        Turn the no-guess mode on with a NoGuessBoardPool, or off with None.
+        The pool starts preparing boards of the current size right away.
+        Case is always O(1) on the GUI thread.
+        """
+        self.board_pool = board_pool # O(1)
+        if board_pool:
+            board_pool.add_difficulty(self.grid_height, self.grid_width, self.total_mines) # O(1)
+
     def start_game(self):
         """
         Initialize or restart the game state.
-        Best Case: O(1) - Initialize or restart the game state
-        Average Case: O(1) - Initialize or restart the game state
-        Worst Case: O(1) - Initialize or restart the game state
+        When the size has not changed the board planes, the view and the timer are reset in place,
+        nothing is reallocated.
+        Case is always O(width * height / 8) for zeroing the packed board planes, no cell widget is built.
         """
         # Reset timer
-        self.time_elapsed = 0 # O(1)
+        self.clock.reset() # O(1)
+        self.sync_display_timer() # O(1)
         self.timer_label.setText("Time: 00:00") # O(1)
-        self.timer = QTimer(self) # O(1)
-        self.timer.timeout.connect(self.update_timer) # O(1)
         
         # Reset the amount of mines left
-        self.total_mines = 20 # O(1)
         self.mines_label.setText(f"Mines Left: {self.total_mines}")
         
-        # Reset Lives
+        # Reset Lives and moves
         self.live_count = 3 # O(1)
         self.lives_label.setText(f"Lives: {self.live_count}") # O(1)
+        self.move_count = 0 # O(1)
 
-        # Reset game state
-        self.grid = [[None for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)] # O(width * height)
-        self.cells = [] # O(1)
+        # Reset game state, only rebuild the board when its size changed
+        if self.board.height == self.grid_height and self.board.width == self.grid_width:
+            self.board.reset(self.total_mines) # O(width * height / 8)
+        else:
+            self.board = Board(self.grid_height, self.grid_width, self.total_mines) # O(width * height / 8)
         self.first_click = True # O(1)
+        
+        # Every click, flag and undo of the game is logged so a win can be replayed
+        self.replay = ReplayLog.for_board(self.board, self.live_count) # O(1)
 
-        # Clear and rebuild the grid layout
-        grid_layout = self.grid_frame.layout()  # Get the existing layout
-        grid_layout.setSpacing(1)  # No space between cells
-        grid_layout.setContentsMargins(10, 10, 10, 10)  # No margin around the grid
-
-        for i in reversed(range(grid_layout.count())): 
-            widget = grid_layout.itemAt(i).widget() # O(1)
-            if widget:
-                widget.setParent(None) # O(1)
-
-        for row in range(GRID_HEIGHT):
-            row_cells = []
-            for col in range(GRID_WIDTH):
-                cell = QLabel() # O(1)
-                cell.setFixedSize(CELL_SIZE, CELL_SIZE) # O(1)
-                color = "#90EE90" if (row + col) % 2 == 0 else "#66CC66" # O(1)
-                cell.setStyleSheet(f"background-color: {color}; border: 1px solid black; text-align: center; font-size: 24px; display: flex; padding-left: 17px;") # O(1)
-                
-                # Make cells clickable
-                cell.mousePressEvent = lambda e, r=row, c=col: self.handle_mouse_event(e, r, c) # O(1)
-                
-                grid_layout.addWidget(cell, row, col) # O(1)
-                row_cells.append(cell) # O(1)
-            self.cells.append(row_cells) # O(1)
+        # Point the view at the board, no per-cell widget is created
+        self.show_board() # O(1)
             
         # Clear the game state history
         self.state_manager.clear_history() # O(1)
 
-        # Hide the restart button
+        # Hide the restart button and the notice of the last game
         self.restart_button.setVisible(False)
+        self.notice_label.setVisible(False)
         print("Game started/restarted!")
 
+    def show_board(self):
+        """
+        Point the view at the current board and fit the scroll area to it
+        Case is always O(1), no per-cell widget is created.
+        """
+        self.board_view.set_board(self.board) # O(1)
+        self.board_view.setEnabled(True) # O(1)
+        viewport = MAX_VIEWPORT_CELLS * CELL_SIZE # O(1)
+        self.scroll_area.setMinimumSize(min(self.board_view.width(), viewport) + 2, min(self.board_view.height(), viewport) + 2) # O(1)
+
+    def mark_unsaved(self):
+        """
+        Schedule an autosave, moves played before it fires are saved together
+        Case is always O(1).
+        """
+        self.unsaved_changes = True # O(1)
+        if not self.autosave_timer.isActive():
+            self.autosave_timer.start() # O(1)
+
+    def autosave(self):
+        """
+        Hand a snapshot of the game to the autosave thread. Nothing is saved before the mines are
+        placed or while an explosion waits for the player to decide.
+        Case is always O(width * height / 2) memory copies on the GUI thread, the file is written by the autosave thread.
+        """
+        if not self.unsaved_changes or not self.board.mines_placed or self.board.exploded:
+            return
+        self.unsaved_changes = False # O(1)
+        self.autosaver.submit(snapshot(self.board, self.live_count, self.clock.elapsed_ms(), self.move_count,
+                                       self.state_manager.history, self.replay.encode())) # O(width * height / 2 + k)
+
+    def discard_save(self):
+        """
+        Forget the saved game once it is over
+        Case is always O(1), the file is removed by the autosave thread.
+        """
+        self.unsaved_changes = False # O(1)
+        self.autosave_timer.stop() # O(1)
+        self.autosaver.discard() # O(1)
+
+    def save_and_close(self):
+        """
+        Save the game still in progress and wait for the file to be written, before the window closes
+        Case is always O(width * height / 2).
+        """
+        self.autosave_timer.stop()
+        self.autosave()
+        self.autosaver.close()
+
+    def offer_resume(self):
+        """
+        Ask once per session whether to resume the game saved by a previous session
+        Case is always O(width * height / 2) memory copies when a save is loaded, O(1) otherwise.
+        """
+        if self.resume_offered or not self.autosaver.exists():
+            return
+        self.resume_offered = True
+        reply = QMessageBox.question(self, "Unfinished game", "Would you like to resume your last game?", QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            self.discard_save()
+            return
+        try:
+            saved = load_game(self.autosaver.path)
+        except (OSError, ValueError) as error:
+            print(f"Could not load the saved game: {error}")
+            self.discard_save()
+            return
+        self.resume_game(saved)
+
+    def resume_game(self, saved):
+        """
+        Continue a SavedGame: its board, lives, moves, undo journal and time played
+        Case is always O(k) for the k cells of the undo journal, the board planes are used as loaded.
+        """
+        self.board = saved.board # O(1)
+        self.grid_height, self.grid_width, self.total_mines = self.board.height, self.board.width, self.board.num_mines # O(1)
+        self.first_click = not self.board.mines_placed # O(1)
+        self.move_count = saved.move_count # O(1)
+        self.live_count = saved.lives # O(1)
+        self.lives_label.setText(f"Lives: {self.live_count}") # O(1)
+        self.mines_label.setText(f"Mines Left: {self.board.mines_remaining()}") # O(1)
+
+        self.state_manager.clear_history() # O(1)
+        for move in saved.moves: # O(moves)
+            self.state_manager.record(move) # O(1) amortized
+
+        # Keep logging into the replay of the saved game, a save without one cannot be verified anymore
+        self.replay = ReplayLog.for_board(self.board, self.live_count, move_count=self.move_count) # O(1)
+        if self.board.mines_placed:
+            self.replay.set_board(self.board) # O(1)
+        if saved.replay is not None:
+            try:
+                self.replay = ReplayLog.decode(saved.replay) # O(events)
+            except ValueError as error:
+                print(f"Could not load the replay of the saved game: {error}")
+
+        self.show_board() # O(1)
+        self.restart_button.setVisible(False) # O(1)
+        self.notice_label.setVisible(False) # O(1)
+
+        # The clock continues from the time already played
+        self.clock.restore(saved.elapsed_ms) # O(1)
+        if self.board.mines_placed:
+            self.clock.resume() # O(1)
+        self.update_timer() # O(1)
+        self.sync_display_timer() # O(1)
+        print(f"Resumed a {self.board.height}x{self.board.width} game after {saved.elapsed_ms / 1000:.1f}s")
+
     def update_timer(self):
-        """Update the timer
+        """Update the timer label from the game clock
         Best Case: O(1) - Simple timer update
         Average Case: O(1) - Simple timer update
         Worst Case: O(1) - Simple timer update
         """
-        self.time_elapsed += 1
-        minutes = self.time_elapsed // 60
-        seconds = self.time_elapsed % 60
+        elapsed = self.clock.elapsed_ms() // 1000
+        minutes = elapsed // 60
+        seconds = elapsed % 60
         self.timer_label.setText(f"Time: {minutes:02}:{seconds:02}")
-        
-    def handle_mouse_event(self, event, row, col):
-        """Handle mouse events for cell clicks
-        Best Case: O(1) - Simple flag toggle and counter update
-        Average Case: O(1) - Simple flag toggle and counter update
-        Worst Case: O(1) - Simple flag toggle and counter update
+
+    def sync_display_timer(self):
+        """Refresh the label only while the clock runs and the game can be seen,
+        so a hidden page or a minimized window gets no wakeups
+        Every Case: O(1)
         """
-        if event.button() == Qt.LeftButton:
-            self.handle_click(row, col)
-        elif event.button() == Qt.RightButton:
-            self.handle_right_click(row, col)
+        visible = self.isVisible() and not self.window().isMinimized()
+        if self.clock.running and visible:
+            if not self.timer.isActive():
+                self.update_timer()
+                self.timer.start()
+        else:
+            self.timer.stop()
+
+    def showEvent(self, event):
+        """Resume the label refresh when the game page is shown
+        Every Case: O(1)
+        """
+        super().showEvent(event)
+        # Minimizing only sends a state change to the top-level window, so listen to it
+        self.window().installEventFilter(self)
+        self.sync_display_timer()
+
+    def hideEvent(self, event):
+        """Stop the label refresh when the game page is hidden
+        Every Case: O(1)
+        """
+        super().hideEvent(event)
+        self.sync_display_timer()
+
+    def eventFilter(self, watched, event):
+        """Follow the top-level window being minimized or restored
+        Every Case: O(1)
+        """
+        if event.type() == QEvent.WindowStateChange:
+            self.sync_display_timer()
+        return super().eventFilter(watched, event)
         
     def handle_click(self, row, col):
         """Handle cell clicks
@@ -175,45 +356,76 @@ class GameWidget(QWidget):
         """
         if self.first_click:
             self.first_click = False
-            # Generate mines after first click
-            self.grid = generate_mines(self.grid, row, col, self.total_mines)
-            # Start the timer on first click
-            self.timer.start(1000)
+            # Generate mines after first click, from a prepared no-guess board when one fits
+            fingerprint = None
+            if self.board_pool and self.board.flags_placed == 0:  # Reseeding would drop early flags
+                fingerprint = self.board_pool.take(self.grid_height, self.grid_width, self.total_mines, row, col)
+            if fingerprint:
+                self.board.reset(seed=fingerprint.seed)
+                self.board.place_mines(fingerprint.first_row, fingerprint.first_col)
+            else:
+                if self.board_pool:
+                    self.show_no_guess_miss()
+                self.board.place_mines(row, col)
+            self.replay.set_board(self.board)
+            print(f"Board fingerprint: {self.board.fingerprint().encode()}")
+            # Start the clock on first click
+            self.clock.start()
+            self.sync_display_timer()
             
         # Increment move count
         self.move_count += 1
+        self.replay.record(self.clock.elapsed_ms(), CLICK, self.board.index(row, col))
+        self.mark_unsaved()
             
         # Prevent digging if the cell is flagged
-        if self.cells[row][col].text() == "🚩":
+        if self.board.is_flagged(row, col):
             print("Cell is flagged, cannot dig.")
             return
         
         # Handle the click
-        if self.grid[row][col] == 'M':
-            self.state_manager.push_state(self.grid, self.cells)
+        if self.board.is_mine(row, col):
+            # Record the explosion so it can be undone
+            self.state_manager.record(GameMove(self.board.reveal(row, col), exploded=True))
             self.game_over()
         else:
             self.reveal_cell(row, col)
         
+    def show_no_guess_miss(self):
+        """
+        Tell the player this game is played on a normal board, which may need a guess
+        Case is always O(1).
+        """
+        if self.board.flags_placed:
+            reason = "Flags were placed before the first click"
+        elif self.board_pool.given_up(self.grid_height, self.grid_width, self.total_mines):
+            reason = "No no-guess board could be found with this many mines"
+        else:
+            reason = "No no-guess board was ready for this cell yet"
+        self.notice_label.setText(f"{reason}, this board may need a guess.")
+        self.notice_label.setVisible(True)
+
     def handle_right_click(self, row, col):
         """Handle right clicks
         Every Case: O(1) - one click, check if flagged and add or remove flag
         """
         print(f"Right clicked on cell ({row}, {col})")
-        cell = self.cells[row][col]
-        if cell.text() == "🚩":
-            # Remove flag
-            cell.setText("")
-            self.flags_placed -= 1
-            print(f"Unflagged cell ({row}, {col})")
-        else:
-            # Add flag
-            cell.setText("🚩")
-            self.flags_placed += 1
+        flagged = self.board.flag(row, col)
+        if flagged is None:
+            # Revealed cells cannot be flagged
+            return
+        if flagged:
             print(f"Flagged cell ({row}, {col})")
-        
-        # Update mines left display
-        self.mines_label.setText(f"Mines Left: {self.total_mines - self.flags_placed}")
+        else:
+            print(f"Unflagged cell ({row}, {col})")
+        index = self.board.index(row, col)
+        self.replay.record(self.clock.elapsed_ms(), FLAG, index)
+        self.state_manager.record(GameMove(flagged=[index], flags_delta=1 if flagged else -1))
+        self.board_view.update_cells([index])
+        self.mark_unsaved()
+        
+        # Update mines left display, the board keeps the flag counter
+        self.mines_label.setText(f"Mines Left: {self.board.mines_remaining()}")
 
     # Uses BFS to reveal cells
     def reveal_cell(self, start_row, start_col):
@@ -228,8 +440,8 @@ class GameWidget(QWidget):
         - Best Case: O(1), when the clicked cell has adjacent mines and no neighbors are enqueued.
 
         Space Complexity:
-        - O(N) for the `visited` set and the BFS `queue`.
-        Both could potentially store all cells in the grid in the worst case.
+        - O(N) for the BFS `queue` inside Board.reveal.
+        It could potentially store all cells in the grid in the worst case.
 
         Why BFS is optimal for this task:
         1. Guarantees shortest path exploration from the starting cell.
@@ -238,123 +450,59 @@ class GameWidget(QWidget):
         4. More memory-efficient than DFS in this case, as recursion depth could be large for empty regions.
         """
         
-        # Store current game state
-        self.state_manager.push_state(self.grid, self.cells)
-        
-        visited = set()
-        queue = deque([(start_row, start_col)])  # O(1) amortized - List append
-        
-        while queue:
-            row, col = queue.popleft()
-            
-            # Skip if already visited
-            if (row, col) in visited:
-                continue
-            visited.add((row, col))  # O(1) amortized - Set add
-            
-            cell = self.cells[row][col]
-
-            # Skip flagged cells
-            if cell.text() == "🚩":
-                continue
-
-            # Count adjacent mines
-            mine_count = 0
-            for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
-                new_row, new_col = row + dx, col + dy
-                if (0 <= new_row < GRID_HEIGHT and 0 <= new_col < GRID_WIDTH and
-                    self.grid[new_row][new_col] == 'M'):
-                    mine_count += 1
-
-            # Update the cell display
-            cell.setText(str(mine_count) if mine_count > 0 else "")
-            cell.setStyleSheet("background-color: #ccc; border: 1px solid black; text-align: center; font-size: 24px; display: flex; padding-left: 17px;")
-
-            # If the cell has adjacent mines, stop expanding
-            if mine_count > 0:
-                continue
-
-            # If no adjacent mines, enqueue all neighbors
-            for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
-                new_row, new_col = row + dx, col + dy
-                if (0 <= new_row < GRID_HEIGHT and 0 <= new_col < GRID_WIDTH and
-                    (new_row, new_col) not in visited):
-                    queue.append((new_row, new_col))  # O(1) amortized - List append
+        # The board engine runs the BFS, the view only repaints the revealed cells
+        changed = self.board.reveal(start_row, start_col)
+        self.board_view.update_cells(changed)  # O(K) where K is the number of revealed cells
+
+        # Store only the cells this move changed
+        if changed:
+            self.state_manager.record(GameMove(changed))  # O(K)
 
         # Check for win condition
         self.check_win()
 
     def check_win(self):
         """Check if all non-mine cells have been revealed
-        Complexity: O(N) where N is total grid size
-        Must check every cell's state
-        Worst Case: O(N) - Must check every cell
-        """
-        for row in range(GRID_HEIGHT):
-            for col in range(GRID_WIDTH):
-                cell = self.cells[row][col]
-                # If cell is not revealed (still green) and not a mine, game isn't won yet
-                if (self.grid[row][col] != 'M' and 
-                    ("#90EE90" in cell.styleSheet() or "#66CC66" in cell.styleSheet())):
-                    return
-        
-        # If we get here, all non-mine cells are revealed
-        self.game_won()
-
-    def count_adjacent_mines(self, row, col):
-        """
-        Count adjacent mines for a cell
-        Complexity: O(1 * n) - Always checks exactly 8 adjacent cells where n is 8
-        Worst Case: O(1 * n) - Always checks exactly 8 adjacent cells where n is 8
-        """
-        count = 0
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                new_row, new_col = row + dx, col + dy
-                if (0 <= new_row < GRID_HEIGHT and 
-                    0 <= new_col < GRID_WIDTH and 
-                    self.grid[new_row][new_col] == 'M'):
-                    count += 1
-        return count
-        
+        Complexity: O(1) - The board engine counts the revealed safe cells as they change,
+        so this is a single integer comparison
+        """
+        if self.board.is_won():
+            self.game_won()
+
     def undo_last_move(self):
         """Restore previous game state
-        Complexity: O(N) where N is grid size (height * width)
-        Must restore state of every cell
-        Worst Case: O(N) - Must restore state of every cell (height * width)
-        """
-        previous_state = self.state_manager.pop_state()
-        if previous_state:
-            # Restore gird
-            self.grid = previous_state.grid
+        Undoing the move is O(K) where K is the number of cells it changed,
+        the mines painted by game_over are repainted in O(mines)
+        Worst Case: O(K + mines)
+        """
+        self.replay.record(self.clock.elapsed_ms(), UNDO)
+        move = self.state_manager.undo(self.board)
+        if move:
+            self.mines_label.setText(f"Mines Left: {self.board.mines_remaining()}")
             
-            for row in range(GRID_HEIGHT):
-                for col in range(GRID_WIDTH):
-                    saved_cell = previous_state.cells_state[row][col]
-                    self.cells[row][col].setText(saved_cell['text'])
-                    self.cells[row][col].setStyleSheet(saved_cell['style'])
-                    self.cells[row][col].setEnabled(True)
+            self.board_view.update_cells(move.cells())  # O(K)
+            self.board_view.set_show_mines(SHOW_MINES_NONE)  # O(mines)
+            self.board_view.setEnabled(True)  # O(1)
+            self.mark_unsaved()  # O(1)
                     
-        # Resume timer
-        self.timer.start(1000)
+        # Resume the clock, the time spent in the dialog is not counted
+        self.clock.resume()
+        self.sync_display_timer()
         
     def game_over(self):
         """Handle game over state
-        Best Case: O(1) - Only one mine remains to be revealed
-        Average Case: O(height * width) - Reveal all mines and disable all cells
-        Worst Case: O(height * width) - Reveal all mines and disable all cells
+        Case is always O(mines) since the board stores the mine positions
+        and the view is disabled as a whole
         """
         # Reveal all mines
-        for row in range(GRID_HEIGHT):
-            for col in range(GRID_WIDTH):
-                if self.grid[row][col] == 'M':
-                    self.cells[row][col].setStyleSheet("background-color: red; border: 1px solid black; text-align: center; font-size: 24px; display: flex; padding-left: 17px;")
-                    self.cells[row][col].setText("💣")
+        self.board_view.set_show_mines(SHOW_MINES_EXPLODED)
         
-        # Stop the timer
-        self.timer.stop()
+        # Pause the clock while the player decides
+        self.clock.pause()
+        self.sync_display_timer()
+        self.update_timer()
         
-        if self.live_count > 0 and not self.first_click and self.move_count > 2:
+        if can_undo(self.live_count, self.move_count):
             # Ask player if they want to save the game state
             reply = QMessageBox.question(self, "Oops! You stepped in the wrong place", "Would you like to undo your last move?", QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.Yes:
@@ -364,46 +512,48 @@ class GameWidget(QWidget):
                 self.undo_last_move()
             else:
                 # Disable further clicks on cells
-                for row in self.cells:
-                    for cell in row:
-                        cell.setEnabled(False)  # Disable the cell
+                self.board_view.setEnabled(False)
                 # Show the restart button
                 self.restart_button.setVisible(True)
+                self.discard_save()
         else:
             # Disable further clicks on cells
-            for row in self.cells:
-                for cell in row:
-                    cell.setEnabled(False)  # Disable the cell
+            self.board_view.setEnabled(False)
             # Show the restart button
             self.restart_button.setVisible(True)
+            self.discard_save()
         
     def game_won(self):
         """Handle game won state
-        Complexity: O(height * width) where height and width are grid size
-        Must flag all mines and disable all cells
-        Worst Case: O(height * width) - Must flag all mines and disable all cells
+        Case is always O(mines) since the board stores the mine positions
+        and the view is disabled as a whole
         """
-        # Stop the timer
-        self.timer.stop()
+        # Stop the clock
+        self.clock.pause()
+        self.sync_display_timer()
+        self.update_timer()
         
         # Flag all mines
-        for row in range(GRID_HEIGHT):
-            for col in range(GRID_WIDTH):
-                if self.grid[row][col] == 'M':
-                    self.cells[row][col].setText("🚩")
+        self.board_view.set_show_mines(SHOW_MINES_FLAGGED)
         
         # Disable further clicks on cells
-        for row in self.cells:
-            for cell in row:
-                cell.setEnabled(False)
+        self.board_view.setEnabled(False)
         
         # Show the restart button
         self.restart_button.setVisible(True)
         
+        # A won game has nothing left to resume
+        self.discard_save()
+        
         # Update leaderboard
         print(f"Leaderboard Widget: {self.leaderboard_widget}, Nickname: {self.nickname}")
         if self.leaderboard_widget and self.nickname:
-            time_taken = self.time_elapsed
-            print(f"Writing to leaderboard: {self.nickname}, Time: {time_taken}")
-            self.leaderboard_widget.write_to_leaderboard_csv(self.nickname, time_taken)
-            self.leaderboard_widget.load_and_display_leaderboard()
+            time_ms = self.clock.elapsed_ms()
+            time_taken = time_ms / 1000  # Seconds with millisecond precision
+            fingerprint = self.board.fingerprint().encode()
+            print(f"Writing to leaderboard: {self.nickname}, Time: {time_taken}, Board: {fingerprint}")
+            self.leaderboard_widget.add_score(self.nickname, time_taken, fingerprint)  # Written in the background
+            # The replay is the evidence of the score, see replay.py to verify it
+            self.replay.nickname = self.nickname
+            run_in_background(save_replay, self.replay, time_ms,
+                              on_failed=lambda message: print(f"Could not save the replay: {message}"))
@@ -0,0 +1,68 @@
+import time
+
+class GameClock:
+    def __init__(self):
+        """
+        Game clock based on time.perf_counter_ns, which is monotonic and does not depend on
+        how often the event loop gets to run. The time already played is kept in
+        `accumulated_ns`, the current running stretch starts at `started_ns`.
+        Case is always O(1).
+        """
+        self.accumulated_ns = 0  # O(1)
+        self.started_ns = None  # O(1) None while paused or stopped
+
+    @property
+    def running(self):
+        """Case is always O(1)."""
+        return self.started_ns is not None
+
+    def reset(self):
+        """
+        Stop the clock and set it back to zero.
+        Case is always O(1).
+        """
+        self.accumulated_ns = 0  # O(1)
+        self.started_ns = None  # O(1)
+
+    def start(self):
+        """
+        Start the clock from zero.
+        Case is always O(1).
+        """
+        self.accumulated_ns = 0  # O(1)
+        self.started_ns = time.perf_counter_ns()  # O(1)
+
+    def pause(self):
+        """
+        Stop counting and keep the time played so far. Pausing a paused clock does nothing.
+        Case is always O(1).
+        """
+        if self.started_ns is not None:  # O(1)
+            self.accumulated_ns += time.perf_counter_ns() - self.started_ns  # O(1)
+            self.started_ns = None  # O(1)
+
+    def resume(self):
+        """
+        Continue counting after a pause. Resuming a running clock does nothing.
+        Case is always O(1).
+        """
+        if self.started_ns is None:  # O(1)
+            self.started_ns = time.perf_counter_ns()  # O(1)
+
+    def restore(self, elapsed_ms):
+        """
+        Set the time already played, e.g. from a saved game. The clock stays paused until resumed.
+        Case is always O(1).
+        """
+        self.accumulated_ns = elapsed_ms * 1_000_000  # O(1)
+        self.started_ns = None  # O(1)
+
+    def elapsed_ns(self):
+        """Case is always O(1)."""
+        if self.started_ns is None:  # O(1)
+            return self.accumulated_ns  # O(1)
+        return self.accumulated_ns + time.perf_counter_ns() - self.started_ns  # O(1)
+
+    def elapsed_ms(self):
+        """Case is always O(1)."""
+        return self.elapsed_ns() // 1_000_000  # O(1)
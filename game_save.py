@@ -0,0 +1,271 @@
+"""
+    Compact binary save files for games in progress.
+
+    A save is the in-memory image of the Board, so loading it is a few memory copies instead of
+    placing the mines again, even on a 4000x4000 board:
+        header      magic, version, flags, dimensions, mines, seed, first click, counters,
+                    lives, moves played, elapsed time and the length of each section below
+        mines       BitPlane bits, one bit per cell
+        revealed    BitPlane bits
+        flagged     BitPlane bits
+        counts      NibblePlane nibbles, four bits per cell
+        mine list   uint32 flat index of every mine
+        journal     optional, per undoable move: a small header then its revealed and
+                    flagged uint32 indices, oldest move first
+        replay      optional, uint32 length then the encoded replay log of the game
+    Everything is little-endian. Files are written to a temporary file first and renamed over
+    the old save, so a crash in the middle of a write never leaves half a save behind.
+
+    The Autosaver writes the snapshots on a background thread: the game only copies its planes
+    and hands the bytes over, the disk is never touched by the GUI thread.
+"""
+
+from collections import namedtuple
+import os
+import struct
+import tempfile
+import threading
+
+from bit_planes import BitPlane, NibblePlane
+from board import Board
+from byte_order import little_endian, read_uint32
+from game_state_storage import GameMove
+
+MAGIC = b"MSSV"
+VERSION = 1
+# magic, version, flags, height, width, num_mines, seed, first row, first col,
+# safe revealed, flags placed, lives, move count, elapsed ms, mine list length, journal moves
+HEADER = struct.Struct("<4sHHIIIQiiIIBIQII")
+MOVE_HEADER = struct.Struct("<IIbB")  # revealed length, flagged length, flags delta, exploded
+
+MINES_PLACED = 1  # Header flags
+EXPLODED = 2
+HAS_REPLAY = 4
+REPLAY_LENGTH = struct.Struct("<I")
+
+DELETE = object()  # Queued instead of a snapshot to remove the save file
+
+
+class SavedGame(namedtuple("SavedGame", "board lives elapsed_ms move_count moves replay", defaults=(None,))):
+    """
+    A loaded save: the Board, the game counters, the undo journal (oldest move first) and the
+    encoded replay log of the game, or None.
+    """
+
+
+def snapshot(board, lives, elapsed_ms, move_count=0, moves=(), replay=None):
+    """
+    Serialize a game. moves is the undo journal to keep, oldest first, or nothing, and replay
+    the encoded replay log of the game, or None.
+    Case is always O(height * width / 2) for copying the planes, plus O(k) for the k indices of the journal.
+    """
+    flags = ((MINES_PLACED if board.mines_placed else 0) | (EXPLODED if board.exploded else 0)
+             | (HAS_REPLAY if replay is not None else 0))
+    first_row, first_col = board.first_click or (-1, -1)
+    moves = list(moves)  # O(moves) so a deque can be saved while it is not modified
+    parts = [
+        HEADER.pack(MAGIC, VERSION, flags, board.height, board.width, board.num_mines, board.seed,
+                    first_row, first_col, board.safe_revealed, board.flags_placed, lives, move_count,
+                    elapsed_ms, len(board.mine_indices), len(moves)),
+        bytes(board.mines.bits),  # O(height * width / 8)
+        bytes(board.revealed.bits),  # O(height * width / 8)
+        bytes(board.flagged.bits),  # O(height * width / 8)
+        bytes(board.counts.nibbles),  # O(height * width / 2)
+        little_endian(board.mine_indices).tobytes(),  # O(mines)
+    ]
+    for move in moves:  # O(k)
+        parts.append(MOVE_HEADER.pack(len(move.revealed), len(move.flagged), move.flags_delta, move.exploded))
+        parts.append(little_endian(move.revealed).tobytes())
+        parts.append(little_endian(move.flagged).tobytes())
+    if replay is not None:
+        parts.append(REPLAY_LENGTH.pack(len(replay)))
+        parts.append(bytes(replay))  # O(events)
+    return b"".join(parts)
+
+
+def restore(data):
+    """
+    Rebuild a SavedGame from the bytes made by snapshot(). Raises ValueError if the data is not
+    a save of this version or is truncated.
+    Case is always O(height * width / 2) memory copies, plus O(k) for the journal.
+    """
+    data = memoryview(data)
+    if len(data) < HEADER.size:
+        raise ValueError("Not a Minesweeper save: the file is too short")
+    (magic, version, flags, height, width, num_mines, seed, first_row, first_col, safe_revealed,
+     flags_placed, lives, move_count, elapsed_ms, mine_count, move_total) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a Minesweeper save")
+    if version != VERSION:
+        raise ValueError(f"Save version {version} is not supported")
+
+    size = height * width
+    bit_bytes = (size + 7) // 8
+    nibble_bytes = (size + 1) // 2
+    planes_end = HEADER.size + 3 * bit_bytes + nibble_bytes + 4 * mine_count
+    if len(data) < planes_end:
+        raise ValueError("The save file is truncated")
+
+    # The zeroed planes of the new board are calloc'ed, then replaced by the saved ones
+    board = Board(height, width, num_mines, seed=seed)  # O(size / 2)
+    position = HEADER.size
+    board.mines = BitPlane(size, data[position:position + bit_bytes])  # O(size / 8)
+    position += bit_bytes
+    board.revealed = BitPlane(size, data[position:position + bit_bytes])  # O(size / 8)
+    position += bit_bytes
+    board.flagged = BitPlane(size, data[position:position + bit_bytes])  # O(size / 8)
+    position += bit_bytes
+    board.counts = NibblePlane(size, data[position:position + nibble_bytes])  # O(size / 2)
+    position += nibble_bytes
+    board.mine_indices = read_uint32(data, position, mine_count)  # O(mines)
+    position += 4 * mine_count
+
+    board.mines_placed = bool(flags & MINES_PLACED)
+    board.exploded = bool(flags & EXPLODED)
+    board.first_click = (first_row, first_col) if board.mines_placed else None
+    board.safe_cells = size - (mine_count if board.mines_placed else num_mines)
+    board.safe_revealed = safe_revealed
+    board.flags_placed = flags_placed
+
+    moves = []
+    for _ in range(move_total):  # O(k)
+        if len(data) < position + MOVE_HEADER.size:
+            raise ValueError("The save file is truncated")
+        revealed_count, flagged_count, flags_delta, exploded = MOVE_HEADER.unpack_from(data, position)
+        position += MOVE_HEADER.size
+        if len(data) < position + 4 * (revealed_count + flagged_count):
+            raise ValueError("The save file is truncated")
+        move = GameMove(flags_delta=flags_delta, exploded=bool(exploded))
+        move.revealed = read_uint32(data, position, revealed_count)
+        position += 4 * revealed_count
+        move.flagged = read_uint32(data, position, flagged_count)
+        position += 4 * flagged_count
+        move.safe_revealed = 0 if move.exploded else revealed_count
+        moves.append(move)
+
+    replay = None
+    if flags & HAS_REPLAY:
+        if len(data) < position + REPLAY_LENGTH.size:
+            raise ValueError("The save file is truncated")
+        (length,) = REPLAY_LENGTH.unpack_from(data, position)
+        position += REPLAY_LENGTH.size
+        if len(data) < position + length:
+            raise ValueError("The save file is truncated")
+        replay = bytes(data[position:position + length])  # O(events)
+
+    return SavedGame(board, lives, elapsed_ms, move_count, moves, replay)
+
+
+def write_atomically(path, data):
+    """
+    Write the bytes to a temporary file next to path, then rename it over path.
+    Case is always O(len(data)).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(prefix=".save-", dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+
+
+def save_game(path, board, lives, elapsed_ms, move_count=0, moves=(), replay=None):
+    """Case is always O(height * width / 2), plus O(k) for the journal."""
+    write_atomically(path, snapshot(board, lives, elapsed_ms, move_count, moves, replay))
+
+
+def load_game(path):
+    """Case is always O(height * width / 2), plus O(k) for the journal."""
+    with open(path, "rb") as file:
+        return restore(file.read())
+
+
+class Autosaver:
+    def __init__(self, path):
+        """
+        Start the autosave thread for one save file. Only the newest snapshot matters, so a
+        snapshot submitted while another one is waiting replaces it.
+        Case is always O(1).
+        """
+        self.path = path  # O(1)
+        self.pending = None  # O(1) newest snapshot not written yet, DELETE, or None
+        self.writing = False  # O(1)
+        self.closed = False  # O(1)
+        self.condition = threading.Condition()  # O(1)
+        # Daemon: the window writes the last snapshot through close() when it closes, an exit that
+        # skips it only loses the moves since the previous autosave
+        self.thread = threading.Thread(target=self.run, name="autosave", daemon=True)
+        self.thread.start()
+
+    def exists(self):
+        """Case is always O(1)."""
+        return os.path.exists(self.path)
+
+    def submit(self, data):
+        """
+        Queue a snapshot made by snapshot(). Returns immediately.
+        Case is always O(1).
+        """
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("The autosaver is closed")
+            self.pending = data  # O(1) an older snapshot still waiting is dropped
+            self.condition.notify_all()
+
+    def discard(self):
+        """
+        Remove the save file, for instance once the game is over. Returns immediately.
+        Case is always O(1).
+        """
+        self.submit(DELETE)
+
+    def run(self):
+        """Autosave thread: write the newest snapshot, or delete the file, until closed."""
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                if self.pending is None:
+                    return
+                data, self.pending = self.pending, None
+                self.writing = True
+            try:
+                if data is DELETE:
+                    if os.path.exists(self.path):
+                        os.remove(self.path)
+                else:
+                    write_atomically(self.path, data)
+            except OSError as error:
+                print(f"Could not autosave the game: {error}")
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+    def flush(self):
+        """
+        Block until the newest snapshot is written.
+        Case is O(size of the snapshot).
+        """
+        with self.condition:
+            while self.pending is not None or self.writing:
+                self.condition.wait()
+
+    def close(self):
+        """
+        Write the snapshot still waiting and stop the thread. Closing twice does nothing.
+        Case is O(size of the snapshot).
+        """
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
@@ -1,47 +1,126 @@
-class GameState:
-    def __init__(self, grid, cells_state):
-        """
-        This function initializes a stack data structure where the game state is stored 
-        each time the player makes a move. When the player clicks on a cell, the current 
-        state is stored in the stack. When the player clicks on the "Undo" button (if they have
-        lives left), the previous state is retrieved from the stack by popping the last element of the
-        stack.
-        """
-        self.grid = [row[:] for row in grid]  # O(height * width) 
-        self.cells_state = []  # O(1) 
-        
-        # Store relevant cell information (text and style) O (rows * cells)
-        for row in cells_state:  # O(m) where m is the number of rows in cells_state
-            cell_row = []  # O(1) 
-            for cell in row:  # O(n) where n is the number of cells in each row
-                cell_row.append({  # O(1) 
-                    'text': cell.text(),  # O(1) 
-                    'style': cell.styleSheet()  # O(1) 
-                })
-            self.cells_state.append(cell_row)  # O(1) 
+from array import array
+from collections import deque
+
+MOVE_OVERHEAD_BYTES = 64  # Rough fixed cost of one GameMove on top of its index arrays
+
+class GameMove:
+    def __init__(self, revealed=(), flagged=(), flags_delta=0, exploded=False):
+        """
+        One entry of the undo journal. Instead of a copy of the whole board, a move only stores
+        the flat indices of the cells it changed: the cells it revealed and the cells whose flag it
+        toggled, plus how it moved the board counters.
+        Case is always O(k) where k is the number of cells changed by the move.
+        """
+        self.revealed = array("I", revealed)  # O(k) 4 bytes per cell
+        self.flagged = array("I", flagged)  # O(k) 4 bytes per cell
+        self.flags_delta = flags_delta  # O(1)
+        self.exploded = exploded  # O(1)
+        # A move that steps on a mine only reveals the mine itself
+        self.safe_revealed = 0 if exploded else len(self.revealed)  # O(1)
+
+    def cells(self):
+        """
+        Flat indices of every cell changed by the move, for redrawing.
+        Case is always O(k).
+        """
+        return list(self.revealed) + list(self.flagged)  # O(k)
+
+    def nbytes(self):
+        """
+        Approximate memory used by the move.
+        Case is always O(1).
+        """
+        return (MOVE_OVERHEAD_BYTES + self.revealed.itemsize * len(self.revealed)
+                + self.flagged.itemsize * len(self.flagged))  # O(1)
+
+    def undo(self, board):
+        """
+        Put the board back the way it was before the move.
+        Case is always O(k).
+        """
+        for i in self.revealed:  # O(k)
+            board.revealed[i] = 0  # O(1)
+        for i in self.flagged:  # O(k)
+            board.flagged[i] ^= 1  # O(1)
+        board.safe_revealed -= self.safe_revealed  # O(1)
+        board.flags_placed -= self.flags_delta  # O(1)
+        if self.exploded:  # O(1)
+            board.exploded = False  # O(1)
+
+    def redo(self, board):
+        """
+        Apply the move to the board again.
+        Case is always O(k).
+        """
+        for i in self.revealed:  # O(k)
+            board.revealed[i] = 1  # O(1)
+        for i in self.flagged:  # O(k)
+            board.flagged[i] ^= 1  # O(1)
+        board.safe_revealed += self.safe_revealed  # O(1)
+        board.flags_placed += self.flags_delta  # O(1)
+        if self.exploded:  # O(1)
+            board.exploded = True  # O(1)
 
 class GameStateManager:
-    def __init__(self):
-        self.history = []  # O(1) 
-        
-    def push_state(self, grid, cells):
-        """Store current game state
-        Case is always O(height * width + m * n) where m is the number of rows and n is the number of cells in each row since you are creating a new GameState and appending it to the history list.
-        """
-        state = GameState(grid, cells)  # O(height * width + m * n) Creating a new GameState
-        self.history.append(state)  # O(1) amortized - List append
-        
-    def pop_state(self):
-        """
-        Return to previous state
-        Case is always O(1) since you are only popping from the history list.
-        """
-        if self.history:  # O(1) 
-            return self.history.pop()  # O(1) 
-        return None  # O(1) 
-    
+    def __init__(self, max_depth=None, max_bytes=8 * 1024 * 1024):
+        """
+        Undo/redo journal of GameMoves. The history is a stack (newest move on the right) and
+        undone moves go on a redo stack until a new move is recorded.
+        max_depth caps the number of moves kept and max_bytes caps their memory, the oldest
+        moves are evicted first. Either cap can be None to disable it.
+        """
+        self.history = deque()  # O(1)
+        self.redo_stack = []  # O(1)
+        self.max_depth = max_depth  # O(1)
+        self.max_bytes = max_bytes  # O(1)
+        self.journal_bytes = 0  # O(1) memory of the moves in history and redo_stack
+
+    def record(self, move):
+        """Store a move that was just played
+        Recording a new move clears the redo stack.
+        Case is O(1) amortized, plus O(e) for the e evicted moves.
+        """
+        for undone in self.redo_stack:  # O(r) where r is the number of undone moves
+            self.journal_bytes -= undone.nbytes()  # O(1)
+        self.redo_stack.clear()  # O(r)
+
+        self.history.append(move)  # O(1) amortized - Deque append
+        self.journal_bytes += move.nbytes()  # O(1)
+
+        # Evict the oldest moves while over a cap, always keeping the newest one
+        while len(self.history) > 1 and (
+                (self.max_depth is not None and len(self.history) > self.max_depth)
+                or (self.max_bytes is not None and self.journal_bytes > self.max_bytes)):
+            self.journal_bytes -= self.history.popleft().nbytes()  # O(1)
+
+    def undo(self, board):
+        """
+        Undo the last move on the board and return it, or None if there is nothing to undo.
+        Case is O(k) where k is the number of cells changed by the move, not the size of the board.
+        """
+        if not self.history:  # O(1)
+            return None  # O(1)
+        move = self.history.pop()  # O(1)
+        move.undo(board)  # O(k)
+        self.redo_stack.append(move)  # O(1) amortized - List append
+        return move  # O(1)
+
+    def redo(self, board):
+        """
+        Redo the last undone move on the board and return it, or None if there is nothing to redo.
+        Case is O(k) where k is the number of cells changed by the move.
+        """
+        if not self.redo_stack:  # O(1)
+            return None  # O(1)
+        move = self.redo_stack.pop()  # O(1)
+        move.redo(board)  # O(k)
+        self.history.append(move)  # O(1) amortized - Deque append
+        return move  # O(1)
+
     def clear_history(self):
         """Clear all history
-        Case is always O(1) since you are only clearing the history list.
+        Case is always O(1) since you are only clearing the history and redo stacks.
         """
-        self.history.clear()  # O(1) 
+        self.history.clear()  # O(1)
+        self.redo_stack.clear()  # O(1)
+        self.journal_bytes = 0  # O(1)
@@ -0,0 +1,174 @@
+"""
+    Binary columnar archive of a leaderboard, for installs with very long histories.
+
+    Usage: python3 leaderboard_archive.py leaderboard.csv leaderboard.lba
+
+    The file is laid out as fixed-width little-endian columns, so it is opened with mmap and the
+    queries scan contiguous integers instead of parsing CSV text:
+        header      magic, version, number of rows, number of players
+        times       uint32 per row, milliseconds
+        players     uint32 per row, index in the string table
+        offsets     uint32 per player + 1, where each name starts in the names blob
+        names       UTF-8 player names, each stored once
+
+    compact_csv streams the CSV: rows are read one at a time and the two columns are spilled to
+    temporary files in chunks, only the table of player names is kept in memory.
+    Archives are read-only, compact again to include newer scores. Fingerprints are not archived.
+    LeaderboardArchive is therefore a reader with the query half of LeaderboardStorage (top_k,
+    entries, player_stats), not a storage the game can write scores to.
+"""
+
+from array import array
+import argparse
+import csv
+import heapq
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+from byte_order import little_endian, read_uint32
+from player_stats import PlayerStatsTable
+
+MAGIC = b"MSLB"
+VERSION = 1
+HEADER = struct.Struct("<4sIQI")  # magic, version, rows, players
+CHUNK_ROWS = 65536  # Rows buffered per column before they are spilled to disk
+
+
+def compact_csv(csv_path, archive_path, chunk_rows=CHUNK_ROWS):
+    """
+    Convert a CSV leaderboard into an archive without loading the CSV in memory.
+    Returns the number of rows written.
+    Case is always O(N) time and O(players + chunk_rows) memory for N rows.
+    """
+    names = {}  # Interned player names: {name: id}
+    rows = 0
+    with tempfile.TemporaryFile() as times_file, tempfile.TemporaryFile() as players_file:
+        times, players = array("I"), array("I")
+        with open(csv_path, "r", newline="") as file:
+            for row in csv.reader(file):  # O(N) one row at a time
+                if not row:
+                    continue
+                times.append(round(float(row[1]) * 1000))
+                players.append(names.setdefault(row[0], len(names)))
+                rows += 1
+                if len(times) == chunk_rows:
+                    little_endian(times).tofile(times_file)
+                    little_endian(players).tofile(players_file)
+                    times, players = array("I"), array("I")
+        little_endian(times).tofile(times_file)
+        little_endian(players).tofile(players_file)
+
+        # String table: offsets then the UTF-8 names, in id order
+        blob = bytearray()
+        offsets = array("I", [0])
+        for name in names:  # Dicts keep insertion order, which is the id order
+            blob += name.encode()
+            offsets.append(len(blob))
+
+        with open(archive_path, "wb") as archive:
+            archive.write(HEADER.pack(MAGIC, VERSION, rows, len(names)))
+            for column in (times_file, players_file):
+                column.seek(0)
+                shutil.copyfileobj(column, archive)  # O(N) streamed
+            little_endian(offsets).tofile(archive)
+            archive.write(blob)
+    return rows
+
+
+class LeaderboardArchive:
+    def __init__(self, path):
+        """
+        Map an archive in memory. The columns are views on the mapping, nothing is parsed except
+        the table of player names. Raises ValueError if the file is not an archive of this version
+        or is truncated.
+        Case is always O(players).
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        if os.fstat(self.file.fileno()).st_size < HEADER.size:  # mmap also refuses empty files
+            self.file.close()
+            raise ValueError(f"{path} is too short to be a leaderboard archive")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.rows, player_count = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} leaderboard archive")
+        if len(self.map) < HEADER.size + 8 * self.rows + 4 * (player_count + 1):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+        start = HEADER.size
+        self.times = self.column(start, self.rows)
+        self.players = self.column(start + 4 * self.rows, self.rows)
+        offsets = self.column(start + 8 * self.rows, player_count + 1)
+        names_start = start + 8 * self.rows + 4 * (player_count + 1)
+        self.names = [bytes(self.map[names_start + offsets[i]:names_start + offsets[i + 1]]).decode()
+                      for i in range(player_count)]  # O(players)
+        self.ids = {name: i for i, name in enumerate(self.names)}  # O(players)
+
+    def column(self, start, length):
+        """A uint32 view on the mapping, copied only on big-endian hosts."""
+        view = memoryview(self.map)[start:start + 4 * length]
+        if sys.byteorder == "big":
+            return read_uint32(view, 0, length)
+        return view.cast("I")
+
+    def top_k(self, n):
+        """
+        Scan the time column keeping a heap of the n best, ties in row order.
+        Case is always O(N log n).
+        """
+        best = heapq.nsmallest(n, zip(self.times, range(self.rows)))  # O(N log n)
+        return [(self.names[self.players[i]], time_ms / 1000) for time_ms, i in best]
+
+    def player_times(self, nickname):
+        """
+        Every time of one player in seconds, in row order. An unknown player has none.
+        Case is always O(N) over the player column.
+        """
+        player = self.ids.get(nickname)
+        if player is None:
+            return []
+        times = self.times
+        return [times[i] / 1000 for i, p in enumerate(self.players) if p == player]  # O(N)
+
+    def entries(self):
+        """Case is always O(N)."""
+        for time_ms, player in zip(self.times, self.players):
+            yield self.names[player], time_ms / 1000, None
+
+    def player_stats(self):
+        """
+        One PlayerStats per player, best time first, from a single scan of the columns.
+        Case is always O(N log games per player).
+        """
+        table = PlayerStatsTable()
+        for nickname, time, _ in self.entries():  # O(N)
+            table.add(nickname, time)
+        return table.best_per_player()
+
+    def close(self):
+        """Release the views before the mapping, mmap refuses to close while they exist."""
+        for name in ("times", "players"):
+            column = getattr(self, name, None)
+            if isinstance(column, memoryview):
+                column.release()
+        self.map.close()
+        self.file.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compact a CSV leaderboard into a columnar archive.")
+    parser.add_argument("csv", help="CSV leaderboard to read")
+    parser.add_argument("archive", help="archive file to write")
+    args = parser.parse_args(argv)
+    rows = compact_csv(args.csv, args.archive)
+    print(f"Wrote {rows} scores to {args.archive}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+
+from background_task import run_in_background
+
+COLUMNS = ["#", "Player", "Time"]
+PAGE_SIZE = 200  # Rows asked from the storage per fetchMore
+
+class LeaderboardModel(QAbstractTableModel):
+    """
+    Table model over a LeaderboardStorage. Rows are fetched page by page only when the view
+    scrolls near the end (canFetchMore/fetchMore), sorting and filtering are done by the storage,
+    so the model never holds more than the pages seen and no widget is created per row.
+    Pages are read on the QThreadPool and inserted when they arrive, the GUI thread never waits
+    for the storage. Pages of an older order or filter are dropped.
+    """
+    loading_changed = Signal(bool)
+
+    def __init__(self, storage, format_time=str):
+        """
+        Case is always O(1), the first page is fetched when a view asks for it.
+        The storage can be None until it is opened, see set_storage.
+        """
+        super().__init__()
+        self.storage = storage  # O(1)
+        self.format_time = format_time  # O(1)
+        self.order = "time"  # O(1) "time" or "player"
+        self.descending = False  # O(1)
+        self.nickname = ""  # O(1) filter, empty shows everyone
+        self.rows = []  # O(1) [(nickname, time), ...] fetched so far
+        self.next_key = None  # O(1) storage key of the next page
+        self.exhausted = False  # O(1) True once the last page was fetched
+        self.loading = False  # O(1) True while a page is being read
+        self.generation = 0  # O(1) bumped by refresh, tells stale pages apart
+
+    def rowCount(self, parent=QModelIndex()):
+        """Case is always O(1)."""
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        """Case is always O(1)."""
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Case is always O(1)."""
+        if not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignCenter)
+        if role != Qt.DisplayRole:
+            return None
+        nickname, time = self.rows[index.row()]
+        if index.column() == 0:
+            return index.row() + 1
+        if index.column() == 1:
+            return nickname
+        return self.format_time(time)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Case is always O(1)."""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """Case is always O(1)."""
+        return not parent.isValid() and not self.exhausted and self.storage is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        """
+        Ask the pool for the next page of the storage, one page at a time.
+        Case is always O(1) on the GUI thread.
+        """
+        if not self.canFetchMore(parent) or self.loading:
+            return
+        self.set_loading(True)
+        generation = self.generation
+        run_in_background(self.storage.page, self.order, self.descending, self.nickname, self.next_key, PAGE_SIZE,
+                          on_finished=lambda page: self.page_loaded(generation, page),
+                          on_failed=lambda message: self.page_failed(generation, message))
+
+    def set_loading(self, loading):
+        """Case is always O(1)."""
+        self.loading = loading
+        self.loading_changed.emit(loading)
+
+    def page_failed(self, generation, message):
+        """Case is always O(1)."""
+        if generation == self.generation:
+            print(f"Could not load the leaderboard: {message}")
+            self.exhausted = True
+            self.set_loading(False)
+
+    def page_loaded(self, generation, page):
+        """
+        Append a page read by the pool, unless the model was refreshed since it was asked for.
+        Case is always O(PAGE_SIZE).
+        """
+        if generation != self.generation:
+            return
+        rows, self.next_key = page
+        self.exhausted = self.next_key is None
+        self.set_loading(False)
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+            self.rows.extend(rows)
+            self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Sort by player for the Player column, by time otherwise. The storage sorts, the model
+        starts again from the first page.
+        Case is always O(1), the first page is read on the pool.
+        """
+        self.order = "player" if column == 1 else "time"
+        self.descending = order == Qt.DescendingOrder
+        self.refresh()
+
+    def set_nickname_filter(self, text):
+        """Case is always O(1), the first page is read on the pool."""
+        self.nickname = text.strip()
+        self.refresh()
+
+    def set_storage(self, storage):
+        """Show another storage, for instance once it is opened. Case is always O(1)."""
+        self.storage = storage
+        self.refresh()
+
+    def refresh(self):
+        """
+        Drop the fetched rows, the view fetches the first page again.
+        Case is always O(1), the first page is read on the pool.
+        """
+        self.beginResetModel()
+        self.generation += 1
+        self.rows = []
+        self.next_key = None
+        self.exhausted = False
+        self.loading = False
+        self.endResetModel()
+        self.fetchMore()  # Refresh even when no view is asking yet
@@ -0,0 +1,426 @@
+"""
+    Storage backends for the leaderboard.
+
+    LeaderboardStorage is the interface LeaderboardWidget talks to: add a score, ask for the best n.
+    Times go in and out as seconds with millisecond precision, every backend decides how to keep them.
+    - CsvLeaderboardStorage keeps the original leaderboard.csv format (nickname, seconds, fingerprint)
+      and a bounded heap of the best scores, refreshed from the lines appended since the last read.
+    - SqliteLeaderboardStorage keeps integer milliseconds in an indexed table, so top_k reads n rows
+      of the index instead of the whole history. The first time it opens it imports an existing CSV.
+    Both can be shared by several threads (LeaderboardWriter writes from its own thread) and by
+    several game instances: CSV appends hold an advisory lock on the file, SQLite locks by itself.
+"""
+
+from abc import ABC, abstractmethod
+import csv
+import heapq
+import io
+import os
+import sqlite3
+import threading
+
+from player_stats import PlayerStats, PlayerStatsTable, RECENT_GAMES, trend
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_CAPACITY = 10  # Best scores the CSV backend keeps in memory
+
+
+def lock_file(file):
+    """
+    Block until this process holds the advisory lock of an open file.
+    Only cooperating writers are kept out, readers are never blocked.
+    """
+    if fcntl:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)  # The first byte stands for the whole file
+
+
+def unlock_file(file):
+    if fcntl:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class LeaderboardStorage(ABC):
+    """Interface of the leaderboard backends. A backend missing one of the abstract methods cannot be created."""
+
+    def add(self, nickname, time, fingerprint=None):
+        """Store one score, time in seconds."""
+        self.add_many([(nickname, time, fingerprint)])
+
+    @abstractmethod
+    def add_many(self, scores):
+        """Store a batch of (nickname, time, fingerprint or None) scores at once."""
+
+    @abstractmethod
+    def top_k(self, n):
+        """The n best scores as [(nickname, time), ...], fastest first."""
+
+    @abstractmethod
+    def entries(self):
+        """Iterate over every score as (nickname, time, fingerprint or None), in insertion order."""
+
+    def page(self, order="time", descending=False, nickname=None, after=None, limit=100):
+        """
+        One page of scores as ([(nickname, time), ...], key of the next page or None at the end).
+        order is "time" or "player" (then time), nickname keeps the names containing it, ignoring
+        case, and after is the key returned with the previous page. This fallback reads and sorts
+        every score for each page.
+        """
+        rows = [(name, time) for name, time, _ in self.entries()
+                if not nickname or nickname.lower() in name.lower()]  # O(N)
+        rows.sort(key=(lambda row: row[1]) if order == "time" else (lambda row: row), reverse=descending)  # O(N log N)
+        start = after or 0
+        end = start + limit
+        return rows[start:end], end if end < len(rows) else None
+
+    def player_stats(self):
+        """
+        One PlayerStats per player, best time first. Backends keep them up to date as scores are
+        added, this fallback reads every score.
+        """
+        table = PlayerStatsTable()
+        for nickname, time, _ in self.entries():
+            table.add(nickname, time)
+        return table.best_per_player()
+
+    def close(self):
+        """Release the backend, nothing to do by default."""
+
+
+class CsvLeaderboardStorage(LeaderboardStorage):
+    def __init__(self, path, capacity=DEFAULT_CAPACITY):
+        """
+        The best `capacity` scores are kept in a bounded heap, together with the byte offset the
+        file was read up to. Every refresh only parses the lines appended since then.
+        Case is always O(1), the file is only read when asked.
+        """
+        self.path = path
+        self.capacity = capacity
+        self.heap = []  # Worst kept score on top: (-time, -sequence, nickname)
+        self.offset = 0  # Bytes of the file already in the heap
+        self.sequence = 0  # Rows seen, so equal times keep the order they were added in
+        self.players = PlayerStatsTable()  # Per-player statistics, fed by the same tail reads
+        self.lock = threading.Lock()  # The heap is shared with the writer thread
+
+    def push(self, nickname, time):
+        """
+        Offer one score to the heap of the best scores and to the player statistics.
+        Case is always O(log capacity + log games of the player).
+        """
+        self.players.add(nickname, time)  # O(log games of the player)
+        self.sequence += 1
+        item = (-time, -self.sequence, nickname)
+        if len(self.heap) < self.capacity:
+            heapq.heappush(self.heap, item)  # O(log capacity)
+        elif item > self.heap[0]:  # Faster than the worst kept score
+            heapq.heapreplace(self.heap, item)  # O(log capacity)
+
+    def forget(self):
+        """Drop everything read so far, the file will be read again from the start."""
+        self.heap, self.offset, self.sequence = [], 0, 0
+        self.players.clear()
+
+    def refresh(self):
+        """
+        Parse the lines appended to the file since the last read. A trailing line without its
+        newline is still being written and is left for the next refresh. A file that shrank was
+        replaced, so it is read again from the start.
+        Case is O(m log capacity) where m is the number of new lines.
+        """
+        try:
+            with open(self.path, "rb") as file:  # O(1)
+                file.seek(0, os.SEEK_END)
+                if file.tell() < self.offset:
+                    self.forget()
+                file.seek(self.offset)  # O(1) skip everything already read
+                data = file.read()  # O(m)
+        except FileNotFoundError:
+            self.forget()
+            return
+        complete = data.rfind(b"\n") + 1
+        for row in csv.reader(data[:complete].decode().splitlines()):  # O(m)
+            if row:
+                self.push(row[0], float(row[1]))  # O(log capacity)
+        self.offset += complete
+
+    def add_many(self, scores):
+        """
+        Append a batch of rows to the CSV file with a single write while holding the file lock,
+        so rows from several game instances never interleave, and update the heap directly.
+        When someone else appended to the file since the last read, the next refresh picks up
+        every row instead.
+        Case is always O(b log capacity) for a batch of b scores.
+        """
+        lines = io.StringIO()
+        writer = csv.writer(lines)
+        rows = []
+        for nickname, time, fingerprint in scores:  # O(b)
+            time = f"{time:.3f}"  # O(1) seconds with millisecond precision
+            writer.writerow([nickname, time] if fingerprint is None else [nickname, time, fingerprint])  # O(1)
+            rows.append((nickname, float(time)))
+        with self.lock, open(self.path, "ab") as file:  # O(1)
+            lock_file(file)
+            try:
+                file.seek(0, os.SEEK_END)  # O(1) where this batch will land
+                up_to_date = file.tell() == self.offset  # O(1)
+                file.write(lines.getvalue().encode())  # O(b) one append for the whole batch
+                file.flush()
+                end = file.tell()
+            finally:
+                unlock_file(file)
+            if up_to_date:
+                for nickname, time in rows:  # O(b)
+                    self.push(nickname, time)  # O(log capacity)
+                self.offset = end
+
+    def entries(self):
+        """
+        Read every row of the CSV file, a missing file has no rows.
+        Case is always O(n).
+        """
+        try:
+            with open(self.path, "r", newline="") as file:  # O(1)
+                for row in csv.reader(file):  # O(n)
+                    # Older entries hold whole seconds and no fingerprint
+                    yield row[0], float(row[1]), row[2] if len(row) > 2 else None
+        except FileNotFoundError:
+            return
+
+    def top_k(self, n):
+        """
+        The best n scores from the heap, after reading only the new lines of the file.
+        Asking for more than the heap keeps falls back to reading the whole file.
+        Case is O(m log capacity + capacity log capacity) where m is the number of new lines.
+        """
+        if n > self.capacity:
+            best = heapq.nsmallest(n, self.entries(), key=lambda entry: entry[1])  # O(N log n), stable
+            return [(nickname, time) for nickname, time, _ in best]
+        with self.lock:
+            self.refresh()  # O(m log capacity)
+            best = sorted(self.heap, reverse=True)[:n]  # O(capacity log capacity)
+        return [(nickname, -time) for time, _, nickname in best]
+
+    def player_stats(self):
+        """
+        Case is O(m log games) for the m new lines, plus O(P log P) for P players.
+        """
+        with self.lock:
+            self.refresh()  # O(m log games)
+            return self.players.best_per_player()  # O(P log P)
+
+
+class SqliteLeaderboardStorage(LeaderboardStorage):
+    def __init__(self, path, migrate_from=None):
+        """
+        Open (or create) the database. When migrate_from names a CSV leaderboard that was never
+        imported, its rows are copied once in a single transaction. The CSV file is left untouched.
+        Case is O(1), plus O(N log N) the one time a CSV of N rows is imported.
+        """
+        self.path = path
+        # One connection shared by the GUI and the writer thread, used under self.lock
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.lock = threading.Lock()
+        try:
+            with self.connection:
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS scores ("
+                    "id INTEGER PRIMARY KEY, nickname TEXT NOT NULL, time_ms INTEGER NOT NULL, fingerprint TEXT)"
+                )
+                # Ties keep the order they were added in
+                self.connection.execute("CREATE INDEX IF NOT EXISTS scores_by_time ON scores (time_ms, id)")
+                self.connection.execute("CREATE INDEX IF NOT EXISTS scores_by_player ON scores (nickname, time_ms)")
+                self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                # Materialized per-player aggregates: recent holds the last RECENT_GAMES times in order,
+                # low and high are the (time_ms, id) of the two middle scores, the same one for odd counts
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS players ("
+                    "nickname TEXT PRIMARY KEY, games INTEGER NOT NULL, best_ms INTEGER NOT NULL, "
+                    "total_ms INTEGER NOT NULL, recent TEXT NOT NULL, "
+                    "low_ms INTEGER NOT NULL, low_id INTEGER NOT NULL, high_ms INTEGER NOT NULL, high_id INTEGER NOT NULL)"
+                )
+                self.connection.execute("CREATE INDEX IF NOT EXISTS players_by_best ON players (best_ms, nickname)")
+            self.materialize_players()
+            if migrate_from:
+                self.migrate_csv(migrate_from)
+        except BaseException:
+            self.connection.close()  # A database that cannot be opened does not keep its file handle
+            raise
+
+    def materialize_players(self):
+        """
+        Build the players table from the scores, once per database (databases made before the
+        table existed already hold scores).
+        Case is O(N log N) the one time it runs, O(1) afterwards.
+        """
+        with self.lock, self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            done = self.connection.execute("SELECT 1 FROM meta WHERE key = 'players_materialized'").fetchone()
+            if done:
+                return
+            self.connection.execute("DELETE FROM players")
+            players = {}
+            for score_id, nickname, time_ms in self.connection.execute(
+                    "SELECT id, nickname, time_ms FROM scores ORDER BY id"):  # O(N)
+                games, total_ms, recent, times = players.get(nickname, (0, 0, [], []))
+                times.append((time_ms, score_id))
+                recent = (recent + [time_ms])[-RECENT_GAMES:]
+                players[nickname] = (games + 1, total_ms + time_ms, recent, times)
+            rows = []
+            for nickname, (games, total_ms, recent, times) in players.items():
+                times.sort()  # O(games log games)
+                low, high = times[(games - 1) // 2], times[games // 2]
+                rows.append((nickname, games, times[0][0], total_ms, ",".join(map(str, recent)), *low, *high))
+            self.connection.executemany("INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.connection.execute("INSERT INTO meta (key, value) VALUES ('players_materialized', '1')")
+
+    def migrate_csv(self, csv_path):
+        """
+        Import a CSV leaderboard, once per database.
+        Case is O(N log N) for inserting N rows into the indexes, O(1) once it is done.
+        """
+        with self.lock, self.connection:
+            # Take the write lock before checking, so two instances starting together import once
+            self.connection.execute("BEGIN IMMEDIATE")
+            done = self.connection.execute("SELECT 1 FROM meta WHERE key = 'migrated_csv'").fetchone()
+            if done or not os.path.exists(csv_path):
+                return
+            self.insert_scores(CsvLeaderboardStorage(csv_path).entries())
+            self.connection.execute("INSERT INTO meta (key, value) VALUES ('migrated_csv', ?)", (csv_path,))
+
+    def insert_scores(self, scores):
+        """
+        Insert scores and update the aggregates of their players. Runs inside the caller's
+        transaction with the lock held. Times are stored as integer milliseconds.
+        The two middle scores of a player move by at most one step in the (nickname, time_ms, id)
+        index per new score, like the two heaps of PlayerAggregate, so the median stays up to date
+        without reading the player's other scores.
+        Case is always O(b log N) for a batch of b scores.
+        """
+        for nickname, time, fingerprint in scores:
+            time_ms = round(time * 1000)
+            score_id = self.connection.execute(
+                "INSERT INTO scores (nickname, time_ms, fingerprint) VALUES (?, ?, ?)", (nickname, time_ms, fingerprint)
+            ).lastrowid
+            new = (time_ms, score_id)
+            row = self.connection.execute(
+                "SELECT games, best_ms, total_ms, recent, low_ms, low_id, high_ms, high_id FROM players WHERE nickname = ?",
+                (nickname,)
+            ).fetchone()
+            if row is None:
+                games, best_ms, total_ms, recent, low, high = 1, time_ms, time_ms, str(time_ms), new, new
+            else:
+                games, best_ms, total_ms, recent, *middle = row
+                low, high = tuple(middle[:2]), tuple(middle[2:])
+                if games % 2:  # One middle score, it becomes one of the two
+                    if new < low:
+                        low = self.neighbour_score(nickname, low, before=True)  # O(log N)
+                    else:
+                        high = self.neighbour_score(nickname, high, before=False)  # O(log N)
+                else:  # Two middle scores, the one closest to the new score, or the new one, remains
+                    if new < low:
+                        high = low
+                    elif new > high:
+                        low = high
+                    else:
+                        low = high = new
+                games, best_ms, total_ms = games + 1, min(best_ms, time_ms), total_ms + time_ms
+                recent = ",".join((recent.split(",") + [str(time_ms)])[-RECENT_GAMES:])
+            self.connection.execute(
+                "INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (nickname, games, best_ms, total_ms, recent, *low, *high)
+            )
+
+    def neighbour_score(self, nickname, score, before):
+        """
+        The (time_ms, id) of the player's score right before or after another one in time order.
+        Case is always O(log N), one step in the (nickname, time_ms) index.
+        """
+        comparison, direction = ("<", "DESC") if before else (">", "ASC")
+        return tuple(self.connection.execute(
+            f"SELECT time_ms, id FROM scores WHERE nickname = ? AND (time_ms, id) {comparison} (?, ?) "
+            f"ORDER BY time_ms {direction}, id {direction} LIMIT 1",
+            (nickname, *score),
+        ).fetchone())
+
+    def add_many(self, scores):
+        """
+        Insert a batch of scores in one transaction.
+        Case is always O(b log N) for the index updates of a batch of b scores.
+        """
+        with self.lock, self.connection:
+            self.insert_scores(scores)
+
+    def top_k(self, n):
+        """
+        Walk the first n entries of the time index.
+        Case is always O(log N + n), whatever the size of the history.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT nickname, time_ms FROM scores ORDER BY time_ms, id LIMIT ?", (n,)
+            ).fetchall()
+        return [(nickname, time_ms / 1000) for nickname, time_ms in rows]
+
+    def page(self, order="time", descending=False, nickname=None, after=None, limit=100):
+        """
+        Keyset paging: the key of a page is the sort key of its last row, and the next page starts
+        right after it in the (time_ms, id) or (nickname, time_ms, id) index. Deep pages cost the
+        same as the first one, unlike OFFSET.
+        Case is O(log N + limit) without a filter, a nickname filter also skips the rows it rejects.
+        """
+        columns = ["time_ms", "id"] if order == "time" else ["nickname", "time_ms", "id"]
+        direction, comparison = ("DESC", "<") if descending else ("ASC", ">")
+        conditions, parameters = [], []
+        if nickname:
+            escaped = nickname.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("nickname LIKE ? ESCAPE '\\'")  # Case-insensitive for ASCII
+            parameters.append(f"%{escaped}%")
+        if after:
+            conditions.append(f"({', '.join(columns)}) {comparison} ({', '.join('?' * len(columns))})")
+            parameters.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        order_by = ", ".join(f"{column} {direction}" for column in columns)
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT nickname, time_ms, {', '.join(columns)} FROM scores {where} ORDER BY {order_by} LIMIT ?",
+                parameters + [limit + 1],  # One more row tells whether there is a next page
+            ).fetchall()
+        next_key = tuple(rows[limit - 1][2:]) if len(rows) > limit else None
+        return [(name, time_ms / 1000) for name, time_ms, *_ in rows[:limit]], next_key
+
+    def player_stats(self):
+        """
+        Read the players table along its best-time index, every statistic comes straight from it.
+        Case is always O(P) for P players, no score is read.
+        """
+        with self.lock:
+            players = self.connection.execute(
+                "SELECT nickname, games, best_ms, total_ms, recent, low_ms, high_ms FROM players ORDER BY best_ms, nickname"
+            ).fetchall()
+        stats = []
+        for nickname, games, best_ms, total_ms, recent, low_ms, high_ms in players:  # O(P)
+            mean = total_ms / games / 1000
+            recent = [int(time_ms) / 1000 for time_ms in recent.split(",")]
+            stats.append(PlayerStats(nickname, games, best_ms / 1000, mean, (low_ms + high_ms) / 2000, trend(recent, mean)))
+        return stats
+
+    def entries(self):
+        """Case is always O(N)."""
+        with self.lock:
+            rows = self.connection.execute("SELECT nickname, time_ms, fingerprint FROM scores ORDER BY id").fetchall()
+        for nickname, time_ms, fingerprint in rows:
+            yield nickname, time_ms / 1000, fingerprint
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
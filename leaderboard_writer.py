@@ -0,0 +1,89 @@
+"""
+    Asynchronous, batched leaderboard writes.
+
+    Winning a game only puts the score in a queue, so a slow disk never stalls the win screen.
+    A background thread takes every score waiting in the queue and stores them with a single
+    add_many call: one locked append for the CSV storage, one transaction for SQLite.
+"""
+
+import queue
+import threading
+
+STOP = object()  # Put in the queue to stop the thread once everything before it is written
+BATCH_WAIT_SECONDS = 0.05  # How long the thread waits for more scores before writing a batch
+
+
+class LeaderboardWriter:
+    def __init__(self, storage, on_written=None, max_batch=500):
+        """
+        Start the writer thread for a LeaderboardStorage. on_written(count) is called from the
+        writer thread after every batch.
+        Case is always O(1).
+        """
+        self.storage = storage  # O(1)
+        self.on_written = on_written  # O(1)
+        self.max_batch = max_batch  # O(1)
+        self.queue = queue.Queue()  # O(1)
+        self.closed = False  # O(1)
+        # Daemon: LeaderboardWidget.shutdown closes the writer to flush the queue, a crash before
+        # that must not keep the process alive waiting for scores
+        self.thread = threading.Thread(target=self.run, name="leaderboard-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, nickname, time, fingerprint=None):
+        """
+        Queue one score, time in seconds. Returns immediately.
+        Case is always O(1).
+        """
+        if self.closed:
+            raise RuntimeError("The leaderboard writer is closed")
+        self.queue.put((nickname, time, fingerprint))  # O(1)
+
+    def run(self):
+        """
+        Writer thread: wait for a score, collect whatever else arrives shortly after it, then
+        store the batch. A failed batch is reported and dropped so later scores still get written.
+        """
+        while True:
+            item = self.queue.get()
+            taken = 1
+            batch = []
+            while item is not STOP:
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                try:
+                    item = self.queue.get(timeout=BATCH_WAIT_SECONDS)
+                except queue.Empty:
+                    break
+                taken += 1
+            if batch:
+                try:
+                    self.storage.add_many(batch)
+                except Exception as error:
+                    print(f"Could not write {len(batch)} leaderboard scores: {error}")
+                else:
+                    if self.on_written:
+                        self.on_written(len(batch))
+            for _ in range(taken):
+                self.queue.task_done()
+            if item is STOP:
+                return
+
+    def flush(self):
+        """
+        Block until every score submitted so far is written.
+        Case is O(q) where q is the number of queued scores.
+        """
+        self.queue.join()
+
+    def close(self):
+        """
+        Write everything still queued and stop the thread. Closing twice does nothing.
+        Case is O(q) where q is the number of queued scores.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(STOP)
+        self.thread.join()
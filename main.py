@@ -1,43 +1,38 @@
-""" 
+"""
     MINESWEEPER GAME
-    
+
     Algorithms:
         - BFS for placing mines in the grid and revealing cells (worst case O(n))
-        - Mergesort for sorting the leaderboard
-        
+        - Heap (CSV) and indexed queries (SQLite) for the leaderboard order
+
     Data Structures:
         - 2D matrix for the grid
         - Stack for the game state history
+
+    Only the start screen is built at startup, every other page is imported and built the first
+    time it is shown. Run with --profile-startup [file.json] to get a startup profile.
 """
 import sys
-from PySide6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QStackedWidget, QSpacerItem, QSizePolicy
-)
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QFont
-from start_game import generate_mines
-from collections import deque
-
-# Import Our Own Functions and Classes
-from Leaderboard import LeaderboardWidget
-from Rules import RulesWidget
-from Start_Screen import StartScreenWidget
-from game import GameWidget
-
-CELL_SIZE = 60
-GRID_WIDTH = 10
-GRID_HEIGHT = 10
-
-from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QLabel, QGridLayout, QWidget, QVBoxLayout, 
-    QHBoxLayout, QFrame, QPushButton, QStackedWidget, QTextEdit, QLineEdit
-)
+
+from startup_profile import StartupProfiler, profile_path
+
+profiler = StartupProfiler(profile_path(sys.argv))
+
+with profiler.measure("import", "PySide6"):
+    from PySide6.QtWidgets import (
+        QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QStackedWidget,
+        QSpacerItem, QSizePolicy
+    )
+    from PySide6.QtCore import QTimer
+
+with profiler.measure("import", "Start_Screen"):
+    from Start_Screen import StartScreenWidget
 
 class MinesweeperWindow(QMainWindow):
     def __init__(self):
         """
         Initialize the MinesweeperWindow
-        Case is always O(1) since you are only initializing the window.
+        Case is always O(1) since only the start screen is built, the other pages are built on demand.
         """
         super().__init__()
         self.setWindowTitle("Minesweeper")  # O(1)
@@ -46,7 +41,7 @@ class MinesweeperWindow(QMainWindow):
         # Main widget and layout
         main_widget = QWidget()  # O(1)
         main_layout = QVBoxLayout()  # O(1)
-        
+
         # Menu buttons in horizontal layout
         menu_layout = QHBoxLayout()  # O(1)
 
@@ -55,38 +50,41 @@ class MinesweeperWindow(QMainWindow):
 
         self.game_btn = QPushButton("Game")  # O(1)
         leaderboard_btn = QPushButton("Leaderboard")  # O(1)
+        players_btn = QPushButton("Players")  # O(1)
         rules_btn = QPushButton("Rules")  # O(1)
-        
+
         # Initially hide the game button
         self.game_btn.hide()  # O(1)
-        
-        for btn in [self.game_btn, leaderboard_btn, rules_btn]:  # O(n) where n is the number of buttons (3)
+
+        for btn in [self.game_btn, leaderboard_btn, players_btn, rules_btn]:  # O(n) where n is the number of buttons (4)
             btn.setFixedHeight(40)  # O(1)
             btn.setStyleSheet("font-size: 14px; padding: 5px 15px;")  # O(1)
             menu_layout.addWidget(btn)  # O(1)
-        
+
         # Add a spacer on the right to center the buttons
         menu_layout.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Expanding, QSizePolicy.Minimum))  # O(1)
 
-        # Create the start screen
-        self.start_screen = StartScreenWidget(self.start_game)  # O(1)
+        # Create the start screen, the only page built right away
+        with profiler.measure("build", "start_screen"):
+            self.start_screen = StartScreenWidget(self.start_game)  # O(1)
         self.stacked_widget = QStackedWidget()  # O(1)
         self.stacked_widget.addWidget(self.start_screen)  # O(1)
 
-        # Create game widget and other widgets
-        self.game_widget = GameWidget()  # O(1)
-        self.leaderboard_widget = LeaderboardWidget()  # O(1)
-        self.rules_widget = RulesWidget()  # O(1)
+        # The other pages are built the first time they are needed
+        self.pages = {}  # O(1) {name: widget} of the pages built so far
+        self.page_builders = {  # O(1)
+            "game": self.build_game_page,
+            "leaderboard": self.build_leaderboard_page,
+            "players": self.build_players_page,
+            "rules": self.build_rules_page,
+        }
 
-        self.stacked_widget.addWidget(self.game_widget)  # O(1)
-        self.stacked_widget.addWidget(self.leaderboard_widget)  # O(1)
-        self.stacked_widget.addWidget(self.rules_widget)  # O(1)
-        
         # Connect buttons
-        self.game_btn.clicked.connect(lambda: self.stacked_widget.setCurrentWidget(self.game_widget))  # O(1)
-        leaderboard_btn.clicked.connect(lambda: self.stacked_widget.setCurrentWidget(self.leaderboard_widget))  # O(1)
-        rules_btn.clicked.connect(lambda: self.stacked_widget.setCurrentWidget(self.rules_widget))  # O(1)
-        
+        self.game_btn.clicked.connect(lambda: self.show_page("game"))  # O(1)
+        leaderboard_btn.clicked.connect(lambda: self.show_page("leaderboard"))  # O(1)
+        players_btn.clicked.connect(lambda: self.show_page("players"))  # O(1)
+        rules_btn.clicked.connect(lambda: self.show_page("rules"))  # O(1)
+
         # Add menu layout to the main layout
         main_layout.addLayout(menu_layout)  # O(1)
 
@@ -94,9 +92,79 @@ class MinesweeperWindow(QMainWindow):
         main_layout.addWidget(self.stacked_widget)  # O(1)
         main_widget.setLayout(main_layout)  # O(1)
         self.setCentralWidget(main_widget)  # O(1)
-        
+
+        # No-guess boards are prepared in background processes once the mode is turned on
+        self.board_pool = None  # O(1)
+        self.no_guess = False  # O(1)
+        self.start_screen.no_guess_checkbox.toggled.connect(self.set_no_guess)  # O(1)
+
+    def page(self, name):
+        """Return a page, building it the first time
+        Case is always O(1) once the page exists, its construction time the first time.
+        """
+        if name not in self.pages:  # O(1)
+            with profiler.measure("build", name):
+                widget = self.page_builders[name]()
+            self.pages[name] = widget  # O(1)
+            self.stacked_widget.addWidget(widget)  # O(1)
+            profiler.write()  # Lazily built pages are reported too
+        return self.pages[name]  # O(1)
+
+    def show_page(self, name):
+        """Case is always O(1) once the page exists."""
+        self.stacked_widget.setCurrentWidget(self.page(name))  # O(1)
+
+    def build_game_page(self):
+        with profiler.measure("import", "game"):
+            from game import GameWidget
+        game_widget = GameWidget()
         # Connect game widget to leaderboard
-        self.game_widget.set_leaderboard_widget(self.leaderboard_widget)  # O(1)
+        game_widget.set_leaderboard_widget(self.page("leaderboard"))
+        if self.no_guess:
+            game_widget.set_board_pool(self.board_pool)
+        return game_widget
+
+    def build_leaderboard_page(self):
+        with profiler.measure("import", "Leaderboard"):
+            from Leaderboard import LeaderboardWidget
+        return LeaderboardWidget()
+
+    def build_players_page(self):
+        with profiler.measure("import", "Players"):
+            from Players import PlayersWidget
+        return PlayersWidget(self.page("leaderboard"))
+
+    def build_rules_page(self):
+        with profiler.measure("import", "Rules"):
+            from Rules import RulesWidget
+        return RulesWidget()
+
+    def set_no_guess(self, enabled):
+        """Turn the no-guess mode on or off. The pool is created the first time it is turned on,
+        so its worker processes never start for players who do not use it
+        Case is always O(1) on the GUI thread.
+        """
+        self.no_guess = enabled  # O(1)
+        if enabled and self.board_pool is None:  # O(1)
+            from board_pool import NoGuessBoardPool
+            self.board_pool = NoGuessBoardPool()  # O(1)
+        if "game" in self.pages:  # O(1)
+            self.pages["game"].set_board_pool(self.board_pool if enabled else None)  # O(1)
+
+    def closeEvent(self, event):
+        """Stop the board pool workers, save the game in progress and flush the queued leaderboard
+        scores before the window closes
+        Case is O(one job) while running pool jobs finish, plus O(width * height / 2) for the save
+        and O(q) for q queued scores.
+        """
+        if self.board_pool:  # O(1)
+            self.board_pool.shutdown()
+        if "game" in self.pages:  # O(1)
+            self.pages["game"].save_and_close()  # O(width * height / 2)
+        if "leaderboard" in self.pages:  # O(1)
+            self.pages["leaderboard"].shutdown()  # O(q)
+        profiler.write()
+        super().closeEvent(event)
 
     def start_game(self):
         """Start the game
@@ -106,17 +174,27 @@ class MinesweeperWindow(QMainWindow):
         """
         nickname = self.start_screen.nickname_input.text()  # O(1)
         if nickname:  # O(1)
-            self.game_widget.set_nickname(nickname)  # O(1)
+            self.page("game").set_nickname(nickname)  # O(1) once the page exists
             print(f"Starting game for {nickname}!")  # O(1)
-            self.stacked_widget.setCurrentWidget(self.game_widget)  # O(1)
+            self.show_page("game")  # O(1)
             self.game_btn.show()  # O(1)
+            self.page("game").offer_resume()  # O(1) unless a saved game is resumed
         else:  # O(1)
             print("Please enter a nickname.")  # O(1)
 
 
+def first_frame():
+    """Called by the first event loop iteration after show, once the first frame is painted."""
+    profiler.mark("first_frame")
+    profiler.write()
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MinesweeperWindow()
+    with profiler.measure("startup", "QApplication"):
+        app = QApplication(sys.argv)
+    with profiler.measure("startup", "MinesweeperWindow"):
+        window = MinesweeperWindow()
     window.show()
+    if profiler.enabled:
+        QTimer.singleShot(0, first_frame)
     sys.exit(app.exec())
-
@@ -0,0 +1,86 @@
+"""
+    Per-player leaderboard statistics, kept up to date one score at a time.
+
+    PlayerAggregate holds what is needed to answer every statistic without looking at the older
+    scores again: the count, best and total time, the last RECENT_GAMES times, and two heaps that
+    split the times around the median. Adding a score is O(log games).
+"""
+
+from collections import deque, namedtuple
+import heapq
+
+RECENT_GAMES = 5  # Games the trend looks at
+
+
+class PlayerStats(namedtuple("PlayerStats", "nickname games best mean median trend")):
+    """
+    Statistics of one player, times in seconds. trend is the mean of the last RECENT_GAMES times
+    minus the overall mean: negative means the player is getting faster.
+    """
+
+
+def trend(recent, mean):
+    """Case is always O(RECENT_GAMES)."""
+    return sum(recent) / len(recent) - mean
+
+
+class PlayerAggregate:
+    def __init__(self, nickname):
+        """Case is always O(1)."""
+        self.nickname = nickname
+        self.games = 0
+        self.best = None
+        self.total = 0.0
+        self.recent = deque(maxlen=RECENT_GAMES)
+        self.lower = []  # Max-heap (negated times) of the lower half of the times
+        self.upper = []  # Min-heap of the upper half, never bigger than the lower half
+
+    def add(self, time):
+        """
+        Account for one more score.
+        Case is always O(log games) for the median heaps.
+        """
+        self.games += 1
+        self.best = time if self.best is None else min(self.best, time)
+        self.total += time
+        self.recent.append(time)
+        # Keep len(lower) == len(upper) or len(upper) + 1, every lower time <= every upper time
+        heapq.heappush(self.lower, -heapq.heappushpop(self.upper, time))  # O(log games)
+        if len(self.lower) > len(self.upper) + 1:
+            heapq.heappush(self.upper, -heapq.heappop(self.lower))  # O(log games)
+
+    def median(self):
+        """Case is always O(1)."""
+        if len(self.lower) > len(self.upper):
+            return -self.lower[0]
+        return (-self.lower[0] + self.upper[0]) / 2
+
+    def stats(self):
+        """Case is always O(RECENT_GAMES)."""
+        mean = self.total / self.games
+        return PlayerStats(self.nickname, self.games, self.best, mean, self.median(), trend(self.recent, mean))
+
+
+class PlayerStatsTable:
+    def __init__(self):
+        """Case is always O(1)."""
+        self.players = {}  # {nickname: PlayerAggregate}
+
+    def add(self, nickname, time):
+        """Case is always O(log games of that player)."""
+        aggregate = self.players.get(nickname)
+        if aggregate is None:
+            aggregate = self.players[nickname] = PlayerAggregate(nickname)
+        aggregate.add(time)
+
+    def clear(self):
+        self.players.clear()
+
+    def best_per_player(self):
+        """
+        One PlayerStats per player, best time first.
+        Case is always O(P log P) for P players, independent of the number of games.
+        """
+        stats = [aggregate.stats() for aggregate in self.players.values()]  # O(P)
+        stats.sort(key=lambda player: (player.best, player.nickname))  # O(P log P)
+        return stats
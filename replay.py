@@ -0,0 +1,325 @@
+"""
+    Compact replay logs of games, and a headless verifier for leaderboard entries.
+
+    Usage: python3 replay.py leaderboard.db [--replays replays] [--tolerance-ms 1000] [--workers 8]
+
+    Every game records what is needed to play it again exactly:
+        header      magic, version, board fingerprint version, seed, dimensions, mines,
+                    the click the mines were placed around, lives, moves played before the
+                    first event, nickname
+        events      (time ms, action, flat cell index) for every click, flag and undo handled
+                    by the game, 9 bytes each, the time is read from the game clock
+    A won game writes its log to replays/<fingerprint>-<time ms>.msr. The verifier reads the
+    scores of a leaderboard, plays every log again on a Board with the game's own rules and checks
+    that it is a win on the same board, by the same player, in the time on the leaderboard.
+    Logs are checked in batches on all cores, thousands of small games per second.
+
+    One JSON line is printed per rejected or missing replay, then a "final" line with the counts.
+"""
+import argparse
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import struct
+import sys
+import time
+
+from board import Board, BoardFingerprint, FINGERPRINT_VERSION
+from game_save import write_atomically
+from game_state_storage import GameMove, GameStateManager
+
+MAGIC = b"MSRP"
+VERSION = 1
+# magic, version, fingerprint version, seed, height, width, num_mines, first row, first col, lives,
+# moves before the first event, nickname length
+HEADER = struct.Struct("<4sHHQIIIiiBIH")
+EVENT = struct.Struct("<IBI")  # time ms, action, flat index
+
+CLICK = 0
+FLAG = 1
+UNDO = 2
+
+REPLAY_DIR = "replays"
+TOLERANCE_MS = 1000  # Longest accepted gap between the winning click and the time on the leaderboard
+UNDO_AFTER_MOVES = 2  # A mine can only be undone once more moves than this were played
+
+
+def can_undo(lives, move_count):
+    """
+    The rule of GameWidget.game_over, shared so the game and the verifier cannot disagree:
+    stepping on a mine can be undone while lives are left, after the first moves of the game.
+    Case is always O(1).
+    """
+    return lives > 0 and move_count > UNDO_AFTER_MOVES
+
+
+class Verdict(namedtuple("Verdict", "valid reason time_ms")):
+    """Result of a replay: valid is True for a win, reason explains a rejection, time_ms is the winning time."""
+
+
+class ReplayLog:
+    def __init__(self, height, width, num_mines, seed, lives=3, nickname="", move_count=0):
+        """
+        Start an empty log for a board. The seed and the first click are taken from the board
+        again with set_board once its mines are placed. move_count is the number of moves the
+        game had played before the first event, the undo rule depends on it.
+        Case is always O(1).
+        """
+        self.height = height  # O(1)
+        self.width = width  # O(1)
+        self.num_mines = num_mines  # O(1)
+        self.seed = seed  # O(1)
+        self.first_click = (-1, -1)  # O(1) the cell the mines were placed around
+        self.lives = lives  # O(1)
+        self.nickname = nickname  # O(1)
+        self.move_count = move_count  # O(1)
+        self.events = bytearray()  # O(1) packed EVENT records
+
+    @classmethod
+    def for_board(cls, board, lives=3, nickname="", move_count=0):
+        """Case is always O(1)."""
+        return cls(board.height, board.width, board.num_mines, board.seed, lives, nickname, move_count)
+
+    def set_board(self, board):
+        """
+        Follow the board once its mines are placed, its seed changes when a no-guess board is used.
+        Case is always O(1).
+        """
+        self.seed = board.seed  # O(1)
+        self.first_click = board.first_click  # O(1)
+
+    def record(self, time_ms, action, index=0):
+        """Case is always O(1) amortized."""
+        self.events += EVENT.pack(time_ms, action, index)  # O(1) amortized
+
+    def __len__(self):
+        return len(self.events) // EVENT.size
+
+    def iter_events(self):
+        """Iterate over (time ms, action, index), unpacked in C. Case is always O(events)."""
+        return EVENT.iter_unpack(self.events)
+
+    def fingerprint(self):
+        """The BoardFingerprint of the logged board, or None before the first click. Case is always O(1)."""
+        if self.first_click[0] < 0:
+            return None
+        return BoardFingerprint(self.seed, self.height, self.width, self.num_mines, *self.first_click)
+
+    def encode(self):
+        """Case is always O(events)."""
+        nickname = self.nickname.encode()
+        return b"".join([
+            HEADER.pack(MAGIC, VERSION, FINGERPRINT_VERSION, self.seed, self.height, self.width, self.num_mines,
+                        *self.first_click, self.lives, self.move_count, len(nickname)),
+            nickname,
+            self.events,
+        ])
+
+    @classmethod
+    def decode(cls, data):
+        """
+        Parse the bytes made by encode(). Raises ValueError if they are not a replay of this version.
+        Case is always O(events).
+        """
+        data = memoryview(data)
+        if len(data) < HEADER.size:
+            raise ValueError("Not a Minesweeper replay: the data is too short")
+        (magic, version, fingerprint_version, seed, height, width, num_mines, first_row, first_col,
+         lives, move_count, nickname_length) = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a Minesweeper replay")
+        if version != VERSION:
+            raise ValueError(f"Replay version {version} is not supported")
+        if fingerprint_version != FINGERPRINT_VERSION:
+            raise ValueError(f"Replay of board version {fingerprint_version} cannot be regenerated")
+        start = HEADER.size + nickname_length
+        if len(data) < start or (len(data) - start) % EVENT.size:
+            raise ValueError("The replay is truncated")
+        log = cls(height, width, num_mines, seed, lives, bytes(data[HEADER.size:start]).decode(), move_count)
+        log.first_click = (first_row, first_col)
+        log.events = bytearray(data[start:])  # O(events)
+        return log
+
+
+def replay_path(directory, fingerprint, time_ms):
+    """Where the log of a leaderboard score is stored. Case is always O(1)."""
+    return os.path.join(directory, f"{fingerprint}-{time_ms}.msr")
+
+
+def save_replay(log, time_ms, directory=REPLAY_DIR):
+    """
+    Write the log of a won game next to the other replays and return its path.
+    Case is always O(events).
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = replay_path(directory, log.fingerprint().encode(), time_ms)
+    write_atomically(path, log.encode())
+    return path
+
+
+def load_replay(path):
+    """Case is always O(events)."""
+    with open(path, "rb") as file:
+        return ReplayLog.decode(file.read())
+
+
+def replay(log):
+    """
+    Play a log again with the rules of GameWidget: the mines are placed on the first click,
+    clicks on flagged cells only count as a move, stepping on a mine can be undone for a life
+    as can_undo allows, and the game ends when it is won or a mine is not undone.
+    Returns a Verdict, valid only for a win.
+    Case is O(events + height * width) since every cell is revealed at most once.
+    """
+    height, width = log.height, log.width
+    size = height * width
+    if log.first_click[0] < 0 or not (0 <= log.first_click[0] < height and 0 <= log.first_click[1] < width):
+        return Verdict(False, "the mines were never placed", None)
+
+    board = Board(height, width, log.num_mines, seed=log.seed)
+    state_manager = GameStateManager()
+    lives = log.lives
+    move_count = log.move_count
+    exploded = False  # Stepped on a mine, only an undo may follow
+    finished = None  # "won" or "lost"
+    last_time = 0
+
+    for time_ms, action, index in log.iter_events():  # O(events)
+        if finished:
+            return Verdict(False, f"a move after the game was {finished}", None)
+        if time_ms < last_time:
+            return Verdict(False, "the time goes backwards", None)
+        if index >= size:
+            return Verdict(False, "a move outside the board", None)
+        last_time = time_ms
+        if exploded and action != UNDO:
+            return Verdict(False, "a move after stepping on a mine", None)
+        row, col = divmod(index, width)
+
+        if action == CLICK:
+            if not board.mines_placed:
+                board.place_mines(*log.first_click)  # O(height * width)
+            move_count += 1
+            if board.flagged[index]:
+                continue
+            if board.mines[index]:
+                state_manager.record(GameMove(board.reveal(row, col), exploded=True))
+                if can_undo(lives, move_count):
+                    exploded = True
+                else:
+                    finished = "lost"
+            else:
+                changed = board.reveal(row, col)  # O(K)
+                if changed:
+                    state_manager.record(GameMove(changed))  # O(K)
+                if board.is_won():
+                    finished = "won"
+        elif action == FLAG:
+            flagged = board.flag(row, col)
+            if flagged is None:
+                return Verdict(False, "a flag on a revealed cell", None)
+            state_manager.record(GameMove(flagged=[index], flags_delta=1 if flagged else -1))
+        elif action == UNDO:
+            if not exploded:
+                return Verdict(False, "an undo without stepping on a mine", None)
+            lives -= 1
+            state_manager.undo(board)
+            exploded = False
+        else:
+            return Verdict(False, f"unknown action {action}", None)
+
+    if finished != "won":
+        return Verdict(False, "the game was not won", None)
+    return Verdict(True, "", last_time)
+
+
+def verify(log, nickname, score, fingerprint, tolerance_ms=TOLERANCE_MS):
+    """
+    Check that a log is a win of the leaderboard score (nickname, score in seconds, fingerprint).
+    Case is always O(replay).
+    """
+    if log.nickname != nickname:
+        return Verdict(False, f"the replay belongs to {log.nickname!r}", None)
+    if log.fingerprint() is None or log.fingerprint().encode() != fingerprint:
+        return Verdict(False, "the replay is of another board", None)
+    verdict = replay(log)
+    if not verdict.valid:
+        return verdict
+    # The score is read from the clock just after the winning click is handled
+    gap = round(score * 1000) - verdict.time_ms
+    if gap < 0:
+        return Verdict(False, f"the score is {-gap} ms faster than the replay", verdict.time_ms)
+    if gap > tolerance_ms:
+        return Verdict(False, f"the score is {gap} ms slower than the replay", verdict.time_ms)
+    return verdict
+
+
+def verify_batch(entries, directory, tolerance_ms):
+    """
+    Worker: verify (nickname, time, fingerprint) scores against their replay files.
+    Returns [(entry, Verdict)], a missing or unreadable log is a rejection.
+    """
+    results = []
+    for nickname, score, fingerprint in entries:
+        try:
+            log = load_replay(replay_path(directory, fingerprint, round(score * 1000)))
+        except FileNotFoundError:
+            verdict = Verdict(False, "no replay", None)
+        except (OSError, ValueError) as error:
+            verdict = Verdict(False, f"unreadable replay: {error}", None)
+        else:
+            verdict = verify(log, nickname, score, fingerprint, tolerance_ms)
+        results.append(((nickname, score, fingerprint), verdict))
+    return results
+
+
+def open_storage(path):
+    """Open a leaderboard file by its extension, CSV or SQLite. Archives keep no fingerprints."""
+    from leaderboard_storage import CsvLeaderboardStorage, SqliteLeaderboardStorage
+    if path.endswith(".csv"):
+        return CsvLeaderboardStorage(path)
+    return SqliteLeaderboardStorage(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify leaderboard scores against their replay logs.")
+    parser.add_argument("leaderboard", help="leaderboard.csv or leaderboard.db")
+    parser.add_argument("--replays", default=REPLAY_DIR, help="directory of the replay logs")
+    parser.add_argument("--tolerance-ms", type=int, default=TOLERANCE_MS, help="accepted gap between the replay and the score")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--batch", type=int, default=500, help="scores per job")
+    args = parser.parse_args(argv)
+
+    storage = open_storage(args.leaderboard)
+    try:
+        entries = list(storage.entries())
+    finally:
+        storage.close()
+    # Older scores were saved before fingerprints existed, they cannot be checked at all
+    checked = [entry for entry in entries if entry[2]]
+    counts = {"scores": len(entries), "without_fingerprint": len(entries) - len(checked),
+              "valid": 0, "rejected": 0, "missing": 0}
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        jobs = [executor.submit(verify_batch, checked[start:start + args.batch], args.replays, args.tolerance_ms)
+                for start in range(0, len(checked), args.batch)]
+        for job in jobs:  # In leaderboard order
+            for (nickname, score, fingerprint), verdict in job.result():
+                if verdict.valid:
+                    counts["valid"] += 1
+                    continue
+                counts["missing" if verdict.reason == "no replay" else "rejected"] += 1
+                line = {"kind": "rejected", "nickname": nickname, "time": score, "fingerprint": fingerprint,
+                        "reason": verdict.reason, "replay_time_ms": verdict.time_ms}
+                sys.stdout.write(json.dumps(line) + "\n")
+    seconds = time.perf_counter() - started
+    counts.update({"kind": "final", "seconds": round(seconds, 3),
+                   "games_per_second": round(len(checked) / seconds) if seconds else None})
+    sys.stdout.write(json.dumps(counts) + "\n")
+    return 1 if counts["rejected"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+    Headless bulk simulation: bots play many games with the game's own generator and reveal rules,
+    without any Qt widget, spread across all cores.
+
+    Usage: python3 simulate.py [--games 100000] [--sizes 10 16x30] [--densities 0.15 0.2]
+                               [--strategy solver] [--workers 8] [--batch 1000] [--seed 1234]
+
+    Every finished batch prints one JSON line with the running statistics of its board size and
+    density, and the end of the run prints one "final" line per size and density, so the output
+    can be piped into other tools while it runs.
+
+    A strategy is a function (board, rng) -> list of (row, col), the next cells to reveal in order.
+    The game reveals them one after another until one of them ends it, then asks again. The built-in
+    ones are listed in STRATEGIES, any other can be given as "module:function".
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import importlib
+import json
+import os
+import random
+import sys
+import time
+
+from board import Board
+from solver import solve
+
+
+def random_strategy(board, rng):
+    """Reveal a random hidden cell. Case is O(height * width)."""
+    hidden = [i for i in range(board.size) if not board.revealed[i] and not board.flagged[i]]
+    return [divmod(rng.choice(hidden), board.width)]
+
+
+def solver_strategy(board, rng):
+    """
+    Reveal every cell the solver proves safe, or else the cell with the lowest mine probability.
+    One solve serves all the safe cells it finds, so the board is only solved again once they run out.
+    Case is O(solve).
+    """
+    result = solve(board)
+    if result.safe:
+        return [divmod(i, board.width) for i in sorted(result.safe)]
+    return [divmod(result.best_guess(), board.width)]
+
+
+STRATEGIES = {
+    "random": random_strategy,
+    "solver": solver_strategy,
+}
+
+
+def load_strategy(name):
+    """Return a built-in strategy by name, or import one given as "module:function"."""
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module, _, function = name.partition(":")
+    if not function:
+        raise ValueError(f"Unknown strategy {name!r}, use one of {sorted(STRATEGIES)} or module:function")
+    return getattr(importlib.import_module(module), function)
+
+
+def parse_size(text):
+    """ "16x30" -> (16, 30), "10" -> (10, 10)."""
+    height, _, width = text.lower().partition("x")
+    return int(height), int(width or height)
+
+
+class SimulationStats:
+    def __init__(self):
+        """Totals over a number of games. Case is always O(1)."""
+        self.games = 0
+        self.wins = 0
+        self.clicks = 0
+        self.cascades = 0  # Clicks that revealed more than one cell
+        self.revealed = 0
+        self.time_ns = 0
+
+    def add_game(self, won, clicks, cascades, revealed, time_ns):
+        """Case is always O(1)."""
+        self.games += 1
+        self.wins += won
+        self.clicks += clicks
+        self.cascades += cascades
+        self.revealed += revealed
+        self.time_ns += time_ns
+
+    def merge(self, other):
+        """Add the totals of another SimulationStats. Case is always O(1)."""
+        self.games += other.games
+        self.wins += other.wins
+        self.clicks += other.clicks
+        self.cascades += other.cascades
+        self.revealed += other.revealed
+        self.time_ns += other.time_ns
+
+    def to_dict(self):
+        """Totals and per-game averages. Case is always O(1)."""
+        games = self.games or 1
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "win_rate": self.wins / games,
+            "clicks_per_game": self.clicks / games,
+            "cascades_per_game": self.cascades / games,
+            "revealed_per_game": self.revealed / games,
+            "ms_per_game": self.time_ns / games / 1e6,
+        }
+
+
+def play_game(height, width, density, strategy, rng):
+    """
+    Play one game until it is won or a mine is hit, with a random first click.
+    Returns (won, clicks, cascades, revealed cells, time in ns).
+    """
+    start = time.perf_counter_ns()
+    board = Board(height, width, density=density, seed=rng.getrandbits(32))
+    row, col = rng.randrange(height), rng.randrange(width)
+    board.place_mines(row, col)
+
+    clicks = cascades = revealed = 0
+    cells = [(row, col)]
+    while True:
+        played = clicks
+        for row, col in cells:
+            if board.is_revealed(row, col) or board.is_flagged(row, col):  # Opened by an earlier cascade, or flagged
+                continue
+            changed = board.reveal(row, col)
+            clicks += 1
+            revealed += len(changed)
+            cascades += len(changed) > 1
+            if board.exploded or board.is_won():
+                return board.is_won(), clicks, cascades, revealed, time.perf_counter_ns() - start
+        if clicks == played:
+            raise ValueError("The strategy returned no hidden cell to reveal")
+        cells = strategy(board, rng)
+
+
+def play_batch(height, width, density, strategy_name, games, seed):
+    """
+    Play a batch of games inside a worker process and return their SimulationStats.
+    Batching keeps the traffic between the processes to one object per batch.
+    """
+    strategy = load_strategy(strategy_name)
+    rng = random.Random(seed)
+    stats = SimulationStats()
+    for _ in range(games):
+        stats.add_game(*play_game(height, width, density, strategy, rng))
+    return stats
+
+
+def emit(kind, size, density, strategy, stats, output):
+    """Write one JSON line and flush it so readers see it right away."""
+    line = {"kind": kind, "height": size[0], "width": size[1], "density": density, "strategy": strategy}
+    line.update(stats.to_dict())
+    output.write(json.dumps(line) + "\n")
+    output.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play Minesweeper games headless with bots.")
+    parser.add_argument("--games", type=int, default=10000, help="games per board size and density")
+    parser.add_argument("--sizes", nargs="+", default=["10"], help="board sizes, N or HxW")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.2], help="mine densities")
+    parser.add_argument("--strategy", default="solver", help=f"{', '.join(STRATEGIES)} or module:function")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--batch", type=int, default=1000, help="games per job")
+    parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible run")
+    args = parser.parse_args(argv)
+
+    load_strategy(args.strategy)  # Fail early on a bad name
+    sizes = [parse_size(size) for size in args.sizes]
+    rng = random.Random(args.seed)
+    totals = {}
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        jobs = {}
+        for size in sizes:
+            for density in args.densities:
+                totals[size, density] = SimulationStats()
+                for start in range(0, args.games, args.batch):
+                    games = min(args.batch, args.games - start)
+                    job = executor.submit(play_batch, *size, density, args.strategy, games, rng.getrandbits(64))
+                    jobs[job] = (size, density)
+
+        for job in as_completed(jobs):
+            size, density = jobs[job]
+            totals[size, density].merge(job.result())
+            emit("progress", size, density, args.strategy, totals[size, density], sys.stdout)
+
+    for (size, density), stats in totals.items():
+        emit("final", size, density, args.strategy, stats, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
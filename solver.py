@@ -0,0 +1,382 @@
+"""
+    Exact mine-probability solver for a Board.
+
+    Every revealed number gives a constraint: its hidden neighbours hold exactly that many mines.
+    1. Trivial propagation: a constraint needing 0 mines makes all its cells safe, a constraint needing
+       as many mines as it has cells makes them all mines. Repeated until nothing changes.
+    2. The remaining frontier cells are split into independent components (cells linked through
+       shared constraints), so each component is counted on its own.
+    3. Each component is counted with a memoized sweep over its cells (forward-backward dynamic
+       programming): the memo key is the number of mines still needed by the constraints that are
+       open at that point, so configurations that agree on it are only counted once.
+    4. Components are combined with the cells outside the frontier by weighting every total number
+       of frontier mines K with C(other cells, remaining mines - K).
+
+    All the counting uses Python integers, so the probabilities are exact up to the final division.
+"""
+
+from math import comb
+
+from board import DIRECTIONS
+
+
+class SolverResult:
+    def __init__(self, probabilities, safe, mines):
+        """
+        probabilities maps the flat index of every hidden cell to its mine probability,
+        safe and mines are the hidden cells that are certainly safe or certainly a mine.
+        """
+        self.probabilities = probabilities  # O(1)
+        self.safe = safe  # O(1)
+        self.mines = mines  # O(1)
+
+    def probability(self, index):
+        """Mine probability of a hidden cell. Case is always O(1)."""
+        return self.probabilities[index]
+
+    def best_guess(self):
+        """
+        Hidden cell with the lowest mine probability (lowest index on ties), or None.
+        Case is always O(hidden cells).
+        """
+        if not self.probabilities:
+            return None
+        return min(self.probabilities, key=lambda i: (self.probabilities[i], i))
+
+
+def neighbours(board, index):
+    """Flat indices of the cells around index. Case is always O(8)."""
+    row, col = divmod(index, board.width)
+    result = []
+    for dx, dy in DIRECTIONS:
+        new_row, new_col = row + dx, col + dy
+        if 0 <= new_row < board.height and 0 <= new_col < board.width:
+            result.append(new_row * board.width + new_col)
+    return result
+
+
+def total_mines(board):
+    """Number of mines on the board, as shown to the player. Case is always O(1)."""
+    if board.mines_placed:
+        return board.size - board.safe_cells
+    return board.num_mines
+
+
+def solve(board):
+    """
+    Compute the mine probability of every hidden cell of the board.
+    Flags are ignored, only revealed numbers count as information.
+    Raises ValueError if no mine layout matches the revealed numbers.
+
+    Case is O(N) to read the board plus, for each component, O(c * s * k) where c is the number of
+    cells in the component, s the number of memoized states (bounded by the widest set of open
+    constraints) and k the number of possible mine counts.
+    """
+    mines_total = total_mines(board)
+    hidden = [i for i in range(board.size) if not board.revealed[i]]  # O(N)
+
+    # A stepped-on mine is revealed, it still counts towards the total
+    revealed_mines = sum(1 for i in board.mine_indices if board.revealed[i])
+    known = {}  # Hidden cells solved so far, {cell: 0 for safe or 1 for mine}
+
+    # One constraint per revealed number that touches hidden cells
+    constraints = []  # [set of hidden cells, mines needed]
+    for i in range(board.size):  # O(N)
+        if not board.revealed[i] or board.mines[i]:
+            continue
+        cells = set()
+        needed = board.counts[i]
+        for j in neighbours(board, i):
+            if not board.revealed[j]:
+                cells.add(j)
+            elif board.mines[j]:
+                needed -= 1
+        if cells:
+            constraints.append([cells, needed])
+
+    propagate(constraints, known)
+
+    # Drop the cells that are known now
+    remaining = []
+    for cells, needed in constraints:
+        needed -= sum(known[c] for c in cells if c in known)
+        cells = {c for c in cells if c not in known}
+        if cells:
+            remaining.append((cells, needed))
+        elif needed != 0:
+            raise ValueError("The revealed numbers are inconsistent")
+
+    frontier = set()
+    for cells, _ in remaining:
+        frontier |= cells
+    others = [i for i in hidden if i not in known and i not in frontier]  # Cells no number touches
+    mines_left = mines_total - revealed_mines - sum(known.values())
+
+    # Count every component on its own
+    components = [count_component(cells, component)
+                  for cells, component in split_components(remaining)]
+
+    # Combine the components: ways[K] = number of frontier layouts with K mines
+    prefix = [{0: 1}]
+    for component in components:
+        prefix.append(convolve(prefix[-1], component["totals"]))
+    suffix = [{0: 1}]
+    for component in reversed(components):
+        suffix.append(convolve(suffix[-1], component["totals"]))
+    suffix.reverse()
+
+    def weight(frontier_mines):
+        """Ways to place the remaining mines outside the frontier."""
+        outside = mines_left - frontier_mines
+        if outside < 0 or outside > len(others):
+            return 0
+        return comb(len(others), outside)
+
+    all_ways = prefix[-1]
+    total = sum(ways * weight(k) for k, ways in all_ways.items())
+    if total == 0:
+        raise ValueError("No mine layout matches the revealed numbers")
+
+    probabilities = {}
+    for index, value in known.items():
+        probabilities[index] = float(value)
+
+    for position, component in enumerate(components):
+        # Layouts of every other component, by number of mines
+        rest = convolve(prefix[position], suffix[position + 1])
+        for cell, mine_ways in component["mines"].items():
+            numerator = 0
+            for k, ways in mine_ways.items():
+                for k_rest, ways_rest in rest.items():
+                    numerator += ways * ways_rest * weight(k + k_rest)
+            probabilities[cell] = numerator / total
+            if numerator == 0:
+                known[cell] = 0
+            elif numerator == total:
+                known[cell] = 1
+
+    if others:
+        # Every cell outside the frontier is equally likely to hold each of the outside mines
+        outside_mines = sum(ways * weight(k) * (mines_left - k) for k, ways in all_ways.items())
+        probability = outside_mines / (total * len(others))
+        for i in others:
+            probabilities[i] = probability
+        if outside_mines == 0:
+            known.update((i, 0) for i in others)
+        elif outside_mines == total * len(others):
+            known.update((i, 1) for i in others)
+
+    safe = {i for i, value in known.items() if value == 0}
+    mines = {i for i, value in known.items() if value == 1}
+    return SolverResult(probabilities, safe, mines)
+
+
+def solve_by_logic(board):
+    """
+    Play the board from its first click using only certain deductions (cells the solver proves
+    safe). Returns True if the board is won without ever guessing. The board is modified.
+    Case is O(r * solve) where r is the number of rounds of deductions.
+    """
+    board.reveal(*board.first_click)
+    while not board.is_won():
+        result = solve(board)
+        safe = [i for i in result.safe if not board.revealed[i]]
+        if not safe:
+            return False
+        for i in safe:
+            board.reveal(*divmod(i, board.width))
+    return True
+
+
+def propagate(constraints, known):
+    """
+    Trivial constraint propagation, filling known with {cell: 0 or 1}.
+    Case is O(C * 8) amortized where C is the number of constraints, every constraint is
+    rechecked only when one of its cells becomes known.
+    """
+    by_cell = {}
+    for position, (cells, _) in enumerate(constraints):
+        for c in cells:
+            by_cell.setdefault(c, []).append(position)
+
+    queue = list(range(len(constraints)))
+    queued = set(queue)
+    while queue:
+        position = queue.pop()
+        queued.discard(position)
+        cells, needed = constraints[position]
+        unknown = [c for c in cells if c not in known]
+        needed -= sum(known[c] for c in cells if c in known)
+        if not unknown:
+            continue
+        if needed == 0:
+            value = 0
+        elif needed == len(unknown):
+            value = 1
+        else:
+            continue
+        for c in unknown:
+            known[c] = value
+            for other in by_cell[c]:
+                if other not in queued:
+                    queued.add(other)
+                    queue.append(other)
+
+
+def split_components(constraints):
+    """
+    Group the constraints into independent components with a union-find over their cells.
+    Returns a list of (cells in BFS order, constraints) pairs.
+    Case is O(C * 8 * α(N)).
+    """
+    parent = {}
+
+    def find(c):
+        while parent[c] != c:
+            parent[c] = parent[parent[c]]
+            c = parent[c]
+        return c
+
+    for cells, _ in constraints:
+        cells = list(cells)
+        for c in cells:
+            parent.setdefault(c, c)
+        root = find(cells[0])
+        for c in cells[1:]:
+            other = find(c)
+            if other != root:
+                parent[other] = root
+
+    groups = {}
+    for constraint in constraints:
+        groups.setdefault(find(next(iter(constraint[0]))), []).append(constraint)
+
+    return [(bfs_order(group), group) for group in groups.values()]
+
+
+def bfs_order(constraints):
+    """
+    Order the cells of a component so that neighbouring constraints are processed close
+    together, which keeps the set of open constraints (and the memo) small.
+    Case is O(C * 8).
+    """
+    by_cell = {}
+    for position, (cells, _) in enumerate(constraints):
+        for c in cells:
+            by_cell.setdefault(c, []).append(position)
+
+    start = min(by_cell, key=lambda c: (len(by_cell[c]), c))
+    order = [start]
+    seen = {start}
+    position = 0
+    while position < len(order):
+        cell = order[position]
+        position += 1
+        for constraint in by_cell[cell]:
+            for c in sorted(constraints[constraint][0]):
+                if c not in seen:
+                    seen.add(c)
+                    order.append(c)
+    return order
+
+
+def count_component(order, constraints):
+    """
+    Count the mine layouts of one component with a forward-backward sweep over its cells.
+    Returns {"totals": {k: layouts with k mines}, "mines": {cell: {k: layouts with k mines where cell is a mine}}}.
+    """
+    n = len(order)
+    position_of = {cell: i for i, cell in enumerate(order)}
+
+    # Where every constraint opens and closes along the order
+    first = []
+    last = []
+    cells_at = [[] for _ in range(n)]  # Constraints that contain each cell
+    for c, (cells, _) in enumerate(constraints):
+        positions = sorted(position_of[cell] for cell in cells)
+        first.append(positions[0])
+        last.append(positions[-1])
+        for p in positions:
+            cells_at[p].append(c)
+
+    # Cells of each constraint still to come after position i
+    remaining_after = []
+    for i in range(n):
+        remaining_after.append({c: sum(1 for cell in constraints[c][0] if position_of[cell] > i)
+                                for c in cells_at[i]})
+
+    # Constraints open after deciding the cell at position i
+    active = []
+    for i in range(n):
+        active.append(tuple(c for c in range(len(constraints)) if first[c] <= i < last[c]))
+
+    def step(i, state, value):
+        """Residual needs over active[i] after setting cell i to value, or None if impossible."""
+        residual = dict(zip(active[i - 1], state)) if i > 0 else {}
+        for c in cells_at[i]:
+            left = (residual[c] if c in residual else constraints[c][1]) - value
+            if left < 0 or left > remaining_after[i][c]:
+                return None
+            residual[c] = left
+        return tuple(residual[c] for c in active[i])
+
+    # Forward: memo of {state: {k: ways}} after each position
+    forward = []
+    current = {(): {0: 1}}
+    for i in range(n):
+        following = {}
+        for state, ways_by_k in current.items():
+            for value in (0, 1):
+                target = step(i, state, value)
+                if target is None:
+                    continue
+                bucket = following.setdefault(target, {})
+                for k, ways in ways_by_k.items():
+                    bucket[k + value] = bucket.get(k + value, 0) + ways
+        forward.append(following)
+        current = following
+
+    # Backward: ways to complete the remaining cells from each reachable state
+    backward = [None] * n
+    backward[n - 1] = {(): {0: 1}}
+    for i in range(n - 1, 0, -1):
+        previous = {}
+        for state in forward[i - 1]:
+            completions = {}
+            for value in (0, 1):
+                target = step(i, state, value)
+                if target is None or target not in backward[i]:
+                    continue
+                for k, ways in backward[i][target].items():
+                    completions[k + value] = completions.get(k + value, 0) + ways
+            if completions:
+                previous[state] = completions
+        backward[i - 1] = previous
+
+    totals = forward[n - 1].get((), {})
+
+    # Marginals: layouts where the cell at position i is a mine, by total mines in the component
+    mines = {}
+    for i in range(n):
+        before_states = forward[i - 1] if i > 0 else {(): {0: 1}}
+        mine_ways = {}
+        for state, ways_before in before_states.items():
+            target = step(i, state, 1)
+            if target is None or target not in backward[i]:
+                continue
+            for k_before, ways_b in ways_before.items():
+                for k_after, ways_a in backward[i][target].items():
+                    k = k_before + 1 + k_after
+                    mine_ways[k] = mine_ways.get(k, 0) + ways_b * ways_a
+        mines[order[i]] = mine_ways
+
+    return {"totals": totals, "mines": mines}
+
+
+def convolve(left, right):
+    """Distribution of the sum of two independent mine counts. Case is O(|left| * |right|)."""
+    result = {}
+    for k_left, ways_left in left.items():
+        for k_right, ways_right in right.items():
+            result[k_left + k_right] = result.get(k_left + k_right, 0) + ways_left * ways_right
+    return result
@@ -1,91 +1,205 @@
-""" 
+"""
     When the player starts the game and presses on the first cell in the grid, it will call this function which will distribute the mines in the grid.
 """
 
 from collections import deque
 import random
 
-def generate_mines(grid, first_row, first_col, num_mines):
+DEFAULT_DENSITY = 0.2  # 20 mines on the 10x10 board
+
+def generate_mines(grid, first_row, first_col, num_mines=None, density=None, rng=None):
     """
     Generate mines after the first cell is clicked, ensuring an equal distribution across the grid.
-    Case is always O(height * width) since the safe cells are always determined by the irregular_safe_area function.
+    Returns the grid and the matrix of adjacent mine counts, so nobody has to count them again.
+    Pass a random.Random (or a seed) as rng to get the same board every time.
+    Case is always O(height * width) since every cell is written once.
     """
     height = len(grid)  # O(1)
     width = len(grid[0])  # O(1)
-    
+
+    mines, counts = generate_mine_planes(height, width, first_row, first_col, num_mines, density, rng)  # O(height * width)
+
+    # Copy the flat planes back into the matrices
+    count_rows = []  # O(1)
+    for row in range(height):  # O(height)
+        base = row * width  # O(1)
+        grid_row = grid[row]  # O(1)
+        col = mines.find(1, base, base + width)  # O(width) scanned in C
+        while col != -1:  # O(m) where m is the number of mines in this row
+            grid_row[col - base] = 'M'  # O(1)
+            col = mines.find(1, col + 1, base + width)  # O(width) scanned in C
+        count_rows.append(list(counts[base:base + width]))  # O(width)
+
+    return grid, count_rows  # O(1)
+
+def generate_mine_planes(height, width, first_row, first_col, num_mines=None, density=None, rng=None):
+    """
+    Flat mine placement engine used by generate_mines and the Board engine.
+    Returns two bytearrays indexed by row * width + col: the mines (1 = mine) and the adjacent mine counts.
+    All the randomness comes from rng (see make_rng), so the same seed always gives the same board.
+
+    The safe opening (irregular safe area plus the 3x3 block around the first click) is marked in an
+    excluded-cells mask. Rows that the mask does not touch sample their mine columns straight from
+    range(width), so only the few rows around the first click ever need to be filtered.
+    The mines are still spread evenly: every row gets num_mines // height mines and the first
+    num_mines % height rows get one more.
+
+    Case is always O(height * width) for allocating the planes, the placement itself is
+    O(height + mines + excluded cells).
+    """
+    size = height * width  # O(1)
+    rng = make_rng(rng)  # O(1)
+    if num_mines is None:  # O(1)
+        num_mines = mines_for_density(height, width, DEFAULT_DENSITY if density is None else density)  # O(1)
+
     # Get initial safe cells with randomized expansion
-    safe_cells = irregular_safe_area(grid, first_row, first_col)  # O(height * width) in worst case
-    # Space Complexity: O(height * width) for safe_cells
-
-    # Create a list of all possible cell coordinates
-    all_cells = [(r, c) for r in range(height) for c in range(width)]  # O(height * width)
-    # Space Complexity: O(height * width) for all_cells
-    
-    # Remove safe cells from possible mine locations
-    available_cells = [cell for cell in all_cells if cell not in safe_cells]  # O(height * width)
-    # Space Complexity: O(height * width) for available_cells
-    
+    safe_cells = irregular_safe_area_cells(height, width, first_row, first_col, rng=rng)  # O(s) where s is the size of the safe area
+
     # Exclude the first cell and its neighbors from mine placement
     for dx in [-1, 0, 1]:  # O(n^2) where n^2 is 9 (3 * 3)
         for dy in [-1, 0, 1]:  # O(n) where n is 3
             neighbor_row = first_row + dx  # O(1)
             neighbor_col = first_col + dy  # O(1)
             if (0 <= neighbor_row < height and 0 <= neighbor_col < width):  # O(1)
-                available_cells = [cell for cell in available_cells if cell != (neighbor_row, neighbor_col)]  # O(n) where n is the number of cells in available_cells
-    
+                safe_cells.add((neighbor_row, neighbor_col))  # O(1)
+
+    excluded = bytearray(size)  # O(height * width)
+    excluded_rows = set()  # O(1)
+    for row, col in safe_cells:  # O(s)
+        excluded[row * width + col] = 1  # O(1)
+        excluded_rows.add(row)  # O(1)
+
     # Calculate mines per row
     mines_per_row = num_mines // height  # O(1)
     remaining_mines = num_mines % height  # O(1)
-    
+
+    mines = bytearray(size)  # O(height * width)
+    all_columns = range(width)  # O(1)
+
     # Place mines in each row
     for row in range(height):  # O(height)
         # Determine how many mines to place in this row
         mines_in_this_row = mines_per_row + (1 if row < remaining_mines else 0)  # O(1)
-        
+        if mines_in_this_row == 0:  # O(1)
+            continue
+
+        base = row * width  # O(1)
+        if row in excluded_rows:  # O(1)
+            row_cells = [c for c in all_columns if not excluded[base + c]]  # O(width), only near the first click
+        else:
+            row_cells = all_columns  # O(1)
+
         # Randomly select cells for mine placement in this row
-        if mines_in_this_row > 0:  # O(1)
-            row_cells = [(row, c) for c in range(width) if (row, c) in available_cells]  # O(width)
-            mine_cells = random.sample(row_cells, min(mines_in_this_row, len(row_cells)))  # O(min(mines_in_this_row, width))
-            
-            # Place mines in the grid
-            for col in mine_cells:  # O(m) where m is the number of mines in this column
-                grid[col[0]][col[1]] = 'M'  # O(1)
-    
-    return grid  # O(1)
-
-def irregular_safe_area(grid, start_row, start_col, min_safe_cells=12):
+        for col in rng.sample(row_cells, min(mines_in_this_row, len(row_cells))):  # O(m) where m is the number of mines in this row
+            mines[base + col] = 1  # O(1)
+
+    counts = count_adjacent_planes(mines, height, width)  # O(height * width)
+
+    return mines, counts  # O(1)
+
+def make_rng(rng=None):
     """
-    Creates an irregular-shaped safe area using randomized expansion.
-    Uses a modified BFS with random probability of expansion.
-    Best Case: O(height * width) - When the safe cells are already determined and all cells are filtered.
-    Average Case: O(height * width) - When the safe cells are already determined and all cells are filtered.
-    Worst Case: O(height * width) - When the safe cells are already determined and all cells are filtered.
+    Turn the rng argument of the generators into something with the random.Random methods.
+    None uses the global random module, a seed (int, str or bytes) builds a random.Random,
+    anything else (a random.Random or the random module) is used as is.
+    Case is always O(1).
+    """
+    if rng is None:  # O(1)
+        return random  # O(1)
+    if isinstance(rng, (int, str, bytes, bytearray)):  # O(1)
+        return random.Random(rng)  # O(1)
+    return rng  # O(1)
+
+def mines_for_density(height, width, density):
+    """
+    Number of mines for a board of the given size and mine density (0 to 1).
+    Case is always O(1).
+    """
+    if not 0 <= density < 1:  # O(1)
+        raise ValueError(f"Mine density must be in [0, 1), got {density}")
+    return int(height * width * density)  # O(1)
+
+def compute_adjacent_counts(grid):
+    """
+    Computes the number of adjacent mines of every cell of a grid and returns it as a matrix.
+    Case is always O(height * width).
     """
     height = len(grid)  # O(1)
     width = len(grid[0])  # O(1)
+    mines = bytearray(1 if cell == 'M' else 0 for row in grid for cell in row)  # O(height * width)
+    counts = count_adjacent_planes(mines, height, width)  # O(height * width)
+    return [list(counts[row * width:(row + 1) * width]) for row in range(height)]  # O(height * width)
+
+def count_adjacent_planes(mines, height, width):
+    """
+    Computes the number of adjacent mines of every cell in one shifted-sum pass (a 3x3 box filter).
+    The whole mine plane is loaded into one big integer with one byte per cell, so every shift and
+    addition below works on all the cells at once in C. A cell never sums more than 9, so the bytes
+    never carry into each other.
+    A horizontal pass sums each cell with its left and right neighbours (masking the cells that
+    would wrap around a row edge), a vertical pass then sums the rows above and below, and finally
+    the cell's own mine is removed.
+    Case is always O(height * width), with no Python-level loop over the cells.
+    """
+    size = height * width  # O(1)
+    if size == 0:  # O(1)
+        return bytearray()
+    row_bits = 8 * width  # O(1)
+    all_bits = (1 << (8 * size)) - 1  # O(height * width)
+
+    plane = int.from_bytes(mines, "little")  # O(height * width)
+
+    # The left neighbour of column 0 and the right neighbour of the last column are off the board
+    not_first_col = int.from_bytes((b"\x00" + b"\xff" * (width - 1)) * height, "little")  # O(height * width)
+    not_last_col = int.from_bytes((b"\xff" * (width - 1) + b"\x00") * height, "little")  # O(height * width)
+
+    # Horizontal pass: left + self + right
+    horizontal = plane + ((plane << 8) & not_first_col) + ((plane >> 8) & not_last_col)  # O(height * width)
+
+    # Vertical pass: above + self + below, minus the cell's own mine
+    box = horizontal + ((horizontal << row_bits) & all_bits) + (horizontal >> row_bits)  # O(height * width)
+
+    return bytearray((box - plane).to_bytes(size, "little"))  # O(height * width)
+
+def irregular_safe_area(grid, start_row, start_col, min_safe_cells=12, rng=None):
+    """
+    Creates an irregular-shaped safe area using randomized expansion.
+    Uses a modified BFS with random probability of expansion.
+    Case is O(min_safe_cells) in practice, see irregular_safe_area_cells.
+    """
+    return irregular_safe_area_cells(len(grid), len(grid[0]), start_row, start_col, min_safe_cells, rng)  # O(min_safe_cells)
+
+def irregular_safe_area_cells(height, width, start_row, start_col, min_safe_cells=12, rng=None):
+    """
+    Same as irregular_safe_area but only needs the board dimensions, so no grid has to be built.
+    Best Case: O(1) - The expansion reaches min_safe_cells right away.
+    Average Case: O(min_safe_cells) - Each dequeued cell adds up to 8 cells until min_safe_cells is reached.
+    Worst Case: O(height * width) - The board is smaller than min_safe_cells and every cell is visited.
+    """
+    rng = make_rng(rng)  # O(1)
     safe_cells = set()  # O(1)
     queue = deque([(start_row, start_col)])  # O(1) amortized - List append
     safe_cells.add((start_row, start_col))  # O(1) amortized - Set add
-    
+
     directions = [  # O(1)
         (-1, -1), (-1, 0), (-1, 1),
         (0, -1),           (0, 1),
         (1, -1),  (1, 0),  (1, 1)
     ]
-    
+
     while queue and len(safe_cells) < min_safe_cells:  # O(height * width) in worst case
         row, col = queue.popleft()  # O(1)
-        
+
         # Randomize direction order for irregular expansion
-        random.shuffle(directions)  # O(1)
-        
+        rng.shuffle(directions)  # O(1)
+
         for dx, dy in directions:  # O(n) where n is the number of directions
             new_row, new_col = row + dx, col + dy  # O(1)
             if (0 <= new_row < height and 0 <= new_col < width  # O(1)
                     and (new_row, new_col) not in safe_cells  # O(1)
                     # Random probability of expansion (70%)
-                    and random.random() < 0.7):  # O(1)
+                    and rng.random() < 0.7):  # O(1)
                 safe_cells.add((new_row, new_col))  # O(1) amortized - Set add
                 queue.append((new_row, new_col))  # O(1) amortized - List append
-    
+
     return safe_cells  # O(1)
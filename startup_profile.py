@@ -0,0 +1,82 @@
+"""
+    Opt-in startup profiler.
+
+    Turned on with `python3 main.py --profile-startup startup.json` or the MINESWEEPER_PROFILE
+    environment variable. It records how long every import and every page construction takes, and
+    when the first frame is shown, all in milliseconds since the profiler was created (the top
+    of main.py). The JSON report is written after the first frame, and again whenever a page is
+    built later on, so lazily built pages show up too. When it is off every call does nothing.
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import platform
+import sys
+import time
+
+ENVIRONMENT_VARIABLE = "MINESWEEPER_PROFILE"
+FLAG = "--profile-startup"
+
+
+def profile_path(argv):
+    """
+    Return the report path given on the command line or in the environment, or None.
+    The flag is removed from argv so Qt never sees it.
+    """
+    if FLAG in argv:
+        position = argv.index(FLAG)
+        if position + 1 < len(argv):
+            path = argv[position + 1]
+            del argv[position:position + 2]
+            return path
+        del argv[position]
+        return "startup_profile.json"
+    return os.environ.get(ENVIRONMENT_VARIABLE) or None
+
+
+class StartupProfiler:
+    def __init__(self, path=None):
+        """Case is always O(1)."""
+        self.path = path
+        self.start_ns = time.perf_counter_ns()
+        self.events = []
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def elapsed_ms(self, since_ns=None):
+        return (time.perf_counter_ns() - (self.start_ns if since_ns is None else since_ns)) / 1e6
+
+    @contextmanager
+    def measure(self, kind, name):
+        """Time the body of a with block as one event, kind is "import", "build" or "startup"."""
+        if not self.enabled:
+            yield
+            return
+        started_ms = self.elapsed_ms()
+        start = time.perf_counter_ns()
+        yield
+        self.events.append({"kind": kind, "name": name, "at_ms": started_ms, "ms": self.elapsed_ms(start)})
+
+    def mark(self, name):
+        """Record a point in time, like the first frame."""
+        if self.enabled:
+            self.events.append({"kind": "mark", "name": name, "at_ms": self.elapsed_ms()})
+
+    def write(self):
+        """Write the JSON report, nothing happens when profiling is off."""
+        if not self.enabled:
+            return
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "argv": sys.argv,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "events": self.events,
+        }
+        with open(self.path, "w") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# The modules live flat at the root of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """A QApplication on the offscreen platform, the Qt tests are skipped without PySide6."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
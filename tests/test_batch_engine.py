@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+
+from batch_engine import BoardBatch
+from board import Board
+
+
+def random_boards(count, rng, height=8, width=11, num_mines=14):
+    """Boards with their mines placed, a few flags and, for some, a first reveal."""
+    boards = []
+    for _ in range(count):
+        board = Board(height, width, num_mines, seed=rng.getrandbits(32))
+        board.place_mines(rng.randrange(height), rng.randrange(width))
+        for _ in range(rng.randrange(6)):
+            board.flag(rng.randrange(height), rng.randrange(width))
+        if rng.random() < 0.5:
+            board.reveal(*board.first_click)
+        boards.append(board)
+    return boards
+
+
+def revealed_plane(board):
+    plane = np.zeros((board.height, board.width), dtype=bool)
+    for i in range(board.size):
+        plane[divmod(i, board.width)] = board.revealed[i]
+    return plane
+
+
+def test_from_boards_copies_the_whole_state():
+    boards = random_boards(20, random.Random(1))
+    batch = BoardBatch.from_boards(boards)
+    for k, board in enumerate(boards):
+        for i in range(board.size):
+            row, col = divmod(i, board.width)
+            assert batch.mines[k, row, col] == board.mines[i]
+            assert batch.revealed[k, row, col] == board.revealed[i]
+            assert batch.flagged[k, row, col] == board.flagged[i]
+            if not board.mines[i]:
+                assert batch.counts[k, row, col] == board.counts[i]
+        assert batch.safe_revealed[k] == board.safe_revealed
+        assert batch.exploded[k] == board.exploded
+
+
+def test_reveal_matches_board_reveal_cell_for_cell():
+    rng = random.Random(2)
+    boards = random_boards(100, rng)
+    batch = BoardBatch.from_boards(boards)
+    for _ in range(4):  # Several rounds, some cells are revealed, flagged or mines by then
+        # An exploded game takes no more clicks, a negative row skips its board
+        rows = [-1 if board.exploded else rng.randrange(board.height) for board in boards]
+        cols = [rng.randrange(board.width) for board in boards]
+        before = [revealed_plane(board) for board in boards]
+        changed = batch.reveal(rows, cols)
+        for k, board in enumerate(boards):
+            if rows[k] < 0:
+                assert not changed[k].any()
+                continue
+            cells = board.reveal(rows[k], cols[k])
+            expected = revealed_plane(board) & ~before[k]
+            assert sorted(cells) == sorted(np.flatnonzero(expected.reshape(-1)))
+            assert np.array_equal(changed[k], expected)
+            assert np.array_equal(batch.revealed[k], revealed_plane(board))
+            assert batch.exploded[k] == board.exploded
+            assert batch.is_won()[k] == board.is_won()
+
+
+def test_place_mines_keeps_the_first_click_block_safe():
+    batch = BoardBatch(50, 9, 9, 10, seed=3)
+    rows = np.random.default_rng(4).integers(0, 9, 50)
+    cols = np.random.default_rng(5).integers(0, 9, 50)
+    batch.place_mines(rows, cols)
+    assert (batch.mines.sum(axis=(1, 2)) == 10).all()
+    for k in range(50):
+        assert not batch.mines[k, max(rows[k] - 1, 0):rows[k] + 2, max(cols[k] - 1, 0):cols[k] + 2].any()
+    batch.reveal(rows, cols)
+    assert not batch.exploded.any()
+
+
+def test_flag_blocks_the_reveal_and_skips_revealed_cells():
+    batch = BoardBatch(2, 5, 5, 0, seed=6)
+    batch.place_mines([2, 2], [2, 2])
+    batch.flag([0, -1], [0, 0])
+    batch.reveal([4, 4], [4, 4])
+    assert not batch.revealed[0, 0, 0] and batch.flagged[0, 0, 0]
+    assert batch.is_won()[1] and not batch.is_won()[0]
+    batch.flag([1, 1], [1, 1])  # Revealed cells cannot be flagged
+    assert not batch.flagged[:, 1, 1].any()
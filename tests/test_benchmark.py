@@ -0,0 +1,25 @@
+import json
+
+import benchmark
+
+
+def test_time_call_runs_the_setup_outside_the_timing():
+    calls = []
+    durations = benchmark.time_call(lambda value: calls.append(value), lambda: len(calls), repeat=3)
+    assert calls == [0, 1, 2] and len(durations) == 3
+    summary = benchmark.result("x", {"n": 1}, [3.0, 1.0, 2.0])
+    assert (summary["min_s"], summary["median_s"], summary["mean_s"], summary["repeat"]) == (1.0, 2.0, 2.0, 3)
+
+
+def test_report_covers_every_benchmark(tmp_path):
+    output = tmp_path / "benchmark.json"
+    benchmark.main(["--sizes", "8", "--densities", "0.2", "--leaderboard-sizes", "20",
+                    "--repeat", "2", "--output", str(output)])
+    report = json.loads(output.read_text())
+    assert report["meta"]["repeat"] == 2 and report["meta"]["seed"] == benchmark.SEED
+    names = {entry["name"] for entry in report["results"]}
+    assert {"generate_mines", "Board.place_mines", "Board.reveal", "GameStateManager.undo",
+            "GameWidget.reveal_cell", "CsvLeaderboardStorage.top_k", "SqliteLeaderboardStorage.top_k",
+            "LeaderboardArchive.top_k"} <= names
+    for entry in report["results"]:
+        assert "skipped" in entry or (entry["repeat"] == 2 and 0 <= entry["min_s"] <= entry["median_s"])
@@ -0,0 +1,55 @@
+import random
+
+from bit_planes import BitPlane, NibblePlane
+from board import Board
+
+
+def random_indices(size, rng):
+    return sorted(rng.sample(range(size), rng.randrange(size + 1)))
+
+
+def test_bit_plane_cells_and_bulk_operations_agree():
+    rng = random.Random(1)
+    for size in (1, 7, 8, 9, 100):
+        left, right = random_indices(size, rng), random_indices(size, rng)
+        a, b = BitPlane.from_indices(size, left), BitPlane.from_indices(size, right)
+        assert [i for i in range(size) if a[i]] == left == a.indices()
+        assert a.count() == len(left)
+        assert (a & b).indices() == sorted(set(left) & set(right))
+        assert (a | b).indices() == sorted(set(left) | set(right))
+        assert (a ^ b).indices() == sorted(set(left) ^ set(right))
+        assert a.without(b).indices() == sorted(set(left) - set(right))
+        assert BitPlane.from_int(size, a.to_int()) == a
+        assert a.nbytes() == (size + 7) // 8
+
+
+def test_bit_plane_set_clear_and_copy():
+    plane = BitPlane(20)
+    plane[3] = 1
+    plane[19] = 1
+    copy = plane.copy()
+    plane[3] = 0
+    assert plane.indices() == [19] and copy.indices() == [3, 19]
+    bits = plane.bits
+    plane.clear()
+    assert plane.count() == 0 and plane.bits is bits  # Cleared in place
+
+
+def test_nibble_plane_packs_two_cells_per_byte():
+    rng = random.Random(2)
+    for size in (1, 2, 9, 64):
+        values = bytearray(rng.randrange(16) for _ in range(size))
+        plane = NibblePlane.from_bytes_per_cell(values)
+        assert [plane[i] for i in range(size)] == list(values)
+        assert plane.nbytes() == (size + 1) // 2
+        plane[size - 1] = 15 - values[size - 1]
+        assert plane[size - 1] == 15 - values[size - 1]
+        assert all(plane[i] == values[i] for i in range(size - 1))  # The other nibble of the byte is kept
+
+
+def test_board_memory_is_the_packed_planes_plus_the_mine_list():
+    board = Board(100, 100, 2000, seed=3)
+    empty = board.nbytes()
+    assert empty == 3 * 1250 + 5000
+    board.place_mines(50, 50)
+    assert board.nbytes() == empty + 4 * 2000
@@ -0,0 +1,156 @@
+import random
+
+import pytest
+
+from board import FINGERPRINT_VERSION, Board, BoardFingerprint
+
+
+@pytest.mark.parametrize("seed", [-1, 1 << 64, 1.5, "abc", True])
+def test_invalid_seeds_are_rejected(seed):
+    with pytest.raises(ValueError):
+        Board(9, 9, 10, seed=seed)
+    board = Board(9, 9, 10, seed=3)
+    with pytest.raises(ValueError):
+        board.reset(seed=seed)
+    assert board.seed == 3
+
+
+@pytest.mark.parametrize("seed", [0, 12345, (1 << 64) - 1])
+def test_fingerprint_round_trip(seed):
+    board = Board(9, 9, 10, seed=seed)
+    board.place_mines(4, 4)
+    again = Board.from_fingerprint(BoardFingerprint.decode(board.fingerprint().encode()))
+    assert again.mines == board.mines and again.counts == board.counts
+
+
+def test_reveal_opens_the_first_click_and_counts_safe_cells():
+    board = Board(9, 9, 10, seed=1)
+    board.place_mines(4, 4)
+    changed = board.reveal(4, 4)
+    assert 4 * 9 + 4 in changed
+    assert board.safe_revealed == len(changed) == board.revealed_count()
+    assert not board.exploded
+
+
+def placed(height=9, width=9, num_mines=10, seed=1, first=(4, 4)):
+    board = Board(height, width, num_mines, seed=seed)
+    board.place_mines(*first)
+    return board
+
+
+def test_mines_are_placed_on_the_first_click_only():
+    board = Board(9, 9, 10, seed=1)
+    assert not board.mines_placed and board.fingerprint() is None
+    board.place_mines(4, 4)
+    assert board.mines_placed and board.first_click == (4, 4)
+    assert len(board.mine_positions()) == 10 == board.mines.count()
+    assert all(board.is_mine(row, col) for row, col in board.mine_positions())
+    assert board.index(2, 3) == 2 * 9 + 3
+
+
+def test_reveal_cascades_only_through_empty_cells():
+    board = placed()
+    changed = board.reveal(4, 4)
+    for i in changed:
+        assert not board.mines[i]
+    # Every revealed cell next to a hidden one must be a number, empty cells open all their neighbours
+    for i in changed:
+        row, col = divmod(i, board.width)
+        if board.adjacent_mines(row, col) == 0:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if 0 <= row + dx < 9 and 0 <= col + dy < 9:
+                        assert board.is_revealed(row + dx, col + dy)
+
+
+def test_revealed_and_flagged_cells_do_not_reveal_again():
+    board = placed()
+    board.reveal(4, 4)
+    assert board.reveal(4, 4) == []
+    row, col = next(divmod(i, 9) for i in range(81) if not board.revealed[i])
+    assert board.flag(row, col) is True
+    assert board.reveal(row, col) == []
+    assert not board.is_revealed(row, col)
+    assert board.flag(row, col) is False
+    assert board.flag(4, 4) is None  # Revealed cells cannot be flagged
+
+
+def test_a_flag_stops_the_cascade():
+    board = placed(height=5, width=5, num_mines=0, first=(0, 0))
+    board.flag(2, 2)
+    changed = board.reveal(0, 0)
+    assert len(changed) == 24 and not board.is_revealed(2, 2)
+    assert not board.is_won()
+    board.flag(2, 2)
+    assert board.reveal(2, 2) == [12] and board.is_won()
+
+
+def test_stepping_on_a_mine_explodes_and_is_never_a_win():
+    board = placed()
+    board.reveal(4, 4)
+    for i in range(board.size):
+        if not board.mines[i]:
+            board.reveal(*divmod(i, 9))
+    assert board.is_won()
+    board.reveal(*board.mine_positions()[0])
+    assert board.exploded and not board.is_won()
+
+
+def test_fingerprint_encodes_every_field():
+    fingerprint = BoardFingerprint(0x9F3A2C, 10, 12, 20, 4, 7)
+    text = fingerprint.encode()
+    assert text == f"{FINGERPRINT_VERSION}-9f3a2c-10x12-20-4.7"
+    assert BoardFingerprint.decode(text) == fingerprint
+    assert Board.from_fingerprint(text).fingerprint() == fingerprint
+
+
+@pytest.mark.parametrize("text", ["", "1-zz-9x9-10-4.4", "1-ff-9x9-10", "1-ff-9-10-4.4", f"{FINGERPRINT_VERSION + 1}-ff-9x9-10-4.4"])
+def test_malformed_fingerprints_are_rejected(text):
+    with pytest.raises(ValueError):
+        BoardFingerprint.decode(text)
+
+
+def test_the_seed_decides_the_board():
+    assert placed(seed=5).mines == placed(seed=5).mines
+    assert placed(seed=5).mines != placed(seed=6).mines
+    assert placed(seed=5, first=(0, 0)).mines != placed(seed=5).mines
+    assert 0 <= Board(9, 9, 10).seed < 1 << 32  # A random seed is drawn when none is given
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_live_counters_match_a_recount(seed):
+    rng = random.Random(seed)
+    board = placed(seed=seed)
+    for _ in range(60):
+        row, col = rng.randrange(9), rng.randrange(9)
+        if rng.random() < 0.3:
+            board.flag(row, col)
+        elif not board.is_mine(row, col):
+            board.reveal(row, col)
+        safe_revealed = sum(1 for i in range(board.size) if board.revealed[i] and not board.mines[i])
+        assert board.safe_revealed == safe_revealed
+        assert board.flags_placed == board.flagged.count()
+        assert board.mines_remaining() == 10 - board.flagged.count()
+        assert board.is_won() == (safe_revealed == board.size - board.mines.count())
+
+
+def test_safe_cells_count_the_mines_actually_placed():
+    board = placed(height=1, width=3, num_mines=2, first=(0, 1))  # No room for any mine
+    assert board.safe_cells == 3
+    board.reveal(0, 1)
+    assert board.is_won()
+
+
+def test_reset_reuses_the_planes():
+    board = placed(seed=7)
+    board.reveal(4, 4)
+    board.flag(*board.mine_positions()[0])
+    planes = (board.mines.bits, board.revealed.bits, board.flagged.bits, board.counts.nibbles)
+    board.reset(num_mines=12, seed=8)
+    assert all(plane is before for plane, before in zip(
+        (board.mines.bits, board.revealed.bits, board.flagged.bits, board.counts.nibbles), planes))
+    assert board.mines.count() == board.revealed.count() == board.flagged.count() == 0
+    assert (board.seed, board.num_mines, board.safe_cells, board.safe_revealed, board.flags_placed) == (8, 12, 69, 0, 0)
+    assert not board.mines_placed and not board.exploded and board.first_click is None
+    board.place_mines(4, 4)
+    assert board.mines == placed(num_mines=12, seed=8).mines
@@ -0,0 +1,81 @@
+import time
+
+from board import Board
+from board_pool import MAX_FAILURES, NoGuessBoardPool, ReadyBoard, generate_no_guess_board
+from solver import solve_by_logic
+
+
+def wait_for(condition, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def test_generated_board_is_no_guess_from_every_first_click():
+    ready = generate_no_guess_board(9, 9, 10, 4, 4, seed=1)
+    assert ready is not None
+    for index in list(ready.first_clicks)[:5]:
+        board = Board.from_fingerprint(ready.fingerprint)
+        board.first_click = divmod(index, board.width)
+        assert solve_by_logic(board)
+
+
+def test_pool_prepares_boards_and_hands_them_out():
+    pool = NoGuessBoardPool(capacity=2, max_workers=1)
+    try:
+        pool.add_difficulty(9, 9, 10)
+        wait_for(lambda: pool.ready_count(9, 9, 10) > 0)
+        ready = pool.ready[9, 9, 10][0]
+        row, col = divmod(next(iter(ready.first_clicks)), 9)
+        assert pool.take(9, 9, 10, row, col) == ready.fingerprint
+    finally:
+        pool.shutdown()
+
+
+def test_pool_gives_up_on_a_density_without_no_guess_boards():
+    pool = NoGuessBoardPool(capacity=2, max_workers=1)
+    try:
+        pool.add_difficulty(9, 9, 70)
+        wait_for(lambda: pool.given_up(9, 9, 70))
+        wait_for(lambda: pool.pending[9, 9, 70] == 0)
+        assert pool.failures[9, 9, 70] >= MAX_FAILURES
+        assert pool.ready_count(9, 9, 70) == 0
+        time.sleep(0.2)
+        assert pool.pending[9, 9, 70] == 0  # Nothing was submitted again
+    finally:
+        pool.shutdown()
+
+
+def test_pool_covers_every_first_click():
+    pool = NoGuessBoardPool(max_workers=1)
+    try:
+        pool.add_difficulty(6, 6, 4)
+        wait_for(lambda: pool.covered_count(6, 6, 4) == 36)
+        wait_for(lambda: pool.pending[6, 6, 4] == 0)
+        assert pool.ready_count(6, 6, 4) <= 36  # Every job aims at a cell nothing covers yet
+        for index in range(36):
+            assert any(index in ready.first_clicks for ready in pool.ready[6, 6, 4])
+        # Taking a board uncovers its cells, so the pool starts filling them again
+        row, col = divmod(next(iter(pool.ready[6, 6, 4][0].first_clicks)), 6)
+        assert pool.take(6, 6, 4, row, col) is not None
+        wait_for(lambda: pool.covered_count(6, 6, 4) == 36)
+    finally:
+        pool.shutdown()
+
+
+def test_take_misses_a_cell_no_ready_board_starts_from():
+    pool = NoGuessBoardPool(max_workers=1)
+    pool.shutdown()  # Nothing is generated, the ready boards are put in by hand
+    assert pool.take(9, 9, 10, 0, 0) is None  # Unknown difficulty
+    pool.add_difficulty(9, 9, 10)
+    board = Board(9, 9, 10, seed=5)
+    board.place_mines(0, 0)
+    ready = ReadyBoard(board.fingerprint(), frozenset({0, 1}))
+    with pool.lock:
+        pool.add_ready((9, 9, 10), ready)
+    assert pool.covered_count(9, 9, 10) == 2
+    assert pool.take(9, 9, 10, 4, 4) is None
+    assert pool.take(9, 9, 10, 0, 1) == ready.fingerprint
+    assert pool.covered_count(9, 9, 10) == 0
+    assert pool.take(9, 9, 10, 0, 0) is None
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QPoint, Qt
+from PySide6.QtTest import QTest
+
+from board import Board
+from board_view import HIDDEN_COLORS, REVEALED_COLOR, BoardView
+
+CELL = 20
+
+
+def pixel(view, row, col):
+    """Colour just inside the border of a cell."""
+    return view.grab().toImage().pixelColor(col * CELL + 3, row * CELL + 3).name()
+
+
+def test_view_fits_the_board(qt_app):
+    view = BoardView(Board(4, 5, 0, seed=1), CELL)
+    assert (view.width(), view.height()) == (5 * CELL, 4 * CELL)
+    view.set_board(Board(30, 2, 0, seed=1))
+    assert (view.width(), view.height()) == (2 * CELL, 30 * CELL)
+
+
+def test_clicks_are_mapped_to_cells(qt_app):
+    view = BoardView(Board(4, 5, 0, seed=1), CELL)
+    clicked, right_clicked = [], []
+    view.cell_clicked.connect(lambda row, col: clicked.append((row, col)))
+    view.cell_right_clicked.connect(lambda row, col: right_clicked.append((row, col)))
+    QTest.mouseClick(view, Qt.LeftButton, Qt.NoModifier, QPoint(2 * CELL + 1, 3 * CELL + 5))
+    QTest.mouseClick(view, Qt.RightButton, Qt.NoModifier, QPoint(4 * CELL + 19, 0))
+    assert clicked == [(3, 2)] and right_clicked == [(0, 4)]
+
+
+def test_cells_are_painted_from_the_board_state(qt_app):
+    board = Board(4, 5, 0, seed=1)
+    board.place_mines(0, 0)
+    view = BoardView(board, CELL)
+    assert pixel(view, 0, 0) == HIDDEN_COLORS[0].name()
+    assert pixel(view, 0, 1) == HIDDEN_COLORS[1].name()
+    view.update_cells(board.reveal(0, 0))
+    assert pixel(view, 0, 0) == pixel(view, 3, 4) == REVEALED_COLOR.name()
@@ -0,0 +1,24 @@
+from array import array
+import struct
+
+import byte_order
+from byte_order import little_endian, read_uint32
+
+
+def test_arrays_are_written_little_endian():
+    values = array("I", [1, 2 ** 32 - 1, 70000])
+    assert little_endian(values).tobytes() == struct.pack("<3I", *values)
+
+
+def test_read_uint32_reads_a_slice():
+    data = b"junk" + struct.pack("<3I", 5, 6, 7)
+    assert list(read_uint32(data, 4, 3)) == [5, 6, 7]
+    assert list(read_uint32(memoryview(data), 8, 1)) == [6]
+
+
+def test_big_endian_hosts_swap_a_copy(monkeypatch):
+    monkeypatch.setattr(byte_order.sys, "byteorder", "big")
+    values = array("I", [1])
+    swapped = little_endian(values)
+    assert swapped is not values and values[0] == 1
+    assert swapped[0] == 1 << 24
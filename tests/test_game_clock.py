@@ -0,0 +1,56 @@
+import pytest
+
+import game_clock
+from game_clock import GameClock
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """A fake perf_counter_ns, moved forward with now.advance(ms)."""
+    class FakeTime:
+        ns = 10_000_000_000
+
+        def advance(self, ms):
+            self.ns += ms * 1_000_000
+
+    fake = FakeTime()
+    monkeypatch.setattr(game_clock.time, "perf_counter_ns", lambda: fake.ns)
+    return fake
+
+
+def test_clock_counts_only_while_running(now):
+    clock = GameClock()
+    now.advance(500)
+    assert clock.elapsed_ms() == 0 and not clock.running
+    clock.start()
+    now.advance(1234)
+    assert clock.elapsed_ms() == 1234 and clock.running
+    clock.pause()
+    now.advance(60_000)  # Time spent in a dialog is not counted
+    assert clock.elapsed_ms() == 1234
+    clock.pause()
+    clock.resume()
+    clock.resume()
+    now.advance(6)
+    assert clock.elapsed_ms() == 1240
+
+
+def test_start_and_reset_go_back_to_zero(now):
+    clock = GameClock()
+    clock.start()
+    now.advance(900)
+    clock.start()
+    now.advance(100)
+    assert clock.elapsed_ms() == 100
+    clock.reset()
+    assert clock.elapsed_ms() == 0 and not clock.running
+
+
+def test_restore_continues_from_a_saved_time(now):
+    clock = GameClock()
+    clock.restore(61_234)
+    now.advance(5000)
+    assert clock.elapsed_ms() == 61_234 and not clock.running
+    clock.resume()
+    now.advance(766)
+    assert clock.elapsed_ms() == 62_000
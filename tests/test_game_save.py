@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+
+import game_save
+from board import Board
+from game_save import Autosaver, HEADER, load_game, restore, save_game, snapshot
+from game_state_storage import GameMove, GameStateManager
+from replay import CLICK, ReplayLog
+
+BOARD_ATTRIBUTES = ["height", "width", "size", "num_mines", "seed", "first_click", "mines_placed", "exploded",
+                    "safe_cells", "safe_revealed", "flags_placed", "mine_indices", "mines", "revealed",
+                    "flagged", "counts"]
+
+
+def played_game():
+    """A board a few moves in, with its undo journal and replay log."""
+    board = Board(16, 30, 99, seed=42)
+    board.place_mines(8, 15)
+    manager = GameStateManager()
+    log = ReplayLog.for_board(board)
+    log.set_board(board)
+    manager.record(GameMove(board.reveal(8, 15)))
+    log.record(0, CLICK, board.index(8, 15))
+    hidden = next(i for i in range(board.size) if not board.revealed[i])
+    board.flag(*divmod(hidden, board.width))
+    manager.record(GameMove(flagged=[hidden], flags_delta=1))
+    return board, manager, log
+
+
+def test_round_trip_with_journal_and_replay():
+    board, manager, log = played_game()
+    saved = restore(snapshot(board, 2, 61234, 7, manager.history, log.encode()))
+
+    for name in BOARD_ATTRIBUTES:
+        assert getattr(saved.board, name) == getattr(board, name), name
+    assert (saved.lives, saved.elapsed_ms, saved.move_count) == (2, 61234, 7)
+    assert ReplayLog.decode(saved.replay).events == log.events
+
+    # The journal still undoes the game back to an untouched board
+    assert len(saved.moves) == len(manager.history)
+    for move in reversed(saved.moves):
+        move.undo(saved.board)
+    assert saved.board.revealed.count() == 0
+    assert saved.board.safe_revealed == 0 and saved.board.flags_placed == 0
+
+
+def test_round_trip_of_a_board_without_mines_and_without_extras(tmp_path):
+    board = Board(9, 9, 10, seed=1)
+    path = str(tmp_path / "game.mssave")
+    save_game(path, board, 3, 0)
+    saved = load_game(path)
+    assert not saved.board.mines_placed and saved.board.first_click is None
+    assert saved.moves == [] and saved.replay is None
+    assert saved.board.safe_cells == board.safe_cells
+
+
+def test_truncated_saves_are_rejected():
+    board, manager, log = played_game()
+    data = snapshot(board, 3, 5, 2, manager.history, log.encode())
+    for length in (0, HEADER.size - 1, HEADER.size + 10, len(data) - 1):
+        with pytest.raises(ValueError):
+            restore(data[:length])
+
+
+def test_foreign_and_newer_files_are_rejected():
+    board, _, _ = played_game()
+    data = bytearray(snapshot(board, 3, 5))
+    with pytest.raises(ValueError):
+        restore(b"PK\x03\x04" + bytes(data[4:]))  # A zip file, say
+    data[4] = game_save.VERSION + 1
+    with pytest.raises(ValueError):
+        restore(bytes(data))
+
+
+def test_autosaver_keeps_the_newest_snapshot(tmp_path):
+    board, _, _ = played_game()
+    autosaver = Autosaver(str(tmp_path / "autosave.mssave"))
+    try:
+        for elapsed_ms in range(20):
+            autosaver.submit(snapshot(board, 3, elapsed_ms))
+        autosaver.flush()
+        assert load_game(autosaver.path).elapsed_ms == 19
+    finally:
+        autosaver.close()
+
+
+def test_autosaver_discard_after_a_save_removes_the_file(tmp_path):
+    board, _, _ = played_game()
+    autosaver = Autosaver(str(tmp_path / "autosave.mssave"))
+    try:
+        autosaver.submit(snapshot(board, 3, 1))
+        autosaver.discard()
+        autosaver.flush()
+        assert not autosaver.exists()
+        autosaver.discard()  # Nothing to remove is fine
+        autosaver.flush()
+        assert not autosaver.exists()
+    finally:
+        autosaver.close()
+
+
+def test_autosaver_close_writes_the_pending_snapshot(tmp_path, monkeypatch):
+    board, _, _ = played_game()
+    autosaver = Autosaver(str(tmp_path / "autosave.mssave"))
+    # Hold the first write so the next snapshot is still waiting when close is called
+    release = threading.Event()
+    write = game_save.write_atomically
+
+    def slow_write(path, data):
+        release.wait(5)
+        write(path, data)
+
+    monkeypatch.setattr(game_save, "write_atomically", slow_write)
+    autosaver.submit(snapshot(board, 3, 1))
+    autosaver.submit(snapshot(board, 3, 2))
+    closing = threading.Thread(target=autosaver.close)
+    closing.start()
+    release.set()
+    closing.join(5)
+    assert not closing.is_alive()
+    assert load_game(autosaver.path).elapsed_ms == 2
+    with pytest.raises(RuntimeError):
+        autosaver.submit(snapshot(board, 3, 3))
+    autosaver.close()  # Closing twice does nothing
@@ -0,0 +1,98 @@
+from board import Board
+from game_state_storage import MOVE_OVERHEAD_BYTES, GameMove, GameStateManager
+
+
+def opened_board():
+    board = Board(9, 9, 10, seed=21)
+    board.place_mines(4, 4)
+    return board
+
+
+def state(board):
+    return bytes(board.revealed.bits), bytes(board.flagged.bits), board.safe_revealed, board.flags_placed, board.exploded
+
+
+def play(board, manager, row, col):
+    changed = board.reveal(row, col)
+    manager.record(GameMove(changed, exploded=board.exploded))
+    return changed
+
+
+def flag(board, manager, row, col):
+    flagged = board.flag(row, col)
+    manager.record(GameMove(flagged=[board.index(row, col)], flags_delta=1 if flagged else -1))
+
+
+def hidden_safe(board):
+    return next(divmod(i, board.width) for i in range(board.size) if not board.revealed[i] and not board.mines[i])
+
+
+def test_undo_puts_back_every_earlier_state():
+    board, manager = opened_board(), GameStateManager()
+    states = [state(board)]
+    play(board, manager, 4, 4)
+    states.append(state(board))
+    flag(board, manager, *board.mine_positions()[0])
+    states.append(state(board))
+    play(board, manager, *hidden_safe(board))
+    states.append(state(board))
+    play(board, manager, *board.mine_positions()[1])
+    assert board.exploded
+
+    for expected in reversed(states):
+        assert manager.undo(board) is not None
+        assert state(board) == expected
+    assert manager.undo(board) is None
+
+
+def test_redo_replays_the_undone_moves():
+    board, manager = opened_board(), GameStateManager()
+    play(board, manager, 4, 4)
+    flag(board, manager, *board.mine_positions()[0])
+    after = state(board)
+    manager.undo(board)
+    manager.undo(board)
+    assert manager.redo(board).revealed
+    assert manager.redo(board).flags_delta == 1
+    assert state(board) == after
+    assert manager.redo(board) is None
+
+
+def test_a_new_move_clears_the_redo_stack():
+    board, manager = opened_board(), GameStateManager()
+    play(board, manager, 4, 4)
+    flag(board, manager, *board.mine_positions()[0])
+    manager.undo(board)
+    assert manager.redo_stack
+    play(board, manager, *hidden_safe(board))
+    assert not manager.redo_stack
+    assert manager.redo(board) is None
+    assert manager.journal_bytes == sum(move.nbytes() for move in manager.history)
+
+
+def test_oldest_moves_are_evicted_at_the_byte_cap():
+    one_flag = GameMove(flagged=[0], flags_delta=1).nbytes()
+    assert one_flag == MOVE_OVERHEAD_BYTES + 4
+    manager = GameStateManager(max_bytes=3 * one_flag)
+    moves = [GameMove(flagged=[i], flags_delta=1) for i in range(5)]
+    for move in moves:
+        manager.record(move)
+    assert list(manager.history) == moves[2:]
+    assert manager.journal_bytes == 3 * one_flag
+
+
+def test_the_newest_move_is_kept_even_over_the_cap():
+    manager = GameStateManager(max_bytes=1)
+    manager.record(GameMove(flagged=[0], flags_delta=1))
+    big = GameMove(revealed=range(100))
+    manager.record(big)
+    assert list(manager.history) == [big]
+
+
+def test_depth_cap_and_clear():
+    manager = GameStateManager(max_depth=2, max_bytes=None)
+    for i in range(4):
+        manager.record(GameMove(flagged=[i], flags_delta=1))
+    assert [move.flagged[0] for move in manager.history] == [2, 3]
+    manager.clear_history()
+    assert not manager.history and not manager.redo_stack and manager.journal_bytes == 0
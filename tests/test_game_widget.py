@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+
+@pytest.fixture
+def game(qt_app, tmp_path):
+    from game import GameWidget
+    widget = GameWidget(autosave_path=str(tmp_path / "autosave.mssave"))
+    yield widget
+    widget.autosaver.close()
+
+
+def test_restart_resets_the_board_in_place(game):
+    game.handle_click(4, 4)
+    board, revealed = game.board, game.board.revealed.bits
+    assert board.safe_revealed > 0 and game.clock.running
+    game.start_game()
+    assert game.board is board and board.revealed.bits is revealed
+    assert board.safe_revealed == 0 and not board.mines_placed
+    assert game.board_view.board is board and not game.clock.running
+    assert game.timer_label.text() == "Time: 00:00" and game.live_count == 3
+
+
+def test_a_new_size_builds_a_new_board(game):
+    board = game.board
+    game.set_board_size(12, 14, 30)
+    game.start_game()
+    assert game.board is not board
+    assert (game.board.height, game.board.width, game.board.num_mines) == (12, 14, 30)
+    assert game.board_view.width() == 14 * game.board_view.cell_size
@@ -0,0 +1,54 @@
+import csv
+
+import pytest
+
+from leaderboard_archive import HEADER, LeaderboardArchive, compact_csv
+
+SCORES = [("ana", 12.5), ("bob", 9.25), ("ana", 7.0), ("cy", 30.0), ("bob", 9.25)]
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    csv_path = tmp_path / "leaderboard.csv"
+    with open(csv_path, "w", newline="") as file:
+        csv.writer(file).writerows(SCORES)
+    path = tmp_path / "leaderboard.lba"
+    assert compact_csv(str(csv_path), str(path), chunk_rows=2) == len(SCORES)
+    return path
+
+
+def test_archive_answers_the_queries(archive_path):
+    archive = LeaderboardArchive(str(archive_path))
+    try:
+        assert archive.top_k(3) == [("ana", 7.0), ("bob", 9.25), ("bob", 9.25)]
+        assert [(name, time) for name, time, _ in archive.entries()] == SCORES
+        assert archive.player_times("ana") == [12.5, 7.0]
+        assert archive.player_times("nobody") == []
+        stats = archive.player_stats()
+        assert [(player.nickname, player.games, player.best) for player in stats] == [
+            ("ana", 2, 7.0), ("bob", 2, 9.25), ("cy", 1, 30.0)]
+    finally:
+        archive.close()
+
+
+def test_archive_is_not_writable(archive_path):
+    archive = LeaderboardArchive(str(archive_path))
+    try:
+        assert not hasattr(archive, "add_many")
+    finally:
+        archive.close()
+
+
+@pytest.mark.parametrize("content", [b"", b"MSLB", b"XXXX" + bytes(HEADER.size)])
+def test_short_or_foreign_files_are_rejected(tmp_path, content):
+    path = tmp_path / "bad.lba"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        LeaderboardArchive(str(path))
+
+
+def test_truncated_archive_is_rejected(archive_path):
+    data = archive_path.read_bytes()
+    archive_path.write_bytes(data[:HEADER.size + 8])
+    with pytest.raises(ValueError):
+        LeaderboardArchive(str(archive_path))
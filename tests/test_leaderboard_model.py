@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import Qt
+
+from leaderboard_model import PAGE_SIZE, LeaderboardModel
+from leaderboard_storage import SqliteLeaderboardStorage
+
+
+def wait_until(qt_app, condition, timeout=10):
+    """Run the event loop until the pages read on the pool have been delivered."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        qt_app.processEvents()
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SqliteLeaderboardStorage(str(tmp_path / "leaderboard.db"))
+    storage.add_many([(f"player{i % 7}", 1000 - i, None) for i in range(PAGE_SIZE + 50)])
+    yield storage
+    storage.close()
+
+
+def test_rows_are_fetched_page_by_page(qt_app, storage):
+    model = LeaderboardModel(storage, format_time=lambda seconds: f"{seconds:.1f}s")
+    model.fetchMore()  # What a view does when it is first shown
+    wait_until(qt_app, lambda: not model.loading and model.rowCount())
+    assert model.rowCount() == PAGE_SIZE and model.canFetchMore()
+    assert model.data(model.index(0, 0)) == 1
+    assert model.data(model.index(0, 2)) == f"{1000 - PAGE_SIZE - 49:.1f}s"
+    model.fetchMore()
+    wait_until(qt_app, lambda: not model.loading)
+    assert model.rowCount() == PAGE_SIZE + 50 and not model.canFetchMore()
+
+
+def test_sorting_and_filtering_start_again_from_the_storage(qt_app, storage):
+    model = LeaderboardModel(storage)
+    model.fetchMore()
+    wait_until(qt_app, lambda: not model.loading and model.rowCount())
+    model.sort(1, Qt.DescendingOrder)
+    model.set_nickname_filter("  PLAYER3 ")
+    wait_until(qt_app, lambda: not model.loading)
+    names = {model.data(model.index(row, 1)) for row in range(model.rowCount())}
+    assert names == {"player3"} and model.order == "player" and model.descending
+
+
+def test_pages_of_an_older_query_are_dropped(qt_app, storage):
+    model = LeaderboardModel(None)
+    assert not model.canFetchMore()
+    model.page_loaded(model.generation - 1, ([("stale", 1.0)], None))
+    assert model.rowCount() == 0
+    model.set_storage(storage)
+    wait_until(qt_app, lambda: not model.loading and model.rowCount())
+    assert model.data(model.index(0, 1)) != "stale"
@@ -0,0 +1,160 @@
+import random
+import sqlite3
+import statistics
+
+import pytest
+
+from leaderboard_storage import CsvLeaderboardStorage, LeaderboardStorage, SqliteLeaderboardStorage
+
+
+def random_scores(seed, count=300):
+    rng = random.Random(seed)
+    # Few distinct times so the medians often sit on ties
+    return [(rng.choice(["ana", "bob", "cy", "dee"]), rng.randint(1, 40) / 4, None) for _ in range(count)]
+
+
+def expected_stats(scores):
+    times = {}
+    for nickname, time, _ in scores:
+        times.setdefault(nickname, []).append(time)
+    return {nickname: (len(values), min(values), statistics.mean(values), statistics.median(values))
+            for nickname, values in times.items()}
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "csv":
+        storage = CsvLeaderboardStorage(str(tmp_path / "leaderboard.csv"))
+    else:
+        storage = SqliteLeaderboardStorage(str(tmp_path / "leaderboard.db"))
+    yield storage
+    storage.close()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_player_stats_match_a_full_recount(storage, seed):
+    scores = random_scores(seed)
+    for start in range(0, len(scores), 37):  # Several batches, like the writer thread
+        storage.add_many(scores[start:start + 37])
+    stats = storage.player_stats()
+    assert [player.best for player in stats] == sorted(player.best for player in stats)
+    expected = expected_stats(scores)
+    assert {player.nickname for player in stats} == expected.keys()
+    for player in stats:
+        games, best, mean, median = expected[player.nickname]
+        assert (player.games, player.best) == (games, best)
+        assert player.mean == pytest.approx(mean)
+        assert player.median == pytest.approx(median)
+
+
+def test_top_k_and_pages_agree(storage):
+    scores = random_scores(3, 120)
+    storage.add_many(scores)
+    assert storage.top_k(5) == [(nickname, time) for nickname, time, _ in
+                                sorted(scores, key=lambda score: score[1])[:5]]
+    rows, key = [], None
+    while True:
+        page, key = storage.page(order="player", nickname="a", after=key, limit=7)
+        rows.extend(page)
+        if key is None:
+            break
+    assert rows == sorted((nickname, time) for nickname, time, _ in scores if "a" in nickname)
+
+
+def test_sqlite_refuses_a_file_that_is_not_a_database(tmp_path):
+    path = tmp_path / "leaderboard.db"
+    path.write_bytes(b"not a database" * 100)
+    with pytest.raises(sqlite3.DatabaseError):
+        SqliteLeaderboardStorage(str(path))
+
+
+def test_scores_keep_their_board_fingerprint(storage):
+    storage.add("ana", 12.5, "1-9f3a2c-10x10-20-4.7")
+    storage.add("bob", 9.25)
+    assert sorted(storage.entries()) == [("ana", 12.5, "1-9f3a2c-10x10-20-4.7"), ("bob", 9.25, None)]
+
+
+def test_an_incomplete_backend_cannot_be_created():
+    class NoEntries(LeaderboardStorage):
+        def add_many(self, scores):
+            pass
+
+        def top_k(self, n):
+            return []
+
+    with pytest.raises(TypeError):
+        NoEntries()
+
+
+def test_ties_keep_the_order_they_were_added_in(storage):
+    storage.add_many([("ana", 5.0, None), ("bob", 3.0, None), ("cy", 5.0, None), ("dee", 5.0, None)])
+    assert storage.top_k(3) == [("bob", 3.0), ("ana", 5.0), ("cy", 5.0)]
+
+
+def test_sqlite_imports_the_csv_once_and_keeps_milliseconds(tmp_path):
+    csv_path = tmp_path / "leaderboard.csv"
+    csv_path.write_text("ana,12\nbob,9.5,1-ff-9x9-10-4.4\n")
+    db_path = str(tmp_path / "leaderboard.db")
+    storage = SqliteLeaderboardStorage(db_path, migrate_from=str(csv_path))
+    storage.add("cy", 10.12345)
+    storage.close()
+    storage = SqliteLeaderboardStorage(db_path, migrate_from=str(csv_path))  # Reopened, not imported again
+    try:
+        assert list(storage.entries()) == [("ana", 12.0, None), ("bob", 9.5, "1-ff-9x9-10-4.4"), ("cy", 10.123, None)]
+        assert storage.top_k(2) == [("bob", 9.5), ("cy", 10.123)]
+        plan = storage.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT nickname, time_ms FROM scores ORDER BY time_ms, id LIMIT 10").fetchall()
+        assert "scores_by_time" in str(plan)
+    finally:
+        storage.close()
+
+
+def test_csv_top_k_reads_only_the_new_lines(tmp_path):
+    path = tmp_path / "leaderboard.csv"
+    storage = CsvLeaderboardStorage(str(path), capacity=3)
+    storage.add_many([("ana", 8.0, None), ("bob", 6.0, None)])
+    assert storage.top_k(3) == [("bob", 6.0), ("ana", 8.0)]
+    offset = storage.offset
+    with open(path, "a") as file:  # Another game instance appends, the last line is still being written
+        file.write("cy,2.5\ndee,1")
+    assert storage.top_k(3) == [("cy", 2.5), ("bob", 6.0), ("ana", 8.0)]
+    assert storage.offset == offset + len("cy,2.5\n")
+    with open(path, "a") as file:
+        file.write(".5\n")
+    assert storage.top_k(2) == [("dee", 1.5), ("cy", 2.5)]
+    assert storage.top_k(10) == [("dee", 1.5), ("cy", 2.5), ("bob", 6.0), ("ana", 8.0)]  # More than the heap keeps
+
+
+def test_csv_top_k_reads_a_replaced_file_again(tmp_path):
+    path = tmp_path / "leaderboard.csv"
+    storage = CsvLeaderboardStorage(str(path))
+    storage.add_many([("ana", 8.0, None), ("bob", 6.0, None)])
+    assert storage.top_k(1) == [("bob", 6.0)]
+    path.write_text("cy,9\n")
+    assert storage.top_k(5) == [("cy", 9.0)]
+    path.unlink()
+    assert storage.top_k(5) == []
+
+
+def walk_pages(storage, **query):
+    rows, key = [], None
+    while True:
+        page, key = storage.page(after=key, limit=4, **query)
+        rows.extend(page)
+        if key is None:
+            return rows
+
+
+def test_pages_sort_both_ways_and_filter_ignoring_case(storage):
+    scores = [(name, time, None) for time, name in enumerate(
+        ["Ana", "bob", "anabel", "cy", "dee", "ana", "Bo_b", "100%", "bob", "x"] * 2, start=1)]
+    storage.add_many(scores)
+    rows = [(nickname, float(time)) for nickname, time, _ in scores]
+    assert walk_pages(storage) == rows
+    assert walk_pages(storage, descending=True) == rows[::-1]
+    assert walk_pages(storage, order="player", descending=True) == sorted(rows, reverse=True)
+    assert walk_pages(storage, nickname="ANA") == [row for row in rows if "ana" in row[0].lower()]
+    # LIKE wildcards in the filter are plain characters
+    assert walk_pages(storage, nickname="o_b") == [row for row in rows if row[0] == "Bo_b"]
+    assert walk_pages(storage, nickname="%") == [row for row in rows if row[0] == "100%"]
+    assert storage.page(nickname="nobody") == ([], None)
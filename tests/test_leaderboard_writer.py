@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from leaderboard_writer import LeaderboardWriter
+
+
+class RecordingStorage:
+    """Keeps every batch it is given, can hold the writer until released or fail a batch."""
+
+    def __init__(self, fail_first=False):
+        self.batches = []
+        self.fail_first = fail_first
+        self.release = threading.Event()
+        self.release.set()
+
+    def add_many(self, scores):
+        self.release.wait()
+        if self.fail_first:
+            self.fail_first = False
+            raise OSError("disk full")
+        self.batches.append(list(scores))
+
+
+def test_close_writes_every_queued_score():
+    storage = RecordingStorage()
+    storage.release.clear()  # The first batch is held, the rest queue up behind it
+    writer = LeaderboardWriter(storage)
+    for i in range(50):
+        writer.submit("ana", i, None)
+    storage.release.set()
+    writer.close()
+    assert [score for batch in storage.batches for score in batch] == [("ana", i, None) for i in range(50)]
+    assert not writer.thread.is_alive()
+    writer.close()  # Closing twice does nothing
+
+
+def test_scores_waiting_together_are_written_as_one_batch():
+    storage = RecordingStorage()
+    storage.release.clear()
+    written = []
+    writer = LeaderboardWriter(storage, on_written=written.append, max_batch=20)
+    writer.submit("ana", 1.0)
+    for i in range(45):
+        writer.submit("bob", i)
+    storage.release.set()
+    writer.flush()
+    assert len(storage.batches) <= 4 and sum(written) == 46
+    assert max(len(batch) for batch in storage.batches) <= 20
+    writer.close()
+
+
+def test_a_failed_batch_does_not_stop_later_scores(capsys):
+    storage = RecordingStorage(fail_first=True)
+    writer = LeaderboardWriter(storage)
+    writer.submit("ana", 1.0)
+    writer.flush()
+    writer.submit("bob", 2.0)
+    writer.close()
+    assert storage.batches == [[("bob", 2.0, None)]]
+    assert "disk full" in capsys.readouterr().out
+
+
+def test_submit_after_close_is_an_error():
+    writer = LeaderboardWriter(RecordingStorage())
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit("ana", 1.0)
@@ -0,0 +1,192 @@
+import csv
+
+import pytest
+
+import replay
+from board import Board
+from replay import CLICK, FLAG, UNDO, ReplayLog, can_undo, load_replay, save_replay, verify, verify_batch
+
+NICKNAME = "ana"
+
+
+def new_log(seed=11, move_count=0):
+    board = Board(9, 9, 10, seed=seed)
+    board.place_mines(4, 4)
+    log = ReplayLog.for_board(board, nickname=NICKNAME, move_count=move_count)
+    log.set_board(board)
+    return board, log
+
+
+def scripted_win(seed=11):
+    """Click the first cell, then every safe cell still hidden, 100 ms apart. Returns the log and the time."""
+    board, log = new_log(seed)
+    time_ms = 0
+    log.record(time_ms, CLICK, board.index(4, 4))
+    board.reveal(4, 4)
+    for i in range(board.size):
+        if not board.revealed[i] and not board.mines[i]:
+            time_ms += 100
+            log.record(time_ms, CLICK, i)
+            board.reveal(*divmod(i, board.width))
+    assert board.is_won()
+    return log, time_ms
+
+
+def safe_cells(board, count):
+    return [i for i in range(board.size) if not board.mines[i] and i != board.index(4, 4)][:count]
+
+
+def test_scripted_win_is_valid():
+    log, time_ms = scripted_win()
+    fingerprint = log.fingerprint().encode()
+    verdict = verify(log, NICKNAME, time_ms / 1000, fingerprint)
+    assert verdict.valid and verdict.time_ms == time_ms
+    # The score is read just after the winning click, a little later is fine
+    assert verify(log, NICKNAME, (time_ms + 40) / 1000, fingerprint).valid
+
+
+def test_encode_decode_round_trip():
+    log, _ = scripted_win()
+    again = ReplayLog.decode(log.encode())
+    assert (again.nickname, again.fingerprint(), again.lives, again.move_count) == \
+        (log.nickname, log.fingerprint(), log.lives, log.move_count)
+    assert list(again.iter_events()) == list(log.iter_events())
+
+
+@pytest.mark.parametrize("cut", [0, replay.HEADER.size - 1, replay.HEADER.size + 1, -1])
+def test_truncated_logs_are_rejected(cut):
+    data = scripted_win()[0].encode()
+    with pytest.raises(ValueError):
+        ReplayLog.decode(data[:cut])
+
+
+def test_foreign_data_is_rejected():
+    with pytest.raises(ValueError):
+        ReplayLog.decode(b"MSSV" + bytes(100))
+
+
+def test_forged_faster_time_is_rejected():
+    log, time_ms = scripted_win()
+    verdict = verify(log, NICKNAME, (time_ms - 500) / 1000, log.fingerprint().encode())
+    assert not verdict.valid and "faster" in verdict.reason
+
+
+def test_much_slower_time_is_rejected():
+    log, time_ms = scripted_win()
+    assert not verify(log, NICKNAME, (time_ms + 5000) / 1000, log.fingerprint().encode()).valid
+
+
+def test_wrong_nickname_is_rejected():
+    log, time_ms = scripted_win()
+    assert not verify(log, "mallory", time_ms / 1000, log.fingerprint().encode()).valid
+
+
+def test_wrong_fingerprint_is_rejected():
+    log, time_ms = scripted_win()
+    other = scripted_win(seed=12)[0].fingerprint().encode()
+    assert not verify(log, NICKNAME, time_ms / 1000, other).valid
+
+
+def test_move_after_a_loss_is_rejected():
+    board, log = new_log()
+    log.record(0, CLICK, board.index(4, 4))
+    log.record(100, CLICK, board.mine_indices[0])  # Second move: too early to undo, the game is lost
+    log.record(200, CLICK, safe_cells(board, 1)[0])
+    verdict = replay.replay(log)
+    assert not verdict.valid and "lost" in verdict.reason
+
+
+def test_undo_without_an_explosion_is_rejected():
+    board, log = new_log()
+    log.record(0, CLICK, board.index(4, 4))
+    log.record(100, UNDO)
+    verdict = replay.replay(log)
+    assert not verdict.valid and "undo" in verdict.reason
+
+
+def test_undo_after_an_explosion_costs_a_life_and_the_game_goes_on():
+    board, log = new_log()
+    log.record(0, CLICK, board.index(4, 4))
+    board.reveal(4, 4)
+    time_ms = 0
+    for i in safe_cells(board, 2):  # Two more moves, so the mine may be undone
+        time_ms += 10
+        log.record(time_ms, CLICK, i)
+        board.reveal(*divmod(i, board.width))
+    log.record(time_ms + 10, CLICK, board.mine_indices[0])
+    log.record(time_ms + 10, UNDO)
+    # Flag the mine back and forth, then finish the board
+    log.record(time_ms + 20, FLAG, board.mine_indices[0])
+    log.record(time_ms + 30, FLAG, board.mine_indices[0])
+    time_ms += 40
+    for i in range(board.size):
+        if not board.revealed[i] and not board.mines[i]:
+            log.record(time_ms, CLICK, i)
+            board.reveal(*divmod(i, board.width))
+    assert replay.replay(log).valid
+    log.lives = 0  # Without a life left the mine ends the game
+    assert not replay.replay(log).valid
+
+
+def early_undo_then_win(move_count):
+    """First click, a mine on the second move of the log, an undo, then every safe cell."""
+    board, log = new_log(move_count=move_count)
+    log.record(0, CLICK, board.index(4, 4))
+    board.reveal(4, 4)
+    log.record(100, CLICK, board.mine_indices[0])
+    log.record(100, UNDO)
+    for i in range(board.size):
+        if not board.revealed[i] and not board.mines[i]:
+            log.record(200, CLICK, i)
+            board.reveal(*divmod(i, board.width))
+    return log
+
+
+def test_every_game_counts_its_moves_from_zero():
+    # A new game logs no earlier moves, so an early mine ends it in the game and in the replay alike
+    log = early_undo_then_win(move_count=0)
+    assert not can_undo(log.lives, 2)
+    verdict = replay.replay(log)
+    assert not verdict.valid and "lost" in verdict.reason
+
+
+def test_early_undo_of_a_resumed_game_verifies():
+    # A log started when a saved game was resumed carries the moves played before it
+    log = early_undo_then_win(move_count=5)
+    assert can_undo(log.lives, 5 + 2)
+    again = ReplayLog.decode(log.encode())
+    assert replay.replay(again).valid
+    assert verify(again, NICKNAME, 0.2, log.fingerprint().encode()).valid
+
+
+def test_time_going_backwards_is_rejected():
+    log, time_ms = scripted_win()
+    log.record(time_ms - 1, CLICK, 0)
+    assert not replay.replay(log).valid
+
+
+def test_verify_batch_reads_the_saved_replays(tmp_path):
+    log, time_ms = scripted_win()
+    save_replay(log, time_ms, str(tmp_path))
+    fingerprint = log.fingerprint().encode()
+    assert load_replay(replay.replay_path(str(tmp_path), fingerprint, time_ms)).events == log.events
+    results = verify_batch([(NICKNAME, time_ms / 1000, fingerprint), (NICKNAME, 1.0, fingerprint)],
+                           str(tmp_path), replay.TOLERANCE_MS)
+    assert [verdict.valid for _, verdict in results] == [True, False]
+    assert results[1][1].reason == "no replay"
+
+
+def test_command_line_checks_a_csv_leaderboard(tmp_path, capsys):
+    log, time_ms = scripted_win()
+    directory = str(tmp_path / "replays")
+    save_replay(log, time_ms, directory)
+    leaderboard = tmp_path / "leaderboard.csv"
+    with open(leaderboard, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow([NICKNAME, time_ms / 1000, log.fingerprint().encode()])
+        writer.writerow(["mallory", time_ms / 1000, log.fingerprint().encode()])
+        writer.writerow(["old", 12])  # Saved before fingerprints existed
+    assert replay.main([str(leaderboard), "--replays", directory, "--workers", "1"]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert '"nickname": "mallory"' in lines[0]
+    assert '"valid": 1' in lines[-1] and '"without_fingerprint": 1' in lines[-1]
@@ -0,0 +1,53 @@
+import io
+import json
+import random
+
+import pytest
+
+import simulate
+from board import Board
+
+
+def opened_board(seed=3):
+    board = Board(9, 9, 10, seed=seed)
+    board.place_mines(4, 4)
+    board.reveal(4, 4)
+    return board
+
+
+def test_solver_strategy_returns_every_proven_safe_cell():
+    board = opened_board()
+    cells = simulate.solver_strategy(board, random.Random(0))
+    assert len(cells) > 1
+    assert all(not board.is_mine(row, col) and not board.is_revealed(row, col) for row, col in cells)
+
+
+def test_random_strategy_returns_one_hidden_cell():
+    board = opened_board()
+    [(row, col)] = simulate.random_strategy(board, random.Random(0))
+    assert not board.is_revealed(row, col)
+
+
+def test_games_are_reproducible_from_the_seed():
+    first = simulate.play_game(9, 9, 0.15, simulate.solver_strategy, random.Random(7))
+    second = simulate.play_game(9, 9, 0.15, simulate.solver_strategy, random.Random(7))
+    assert first[:4] == second[:4]
+
+
+def test_a_strategy_without_hidden_cells_is_an_error():
+    with pytest.raises(ValueError):
+        simulate.play_game(9, 9, 0.15, lambda board, rng: [], random.Random(1))
+
+
+def test_batch_stats_add_up():
+    stats = simulate.play_batch(9, 9, 0.15, "solver", 20, seed=1)
+    result = stats.to_dict()
+    assert result["games"] == 20 and 0 < result["wins"] <= 20
+    assert result["clicks_per_game"] >= 1
+
+
+def test_emit_writes_one_json_line():
+    output = io.StringIO()
+    simulate.emit("final", (9, 9), 0.15, "solver", simulate.play_batch(9, 9, 0.15, "random", 3, seed=2), output)
+    line = json.loads(output.getvalue())
+    assert (line["kind"], line["games"], line["strategy"]) == ("final", 3, "solver")
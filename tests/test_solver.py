@@ -0,0 +1,135 @@
+from array import array
+from fractions import Fraction
+from itertools import combinations
+import random
+
+import pytest
+
+from bit_planes import BitPlane, NibblePlane
+from board import Board
+from solver import neighbours, solve, solve_by_logic
+
+
+def board_from_layout(layout):
+    """
+    Build a board from rows of "*" (hidden mine), "." (hidden safe cell) and "o" (revealed safe cell).
+    """
+    rows = layout.split()
+    height, width = len(rows), len(rows[0])
+    cells = "".join(rows)
+    mine_indices = [i for i, cell in enumerate(cells) if cell == "*"]
+    board = Board(height, width, len(mine_indices), seed=0)
+    board.mines = BitPlane.from_indices(board.size, mine_indices)
+    board.mine_indices = array("I", mine_indices)
+    counts = bytearray(board.size)
+    for i in range(board.size):
+        counts[i] = sum(board.mines[j] for j in neighbours(board, i))
+    board.counts = NibblePlane.from_bytes_per_cell(counts)
+    board.mines_placed = True
+    board.first_click = divmod(cells.index("o"), width)
+    for i, cell in enumerate(cells):
+        if cell == "o":
+            board.revealed[i] = 1
+            board.safe_revealed += 1
+    return board
+
+
+def brute_force(board):
+    """Exact mine probabilities by enumerating every layout that matches the revealed numbers."""
+    hidden = [i for i in range(board.size) if not board.revealed[i]]
+    numbers = [i for i in range(board.size) if board.revealed[i] and not board.mines[i]]
+    hidden_mines = len(board.mine_indices) - sum(board.revealed[i] for i in board.mine_indices)
+    layouts = 0
+    mine_counts = dict.fromkeys(hidden, 0)
+    for layout in combinations(hidden, hidden_mines):
+        mines = set(layout)
+        if all(sum(j in mines or (board.revealed[j] and board.mines[j]) for j in neighbours(board, i))
+               == board.counts[i] for i in numbers):
+            layouts += 1
+            for i in mines:
+                mine_counts[i] += 1
+    return {i: Fraction(count, layouts) for i, count in mine_counts.items()}
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_solve_matches_brute_force(seed):
+    rng = random.Random(seed)
+    board = Board(4, 5, rng.randint(3, 6), seed=seed)
+    board.place_mines(rng.randrange(4), rng.randrange(5))
+    board.reveal(*board.first_click)
+    # A few more safe cells so the frontier has several shapes
+    for _ in range(rng.randrange(3)):
+        safe = [i for i in range(board.size) if not board.revealed[i] and not board.mines[i]]
+        if safe:
+            board.reveal(*divmod(rng.choice(safe), board.width))
+
+    result = solve(board)
+    expected = brute_force(board)
+    assert result.probabilities.keys() == expected.keys()
+    for i, probability in expected.items():
+        assert result.probability(i) == pytest.approx(float(probability))
+    assert result.safe == {i for i, p in expected.items() if p == 0}
+    assert result.mines == {i for i, p in expected.items() if p == 1}
+
+
+def test_fifty_fifty():
+    board = board_from_layout("""
+        .*
+        oo
+    """)
+    result = solve(board)
+    assert result.probabilities == {0: 0.5, 1: 0.5}
+    assert not result.safe and not result.mines
+
+
+def test_one_two_one():
+    board = board_from_layout("""
+        *.*
+        ooo
+        ooo
+    """)
+    result = solve(board)
+    assert result.safe == {1}
+    assert result.mines == {0, 2}
+
+
+def test_layouts_are_weighted_by_the_global_mine_count():
+    # The two numbers are satisfied by one mine on (0,1) or (1,1), or by two mines on (1,0) and (1,2).
+    # With 2 mines in total, each one-mine layout leaves C(3, 1) ways to place the other mine
+    # in the bottom row and the two-mine layout only C(3, 0), so they are not equally likely.
+    board = board_from_layout("""
+        o*o
+        ...
+        .*.
+    """)
+    result = solve(board)
+    assert result.probability(1) == pytest.approx(3 / 7)
+    assert result.probability(4) == pytest.approx(3 / 7)
+    assert result.probability(3) == pytest.approx(1 / 7)
+    assert result.probability(5) == pytest.approx(1 / 7)
+    for i in (6, 7, 8):
+        assert result.probability(i) == pytest.approx(2 / 7)
+    assert result.probabilities == pytest.approx({i: float(p) for i, p in brute_force(board).items()})
+
+
+def test_inconsistent_numbers_are_rejected():
+    board = board_from_layout("""
+        .*
+        oo
+    """)
+    board.counts[2] = 2  # Claims two mines around a cell that only has one hidden neighbour left
+    board.counts[3] = 2
+    with pytest.raises(ValueError):
+        solve(board)
+
+
+def test_solve_by_logic_wins_a_board_without_guessing():
+    board = board_from_layout("""
+        *.*
+        ...
+        .o.
+    """)
+    board.revealed.clear()  # Played again from the first click
+    board.safe_revealed = 0
+    assert solve_by_logic(board)
+    assert board.is_won()
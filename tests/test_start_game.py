@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from start_game import (compute_adjacent_counts, count_adjacent_planes, generate_mine_planes, generate_mines,
+                        irregular_safe_area_cells, mines_for_density)
+
+
+def brute_force_counts(mines, height, width):
+    counts = bytearray(height * width)
+    for row in range(height):
+        for col in range(width):
+            counts[row * width + col] = sum(
+                mines[r * width + c]
+                for r in range(row - 1, row + 2) for c in range(col - 1, col + 2)
+                if 0 <= r < height and 0 <= c < width and (r, c) != (row, col))
+    return counts
+
+
+@pytest.mark.parametrize("height, width", [(1, 1), (1, 7), (7, 1), (2, 2), (9, 9), (5, 13), (16, 30)])
+def test_count_adjacent_planes_matches_brute_force(height, width):
+    rng = random.Random(height * 100 + width)
+    for density in (0, 0.3, 1):
+        mines = bytearray(1 if rng.random() < density else 0 for _ in range(height * width))
+        assert count_adjacent_planes(mines, height, width) == brute_force_counts(mines, height, width)
+
+
+def test_generate_mines_returns_the_counts_of_its_grid():
+    grid = [["" for _ in range(10)] for _ in range(8)]
+    grid, counts = generate_mines(grid, 3, 3, num_mines=15, rng=4)
+    assert sum(row.count("M") for row in grid) == 15
+    assert counts == compute_adjacent_counts(grid)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_mines_avoid_the_opening_and_spread_over_the_rows(seed):
+    height, width, num_mines = 12, 15, 40
+    rng = random.Random(seed)
+    row, col = rng.randrange(height), rng.randrange(width)
+    mines, _ = generate_mine_planes(height, width, row, col, num_mines, rng=random.Random(seed))
+    # The safe area is drawn first from the same generator
+    opening = irregular_safe_area_cells(height, width, row, col, rng=random.Random(seed))
+    opening |= {(r, c) for r in range(row - 1, row + 2) for c in range(col - 1, col + 2)}
+    assert not any(mines[r * width + c] for r, c in opening if 0 <= r < height and 0 <= c < width)
+    assert sum(mines) == num_mines
+    for r in range(height):
+        assert sum(mines[r * width:(r + 1) * width]) == num_mines // height + (r < num_mines % height)
+
+
+def test_the_same_seed_gives_the_same_board():
+    first = generate_mine_planes(16, 30, 8, 8, 99, rng=1234)
+    assert generate_mine_planes(16, 30, 8, 8, 99, rng=1234) == first
+    assert generate_mine_planes(16, 30, 8, 8, 99, rng=1235) != first
+
+
+def test_a_crowded_row_gets_the_cells_it_has_left():
+    # One row of three cells: the 3x3 block leaves no room at all
+    mines, counts = generate_mine_planes(1, 3, 0, 1, num_mines=2, rng=1)
+    assert mines == bytearray(3) and counts == bytearray(3)
+
+
+def test_density_must_be_below_one():
+    assert mines_for_density(10, 10, 0.2) == 20
+    for density in (-0.1, 1):
+        with pytest.raises(ValueError):
+            mines_for_density(10, 10, density)
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from startup_profile import ENVIRONMENT_VARIABLE, FLAG, StartupProfiler, profile_path
+
+
+def test_the_flag_is_taken_out_of_argv(monkeypatch):
+    monkeypatch.delenv(ENVIRONMENT_VARIABLE, raising=False)
+    argv = ["main.py", FLAG, "report.json", "-style", "fusion"]
+    assert profile_path(argv) == "report.json" and argv == ["main.py", "-style", "fusion"]
+    argv = ["main.py", FLAG]
+    assert profile_path(argv) == "startup_profile.json" and argv == ["main.py"]
+    assert profile_path(["main.py"]) is None
+    monkeypatch.setenv(ENVIRONMENT_VARIABLE, "from_env.json")
+    assert profile_path(["main.py"]) == "from_env.json"
+
+
+def test_events_are_written_as_json(tmp_path):
+    path = tmp_path / "profile.json"
+    profiler = StartupProfiler(str(path))
+    with profiler.measure("import", "board"):
+        import board  # noqa: F401
+    profiler.mark("first_frame")
+    profiler.write()
+    events = json.loads(path.read_text())["events"]
+    assert [(event["kind"], event["name"]) for event in events] == [("import", "board"), ("mark", "first_frame")]
+    assert events[0]["ms"] >= 0 and events[1]["at_ms"] >= events[0]["at_ms"]
+
+
+def test_a_disabled_profiler_records_nothing(tmp_path):
+    profiler = StartupProfiler()
+    with profiler.measure("build", "page"):
+        pass
+    profiler.mark("first_frame")
+    profiler.write()
+    assert not profiler.enabled and profiler.events == [] and not os.listdir(tmp_path)
+
+
+def test_game_page_does_not_import_the_other_pages():
+    pytest.importorskip("PySide6")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import sys, game; print(sorted({'Leaderboard', 'Players', 'Rules'} & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
+
+
+def test_pages_are_built_on_first_navigation(qt_app, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from main import MinesweeperWindow
+    window = MinesweeperWindow()
+    assert window.pages == {}
+    window.show_page("rules")
+    rules = window.pages["rules"]
+    window.show_page("rules")
+    assert list(window.pages) == ["rules"] and window.pages["rules"] is rules
+    assert window.stacked_widget.currentWidget() is rules